@@ -1,14 +1,9 @@
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
 
-# Define vertices of a tesseract in 4D space
-def tesseract_vertices():
-    vertices = []
-    for i in range(16):
-        vertex = [(i >> j) & 1 for j in range(4)]
-        vertices.append(np.array(vertex) * 2 - 1)  # Scale and center the vertices
-    return np.array(vertices)
+from edge_renderer import EdgeRenderer
+from hypercube import hypercube_edges, hypercube_vertices
+
 
 # # Function to plot the edges of the tesseract projected into 3D
 # def plot_tesseract():
@@ -16,18 +11,16 @@ def tesseract_vertices():
 #     ax = fig.add_subplot(111, projection='3d')
     
 #     # Tesseract vertices
-#     vertices = tesseract_vertices()
+#     vertices = hypercube_vertices(4)
 
 #     # 4D to 3D projection by dropping one dimension (W)
 #     ax.scatter(vertices[:, 0], vertices[:, 1], vertices[:, 2])
 
 #     # Edges of the tesseract (connect vertices that differ by one bit)
-#     for i in range(16):
-#         for j in range(i+1, 16):
-#             if bin(i ^ j).count('1') == 1:  # Hamming distance of 1
-#                 ax.plot([vertices[i, 0], vertices[j, 0]],
-#                         [vertices[i, 1], vertices[j, 1]],
-#                         [vertices[i, 2], vertices[j, 2]], color='b')
+#     for i, j in hypercube_edges(4):
+#         ax.plot([vertices[i, 0], vertices[j, 0]],
+#                 [vertices[i, 1], vertices[j, 1]],
+#                 [vertices[i, 2], vertices[j, 2]], color='b')
 
 #     ax.set_title('3D Projection of a Tesseract (4D Hypercube)')
 #     plt.show()
@@ -40,22 +33,24 @@ def plot_tesseract_with_color():
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
     
-    vertices = tesseract_vertices()
+    vertices = hypercube_vertices(4)
 
     # Map the 4th dimension (W) to color
     colors = (vertices[:, 3] + 1) / 2  # Normalize W values between 0 and 1
     ax.scatter(vertices[:, 0], vertices[:, 1], vertices[:, 2], c=colors, cmap='viridis')
 
-    # Edges with color interpolation
-    for i in range(16):
-        for j in range(i+1, 16):
-            if bin(i ^ j).count('1') == 1:
-                color = (colors[i] + colors[j]) / 2
-                ax.plot([vertices[i, 0], vertices[j, 0]],
-                        [vertices[i, 1], vertices[j, 1]],
-                        [vertices[i, 2], vertices[j, 2]], color=plt.cm.viridis(color))
+    # Edges with color interpolation: the mean W of both ends, through the same colormap in one lookup
+    edges = hypercube_edges(4)
+    edge_lines = EdgeRenderer(ax, edges, values=colors[edges].mean(axis=1), cmap='viridis', clim=(0, 1))
+    edge_lines.update(vertices)
 
     ax.set_title('Tesseract with Color Representing the 4th Dimension (W)')
-    plt.show()
+    return fig
 
-plot_tesseract_with_color()
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_tesseract_with_color()]
+
+if __name__ == "__main__":
+    make_figures()
+    plt.show()
@@ -1,14 +1,10 @@
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
 
-# Define vertices of a tesseract in 4D space
-def tesseract_vertices():
-    vertices = []
-    for i in range(16):
-        vertex = [(i >> j) & 1 for j in range(4)]
-        vertices.append(np.array(vertex) * 2 - 1)  # Scale and center the vertices
-    return np.array(vertices)
+from edge_renderer import EdgeRenderer
+from hypercube import hypercube_edges, hypercube_vertices
+from projection4d import perspective_matrix, project_points
+
 
 # Function to plot the edges of the tesseract projected into 3D
 def plot_tesseract():
@@ -16,21 +12,24 @@ def plot_tesseract():
     ax = fig.add_subplot(111, projection='3d')
     
     # Tesseract vertices
-    vertices = tesseract_vertices()
+    vertices = hypercube_vertices(4)
 
-    # 4D to 3D projection by dropping one dimension (W)
-    ax.scatter(vertices[:, 0], vertices[:, 1], vertices[:, 2])
+    # 4D to 3D perspective projection from a viewpoint on the W axis: the far cube (w = 1) appears inside the
+    # near one (w = -1) instead of on top of it, as it would when dropping W
+    projected = project_points(vertices, perspective_matrix(distance=3.0))
+    ax.scatter(projected[:, 0], projected[:, 1], projected[:, 2])
 
-    # Edges of the tesseract (connect vertices that differ by one bit)
-    for i in range(16):
-        for j in range(i+1, 16):
-            if bin(i ^ j).count('1') == 1:  # Hamming distance of 1
-                ax.plot([vertices[i, 0], vertices[j, 0]],
-                        [vertices[i, 1], vertices[j, 1]],
-                        [vertices[i, 2], vertices[j, 2]], color='b')
+    # Edges of the tesseract (connect vertices that differ by one bit), drawn as one collection
+    EdgeRenderer(ax, hypercube_edges(4), color='b').update(projected)
 
     ax.set_title('3D Projection of a Tesseract (4D Hypercube)')
-    plt.show()
+    return fig
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_tesseract()]
 
 # Visualize the 4D tesseract projected into 3D
-plot_tesseract()
+if __name__ == "__main__":
+    make_figures()
+    plt.show()
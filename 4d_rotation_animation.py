@@ -1,47 +1,19 @@
-import matplotlib.animation as animation
 import matplotlib.pyplot as plt
-import numpy as np
 
+from hypercube import hypercube_edges, hypercube_vertices
+from rotation4d import animate_rotation, render_rotation
 
-# Define vertices of a tesseract in 4D space
-def tesseract_vertices():
-    vertices = []
-    for i in range(16):
-        vertex = [(i >> j) & 1 for j in range(4)]
-        vertices.append(np.array(vertex) * 2 - 1)  # Scale and center the vertices
-    return np.array(vertices)
+def plot_rotating_tesseract(output=None):
+    vertices = hypercube_vertices(4)
+    edges = hypercube_edges(4)
 
-def plot_rotating_tesseract():
-    fig = plt.figure()
-    ax = fig.add_subplot(111, projection='3d')
-    
-    vertices = tesseract_vertices()
-
-    # Rotating the tesseract
-    def update(frame):
-        ax.cla()
-        # Rotate around the W-X plane (4D rotation)
-        angle = frame * np.pi / 50
-        rotation_matrix = np.array([[np.cos(angle), 0, 0, np.sin(angle)],
-                                    [0, 1, 0, 0],
-                                    [0, 0, 1, 0],
-                                    [-np.sin(angle), 0, 0, np.cos(angle)]])
-        rotated_vertices = np.dot(vertices, rotation_matrix)
-        ax.scatter(rotated_vertices[:, 0], rotated_vertices[:, 1], rotated_vertices[:, 2])
-
-        # Plot edges
-        for i in range(16):
-            for j in range(i+1, 16):
-                if bin(i ^ j).count('1') == 1:
-                    ax.plot([rotated_vertices[i, 0], rotated_vertices[j, 0]],
-                            [rotated_vertices[i, 1], rotated_vertices[j, 1]],
-                            [rotated_vertices[i, 2], rotated_vertices[j, 2]], color='b')
-        
-        ax.set_xlim([-2, 2])
-        ax.set_ylim([-2, 2])
-        ax.set_zlim([-2, 2])
-    
-    ani = animation.FuncAnimation(fig, update, frames=100, interval=50)
+    # Rotating the tesseract around the W-X plane (4D rotation), one full turn over 100 frames
+    if output is not None:
+        # Offline: render the frames in parallel straight to a .gif or .mp4 file
+        render_rotation(output, vertices, edges, planes='xw', frames=100, fps=20)
+        return
+    fig, ani = animate_rotation(vertices, edges, planes='xw', frames=100, interval=50)
     plt.show()
 
-plot_rotating_tesseract()
+if __name__ == "__main__":
+    plot_rotating_tesseract()
@@ -3,6 +3,10 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.stats import ttest_ind
 
+from coherence_stats import pairwise_tests
+from coherence_sweep import DEFAULT_TIME_POINTS, coherence_sweep
+from lindblad import lindblad_sweep
+
 # Quantum coherence decay function
 def coherence_decay(t, gamma):
     """ 
@@ -18,25 +22,26 @@ def coherence_decay(t, gamma):
     return np.exp(-gamma * t)
 
 # Generate coherence data across different biological environments
-def generate_coherence_data(time_points, gamma_values):
+def generate_coherence_data(time_points, gamma_values, n_times=DEFAULT_TIME_POINTS, model=None):
     """
     Generates coherence data for different decoherence rates (biological environments).
+    The whole (gamma x t) surface is computed in one broadcast pass; see coherence_sweep.py for large sweeps.
     
     Arguments:
     time_points -- duration of the experiment (int)
     gamma_values -- list of decoherence rates (array-like)
+    n_times -- number of time points (int)
+    model -- None for the closed form exp(-gamma * t), or a Lindblad environment model from lindblad.MODELS
+             ('dephasing', 'amplitude_damping', 'thermal'), whose l1-norm coherence is evolved instead
     
     Returns:
-    time, coherence data for each gamma value
+    time, coherence data for each gamma value (a 2D array whose row i belongs to gamma_values[i])
     """
-    time = np.linspace(0, time_points, 100)
-    coherence_data = []
-    
-    for gamma in gamma_values:
-        coherence = coherence_decay(time, gamma)
-        coherence_data.append(coherence)
-    
-    return time, coherence_data
+    if model is None:
+        sweep = coherence_sweep(gamma_values, time_points, n_times)
+    else:
+        sweep = lindblad_sweep(gamma_values, time_points, n_times, model=model)
+    return sweep.time, sweep.coherence
 
 # 3D plot of quantum coherence across multiple environments
 def plot_3d_coherence(time, gamma_values, coherence_data):
@@ -47,6 +52,9 @@ def plot_3d_coherence(time, gamma_values, coherence_data):
     time -- time array (array-like)
     gamma_values -- list of decoherence rates (array-like)
     coherence_data -- coherence data for each gamma value
+    
+    Returns:
+    The matplotlib figure
     """
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
@@ -59,7 +67,7 @@ def plot_3d_coherence(time, gamma_values, coherence_data):
     ax.set_zlabel('Decoherence Rate (gamma)')
     ax.set_title('Quantum Coherence Decay in Biological Systems')
     ax.legend()
-    plt.show()
+    return fig
 
 # Perform t-test to compare quantum and classical systems
 def perform_t_test(quantum_data, classical_data):
@@ -80,13 +88,23 @@ def perform_t_test(quantum_data, classical_data):
 time_points = 10  # Duration of the experiment
 gamma_values = np.linspace(0.01, 0.2, 5)  # Range of gamma values for different environments
 
-# Generate coherence data
-time, coherence_data = generate_coherence_data(time_points, gamma_values)
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    time, coherence_data = generate_coherence_data(time_points, gamma_values)
+    return [plot_3d_coherence(time, gamma_values, coherence_data)]
+
+if __name__ == "__main__":
+    # Generate coherence data
+    time, coherence_data = generate_coherence_data(time_points, gamma_values)
+
+    # 3D Visualization of coherence decay
+    plot_3d_coherence(time, gamma_values, coherence_data)
+    plt.show()
 
-# 3D Visualization of coherence decay
-plot_3d_coherence(time, gamma_values, coherence_data)
+    # Example: Perform t-test between a quantum system (gamma=0.05) and classical system (gamma=0.15)
+    quantum_data = coherence_data[1]  # gamma=0.05
+    classical_data = coherence_data[4]  # gamma=0.15
+    perform_t_test(quantum_data, classical_data)
 
-# Example: Perform t-test between a quantum system (gamma=0.05) and classical system (gamma=0.15)
-quantum_data = coherence_data[1]  # gamma=0.05
-classical_data = coherence_data[4]  # gamma=0.15
-perform_t_test(quantum_data, classical_data)
+    # All pairwise comparisons across the sweep at once, with Holm and Benjamini-Hochberg corrections
+    print(pairwise_tests(coherence_data, labels=gamma_values).to_string(index=False))
@@ -0,0 +1,282 @@
+"""
+Batched Significance Tests for Coherence Sweeps
+
+coherence_decay_viz.perform_t_test compares two hand-picked curves with one ttest_ind call. This module tests
+every pair of environments of a sweep at once, treating row i of the (n_gammas x n_times) coherence surface as
+the sample of environment i:
+
+- Welch's (or Student's) t-test for all pairs from the per-row means and variances, in closed form, with the
+  p-values of the t distribution evaluated on the whole pair array.
+- Holm (family-wise error) and Benjamini-Hochberg (false discovery rate) corrections, vectorized with a sort
+  and a running maximum or minimum.
+- Bootstrap and permutation tests of the difference of means without Python loops over resamples. The random
+  draws are matrices shared by all pairs: a bootstrap resample is a matrix of draw counts, so the resampled means
+  of every row are one matrix product, and a permutation is a 0/1 matrix marking the first group of the pooled
+  sample, so the permuted sums of all pairs come from two matrix products. Pairs are then compared a chunk at a
+  time to bound memory.
+
+pairwise_tests gathers everything in a pandas table with one row per pair. A sweep of 100 environments (4950
+pairs) with 2000 bootstrap and 2000 permutation resamples takes well under a second, and 1000 environments
+(about 500,000 pairs) with 1000 of each take seconds.
+
+Libraries:
+- Numpy: For the vectorized statistics and the batched resampling matrices.
+- Scipy: For the t distribution.
+- Pandas: For the results table.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_distribution
+
+# Default number of bootstrap and permutation resamples
+DEFAULT_RESAMPLES = 2000
+
+# Largest (pairs x resamples) block compared at once
+MAX_PAIR_BLOCK = 1 << 22
+
+
+# Indices of every unordered pair
+def all_pairs(n):
+    """
+    Every pair (i, j) with i < j < n.
+
+    Returns:
+    tuple: Two int arrays, the first and second member of each pair.
+    """
+    return np.triu_indices(n, k=1)
+
+
+def _as_samples(samples):
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.ndim != 2 or samples.shape[1] < 2:
+        raise ValueError(f"samples must be a 2D array with at least two observations per row, got shape "
+                         f"{samples.shape}")
+    return samples
+
+
+# Two-sample t-tests of many pairs of rows
+def t_tests(samples, pairs=None, equal_var=False):
+    """
+    Two-sided two-sample t-tests between rows of a sample matrix.
+
+    Parameters:
+    samples (array-like): One sample per row, shape (n_groups, n_observations).
+    pairs (tuple, optional): Row index arrays (first, second). Defaults to all_pairs.
+    equal_var (bool): Student's test with a pooled variance (as scipy's ttest_ind by default) instead of Welch's.
+
+    Returns:
+    dict: 'statistic', 'df' and 'p_value' arrays, one entry per pair.
+    """
+    samples = _as_samples(samples)
+    first, second = all_pairs(len(samples)) if pairs is None else pairs
+    n = samples.shape[1]
+    means = samples.mean(axis=1)
+    variances = samples.var(axis=1, ddof=1)
+    difference = means[first] - means[second]
+    if equal_var:
+        pooled = (variances[first] + variances[second]) / 2
+        standard_error = np.sqrt(pooled * 2 / n)
+        df = np.full(len(difference), 2.0 * (n - 1))
+    else:
+        v1, v2 = variances[first] / n, variances[second] / n
+        standard_error = np.sqrt(v1 + v2)
+        # Welch-Satterthwaite degrees of freedom
+        with np.errstate(invalid='ignore', divide='ignore'):
+            df = (v1 + v2) ** 2 / ((v1 ** 2 + v2 ** 2) / (n - 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        statistic = difference / standard_error
+    return {'statistic': statistic, 'df': df, 'p_value': 2 * t_distribution.sf(np.abs(statistic), df)}
+
+
+# Holm's step-down adjustment
+def holm_correction(p_values):
+    """
+    Holm-adjusted p-values, controlling the family-wise error rate.
+
+    Parameters:
+    p_values (array-like): Raw p-values.
+
+    Returns:
+    numpy.ndarray: Adjusted p-values in the original order.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    order = np.argsort(p_values, kind='stable')
+    adjusted = np.maximum.accumulate(np.minimum((m - np.arange(m)) * p_values[order], 1.0))
+    result = np.empty(m)
+    result[order] = adjusted
+    return result
+
+
+# Benjamini-Hochberg step-up adjustment
+def benjamini_hochberg(p_values):
+    """
+    Benjamini-Hochberg adjusted p-values (q-values), controlling the false discovery rate.
+
+    Parameters:
+    p_values (array-like): Raw p-values.
+
+    Returns:
+    numpy.ndarray: Adjusted p-values in the original order.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    order = np.argsort(p_values, kind='stable')
+    scaled = p_values[order] * m / np.arange(1, m + 1)
+    adjusted = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    result = np.empty(m)
+    result[order] = adjusted
+    return result
+
+
+# Two-sided resampling p-values of many pairs, a block of pairs at a time
+def _resampling_p_values(observed, null_distribution, n_pairs, n_resamples):
+    """
+    Parameters:
+    observed (numpy.ndarray): Observed statistic of each pair.
+    null_distribution (callable): null_distribution(lo, hi) gives the resampled statistics of pairs lo..hi-1,
+    shape (hi - lo, n_resamples).
+
+    Returns:
+    numpy.ndarray: (1 + resamples at least as extreme) / (1 + resamples) for every pair.
+    """
+    p_values = np.empty(n_pairs)
+    block = max(1, MAX_PAIR_BLOCK // max(n_resamples, 1))
+    for lo in range(0, n_pairs, block):
+        hi = min(lo + block, n_pairs)
+        extreme = np.abs(null_distribution(lo, hi)) >= np.abs(observed[lo:hi, None]) - 1e-12
+        p_values[lo:hi] = (1 + np.count_nonzero(extreme, axis=1)) / (1 + n_resamples)
+    return p_values
+
+
+# Draw counts of each observation in each bootstrap resample
+def _bootstrap_counts(rng, n_resamples, n):
+    indices = rng.integers(0, n, size=(n_resamples, n))
+    # Offset every resample into its own row of the flattened count matrix
+    flat = (indices + n * np.arange(n_resamples)[:, None]).ravel()
+    return np.bincount(flat, minlength=n_resamples * n).reshape(n_resamples, n).astype(np.float64)
+
+
+# Bootstrap test of the difference of means
+def bootstrap_tests(samples, pairs=None, n_resamples=DEFAULT_RESAMPLES, rng=None):
+    """
+    Two-sided bootstrap tests of equal means between rows of a sample matrix.
+
+    Each sample is resampled with replacement and centered on its own mean, which imposes the null hypothesis;
+    the p-value is the share of resampled mean differences at least as large as the observed one. The two
+    members of a pair use independent resamples (two count matrices), and the resampled means of all rows come
+    from one matrix product per count matrix.
+
+    Parameters:
+    samples (array-like): One sample per row, shape (n_groups, n_observations).
+    pairs (tuple, optional): Row index arrays (first, second). Defaults to all_pairs.
+    n_resamples (int): Number of bootstrap resamples.
+    rng (numpy.random.Generator, optional): Random generator. Defaults to a fresh one.
+
+    Returns:
+    numpy.ndarray: p-value of every pair.
+    """
+    samples = _as_samples(samples)
+    first, second = all_pairs(len(samples)) if pairs is None else pairs
+    rng = np.random.default_rng() if rng is None else rng
+    n = samples.shape[1]
+    means = samples.mean(axis=1)
+    # Deviations of the resampled means from the sample means, (n_groups, n_resamples) each
+    deviation_a = samples @ _bootstrap_counts(rng, n_resamples, n).T / n - means[:, None]
+    deviation_b = samples @ _bootstrap_counts(rng, n_resamples, n).T / n - means[:, None]
+    observed = means[first] - means[second]
+
+    def null_distribution(lo, hi):
+        return deviation_a[first[lo:hi]] - deviation_b[second[lo:hi]]
+
+    return _resampling_p_values(observed, null_distribution, len(observed), n_resamples)
+
+
+# Permutation test of the difference of means
+def permutation_tests(samples, pairs=None, n_resamples=DEFAULT_RESAMPLES, rng=None):
+    """
+    Two-sided permutation tests of equal means between rows of a sample matrix.
+
+    Every permutation splits the pooled 2n observations of a pair into two groups of n; it is stored as a 0/1
+    matrix marking the observations that land in the first group, shared by all pairs. The permuted first-group
+    sums of every pair are then X_i @ M_a^T + X_j @ M_b^T, where M_a and M_b are the halves of the matrix that
+    cover the first and second sample.
+
+    Parameters:
+    samples (array-like): One sample per row, shape (n_groups, n_observations).
+    pairs (tuple, optional): Row index arrays (first, second). Defaults to all_pairs.
+    n_resamples (int): Number of random permutations.
+    rng (numpy.random.Generator, optional): Random generator. Defaults to a fresh one.
+
+    Returns:
+    numpy.ndarray: p-value of every pair.
+    """
+    samples = _as_samples(samples)
+    first, second = all_pairs(len(samples)) if pairs is None else pairs
+    rng = np.random.default_rng() if rng is None else rng
+    n = samples.shape[1]
+    # Random permutations of the 2n pooled positions; the first n positions of each form the first group
+    permutations = np.argsort(rng.random((n_resamples, 2 * n)), axis=1)
+    membership = np.zeros((n_resamples, 2 * n))
+    np.put_along_axis(membership, permutations[:, :n], 1.0, axis=1)
+    from_first = samples @ membership[:, :n].T
+    from_second = samples @ membership[:, n:].T
+    sums = samples.sum(axis=1)
+    observed = (sums[first] - sums[second]) / n
+
+    def null_distribution(lo, hi):
+        a, b = first[lo:hi], second[lo:hi]
+        group_sum = from_first[a] + from_second[b]
+        return (2 * group_sum - (sums[a] + sums[b])[:, None]) / n
+
+    return _resampling_p_values(observed, null_distribution, len(observed), n_resamples)
+
+
+# Every pairwise comparison of a sweep in one table
+def pairwise_tests(samples, labels=None, n_bootstrap=DEFAULT_RESAMPLES, n_permutations=DEFAULT_RESAMPLES,
+                   alpha=0.05, equal_var=False, seed=0):
+    """
+    Compare every pair of rows of a sample matrix, such as the coherence curves of a gamma sweep.
+
+    Parameters:
+    samples (array-like): One sample per row, shape (n_groups, n_observations).
+    labels (array-like, optional): Label of each row, such as its gamma. Defaults to the row numbers.
+    n_bootstrap (int): Bootstrap resamples; 0 skips the bootstrap test.
+    n_permutations (int): Random permutations; 0 skips the permutation test.
+    alpha (float): Significance level of the 'significant' columns.
+    equal_var (bool): Use Student's t-test instead of Welch's.
+    seed (int): Seed of the resampling.
+
+    Returns:
+    pandas.DataFrame: One row per pair with 'a', 'b' (labels), 'mean_difference', 't_statistic', 'df',
+    'p_value', 'p_holm', 'p_bh', 'p_bootstrap', 'p_permutation' (when run) and 'significant_holm' and
+    'significant_bh', sorted by p-value.
+    """
+    samples = _as_samples(samples)
+    labels = np.arange(len(samples)) if labels is None else np.asarray(labels)
+    pairs = all_pairs(len(samples))
+    first, second = pairs
+    rng = np.random.default_rng(seed)
+
+    tests = t_tests(samples, pairs, equal_var)
+    means = samples.mean(axis=1)
+    table = pd.DataFrame({
+        'a': labels[first],
+        'b': labels[second],
+        'mean_difference': means[first] - means[second],
+        't_statistic': tests['statistic'],
+        'df': tests['df'],
+        'p_value': tests['p_value'],
+    })
+    # A constant pair has no variance and no p-value; it counts as not significant
+    p_values = np.nan_to_num(tests['p_value'], nan=1.0)
+    table['p_holm'] = holm_correction(p_values)
+    table['p_bh'] = benjamini_hochberg(p_values)
+    if n_bootstrap:
+        table['p_bootstrap'] = bootstrap_tests(samples, pairs, n_bootstrap, rng)
+    if n_permutations:
+        table['p_permutation'] = permutation_tests(samples, pairs, n_permutations, rng)
+    table['significant_holm'] = table['p_holm'] < alpha
+    table['significant_bh'] = table['p_bh'] < alpha
+    return table.sort_values('p_value', kind='stable').reset_index(drop=True)
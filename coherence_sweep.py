@@ -0,0 +1,86 @@
+"""
+Vectorized Coherence Parameter Sweeps
+
+coherence_decay_viz.generate_coherence_data evaluated exp(-gamma t) one decoherence rate at a time, collected
+the curves in a list and always used 100 time points. Sweeps of 10^4 rates over 10^5 time points need the whole
+(gamma x t) surface at once, which this module computes by broadcasting:
+
+- The surface is written straight into one preallocated array, float64 or float32 (half the memory), whose row
+  i holds the coherence curve of gamma_values[i]. The product -gamma t and the exponential are both computed in
+  place, so there are no temporaries the size of the surface.
+- The rates are processed in chunks of rows that fit in chunk_bytes, which bounds the working set, and lets the
+  surface go to a memory-mapped .npy file (flushed chunk by chunk) when it does not fit in memory; np.load(path,
+  mmap_mode='r') opens it again later without reading it.
+- The result is a CoherenceSweep named tuple, which unpacks as time, gamma, coherence = sweep.
+
+A 10^4 x 10^5 float32 sweep is 4 GB and takes a second or two, mostly in the exponential.
+
+Libraries:
+- Numpy: For the broadcasting, the in-place exponential and the .npy memory maps.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Result of a sweep: time points (n_times,), rates (n_gammas,) and coherence surface (n_gammas, n_times)
+CoherenceSweep = namedtuple('CoherenceSweep', ['time', 'gamma', 'coherence'])
+
+# Default number of time points of a sweep, as in the original script
+DEFAULT_TIME_POINTS = 100
+
+# Largest block of the surface computed at once
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+
+# Output array of a sweep: in memory, or a memory-mapped .npy file
+def _allocate(shape, dtype, path):
+    if path is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+
+# Coherence exp(-gamma t) for every rate and time point
+def coherence_sweep(gamma_values, duration, n_times=DEFAULT_TIME_POINTS, dtype=np.float64, path=None, out=None,
+                    chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Compute the coherence decay P(t) = exp(-gamma t) of every decoherence rate on a common time grid.
+
+    Parameters:
+    gamma_values (array-like): Decoherence rates.
+    duration (float): Length of the experiment; the time grid runs from 0 to duration inclusive.
+    n_times (int): Number of time points.
+    dtype: np.float64 or np.float32.
+    path (str, optional): Write the surface to this .npy file through a memory map instead of memory.
+    out (numpy.ndarray, optional): Preallocated (n_gammas, n_times) array to fill instead; overrides 'path'.
+    chunk_bytes (int): Largest block of the surface computed at once.
+
+    Returns:
+    CoherenceSweep: 'time' (n_times,), 'gamma' (n_gammas,) and 'coherence' (n_gammas, n_times), whose row i
+    is the curve of gamma_values[i].
+
+    Raises:
+    ValueError: If 'dtype' is not a floating point type or 'out' has the wrong shape.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise ValueError(f"coherence sweeps need a floating point dtype, got {dtype}")
+    gamma = np.asarray(gamma_values, dtype=dtype).ravel()
+    time = np.linspace(0, duration, n_times, dtype=dtype)
+    shape = (len(gamma), n_times)
+    if out is None:
+        out = _allocate(shape, dtype, path)
+    elif out.shape != shape:
+        raise ValueError(f"output array has shape {out.shape}, expected {shape}")
+
+    rows = max(1, chunk_bytes // max(n_times * out.dtype.itemsize, 1))
+    memmapped = isinstance(out, np.memmap)
+    for lo in range(0, len(gamma), rows):
+        block = out[lo:lo + rows]
+        # Outer product -gamma t straight into the output, then the exponential in place
+        np.multiply(-gamma[lo:lo + rows, None], time, out=block)
+        np.exp(block, out=block)
+        if memmapped:
+            # Hand each finished chunk to the file, so dirty pages never pile up beyond one chunk
+            out.flush()
+    return CoherenceSweep(time, gamma, out)
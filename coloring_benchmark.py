@@ -0,0 +1,291 @@
+"""
+Map Coloring Benchmark
+
+The four-color scripts only ever color a hand-made 8-region map or a 10-node random graph, which says nothing
+about how the colorings hold up at scale. This module generates families of maps, colors them with each
+coloring strategy and writes a JSON report, so that a drop in coloring throughput shows up as a diff against
+an earlier report:
+
+- Planar maps: Delaunay triangulations of random points, the adjacency graphs of random Voronoi maps.
+- Non-planar maps: G(n, p) random graphs with a fixed average degree, like create_complex_map in
+  four_color_theorem_v2 but at any size.
+- Strategies: 'auto' (color_graph, which picks the planar path itself), 'exact' (the backtracking search only),
+  'planar' (color_planar_graph) and 'greedy' (networkx's largest-first greedy coloring, what the scripts used
+  before; it may need more than four colors).
+
+Every (family, size, seed, strategy) run is a separate task in a process pool. Each task builds its own map
+from its seed and runs in a fresh worker process, so its peak memory is its own. The report records wall time,
+colors used, conflicting edges, outcome and peak resident memory of each run. Run it as a script:
+
+    python coloring_benchmark.py --sizes 1000 100000 --output report.json --baseline previous.json
+
+With --baseline, runs that got slower than --slowdown times the baseline time, or that lost a valid coloring,
+are listed and the script exits with status 1.
+
+Libraries:
+- Networkx: For the random graphs and the greedy coloring.
+- Numpy: For random points and conflict counting.
+- Scipy: For the Delaunay triangulations.
+- concurrent.futures: For running the tasks in parallel.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import Delaunay
+
+from four_coloring import (ColoringTimeoutError, NotColorableError, NotPlanarError, color_graph,
+                           color_planar_graph, graph_to_csr)
+
+FAMILIES = ('delaunay', 'gnp')
+STRATEGIES = ('auto', 'exact', 'planar', 'greedy')
+
+# Defaults of the command line
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_SEEDS = 3
+DEFAULT_TIME_LIMIT = 60.0
+
+# Average degree of the G(n, p) maps: dense enough for a 4-core of most nodes, so 'exact' and 'auto' run the
+# backtracking search, yet still 4-colorable (around degree 8 random graphs stop being 4-colorable)
+DEFAULT_GNP_DEGREE = 7.0
+
+# A run counts as a regression when it takes this many times its baseline time, plus this many seconds
+DEFAULT_SLOWDOWN = 1.5
+SLOWDOWN_GRACE = 0.05
+
+
+# Adjacency graph of a random Voronoi map
+def delaunay_map(n, seed):
+    """
+    Build the Delaunay triangulation of n random points in the unit square, which is planar.
+
+    Parameters:
+    n (int): Number of regions (at least 3).
+    seed (int): Seed of the random points.
+
+    Returns:
+    networkx.Graph: Regions 0..n-1 and their adjacencies.
+    """
+    points = np.random.default_rng(seed).random((n, 2))
+    simplices = Delaunay(points).simplices
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(np.concatenate((simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]])).tolist())
+    return G
+
+
+# Sparse random graph of a given average degree
+def random_map(n, average_degree, seed):
+    """
+    Build a G(n, p) random graph with p chosen for the given average degree.
+
+    Parameters:
+    n (int): Number of regions.
+    average_degree (float): Expected number of neighbors of each region.
+    seed (int): Seed of the random graph.
+
+    Returns:
+    networkx.Graph: Regions 0..n-1 and their adjacencies.
+    """
+    return nx.fast_gnp_random_graph(n, min(average_degree / max(n - 1, 1), 1.0), seed=seed)
+
+
+# Color a graph with one of the strategies
+def _color_with(strategy, G, time_limit):
+    if strategy == 'auto':
+        return color_graph(G, time_limit=time_limit)
+    if strategy == 'exact':
+        return color_graph(G, time_limit=time_limit, planar=False)
+    if strategy == 'planar':
+        return color_planar_graph(G, time_limit=time_limit)
+    if strategy == 'greedy':
+        return nx.greedy_color(G, strategy='largest_first')
+    raise ValueError(f"unknown coloring strategy: {strategy}")
+
+
+# Edges whose two ends got the same color
+def count_conflicts(G, coloring):
+    """
+    Count the edges of G whose endpoints share a color.
+
+    Parameters:
+    G (networkx.Graph): The graph.
+    coloring (dict): Color of every node.
+
+    Returns:
+    int: Number of conflicting edges.
+    """
+    nodes, indptr, indices = graph_to_csr(G)
+    colors = np.array([coloring[node] for node in nodes], dtype=np.int64)
+    rows = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+    # Each edge appears twice in the CSR arrays
+    return int(np.count_nonzero(colors[rows] == colors[indices])) // 2
+
+
+# One benchmark run, inside a fresh worker process
+def _run_task(task):
+    """
+    Build one map and color it with one strategy.
+
+    Parameters:
+    task (dict): 'family', 'size', 'seed', 'strategy', 'time_limit' and 'gnp_degree'.
+
+    Returns:
+    dict: The task, plus 'nodes', 'edges', 'status', 'build_seconds', 'seconds', 'colors_used', 'conflicts'
+    and 'peak_rss_mb'.
+    """
+    start = time.perf_counter()
+    if task['family'] == 'delaunay':
+        G = delaunay_map(task['size'], task['seed'])
+    elif task['family'] == 'gnp':
+        G = random_map(task['size'], task['gnp_degree'], task['seed'])
+    else:
+        raise ValueError(f"unknown map family: {task['family']}")
+    build_seconds = time.perf_counter() - start
+
+    coloring = None
+    start = time.perf_counter()
+    try:
+        coloring = _color_with(task['strategy'], G, task['time_limit'])
+        status = 'ok'
+    except NotColorableError:
+        status = 'not_colorable'
+    except ColoringTimeoutError:
+        status = 'timeout'
+    except NotPlanarError:
+        # color_planar_graph turns down graphs that peeling shows are not planar; any other error fails the run
+        status = 'not_planar'
+    seconds = time.perf_counter() - start
+
+    return {
+        **task,
+        'nodes': G.number_of_nodes(),
+        'edges': G.number_of_edges(),
+        'status': status,
+        'build_seconds': build_seconds,
+        'seconds': seconds,
+        'colors_used': len(set(coloring.values())) if coloring else None,
+        'conflicts': count_conflicts(G, coloring) if coloring else None,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+# Run every combination of family, size, seed and strategy
+def run_benchmark(families=FAMILIES, sizes=DEFAULT_SIZES, strategies=STRATEGIES, seeds=DEFAULT_SEEDS,
+                  time_limit=DEFAULT_TIME_LIMIT, gnp_degree=DEFAULT_GNP_DEGREE, processes=None):
+    """
+    Color every generated map with every strategy across a process pool.
+
+    Parameters:
+    families (iterable): Map families, from FAMILIES.
+    sizes (iterable): Numbers of regions.
+    strategies (iterable): Coloring strategies, from STRATEGIES.
+    seeds (int): Number of random maps of each family and size.
+    time_limit (float): Time budget in seconds of each coloring.
+    gnp_degree (float): Average degree of the 'gnp' maps.
+    processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+    dict: 'environment' (Python, platform and CPU count, time of the run) and 'runs' (one dict per task, as
+    returned by _run_task).
+    """
+    tasks = [{'family': family, 'size': int(size), 'seed': seed, 'strategy': strategy,
+              'time_limit': time_limit, 'gnp_degree': gnp_degree}
+             for family in families for size in sizes for seed in range(seeds) for strategy in strategies]
+    # Largest maps first, so no big task is left running alone at the end
+    ordered = sorted(tasks, key=lambda task: -task['size'])
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes, max_tasks_per_child=1) as executor:
+        runs = list(executor.map(_run_task, ordered))
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'processes': processes,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'runs': sorted(runs, key=lambda run: (run['family'], run['size'], run['seed'], run['strategy'])),
+    }
+
+
+# Runs that got slower or lost their coloring since a baseline report
+def compare_reports(report, baseline, slowdown=DEFAULT_SLOWDOWN):
+    """
+    Compare a report against a baseline report, run by run.
+
+    Parameters:
+    report (dict): Report from run_benchmark.
+    baseline (dict): Earlier report.
+    slowdown (float): Factor on the baseline time above which a run counts as slower.
+
+    Returns:
+    list: One message per regression; empty when there is none.
+    """
+    def key(run):
+        return run['family'], run['size'], run['seed'], run['strategy']
+
+    previous = {key(run): run for run in baseline['runs']}
+    regressions = []
+    for run in report['runs']:
+        before = previous.get(key(run))
+        if before is None:
+            continue
+        name = '{} n={} seed={} {}'.format(*key(run))
+        if before['status'] == 'ok' and run['status'] != 'ok':
+            regressions.append(f"{name}: {run['status']} (was ok)")
+        elif run['status'] == 'ok' and before['status'] == 'ok':
+            if run['seconds'] > slowdown * before['seconds'] + SLOWDOWN_GRACE:
+                regressions.append(f"{name}: {run['seconds']:.3f} s (was {before['seconds']:.3f} s)")
+            if run['conflicts'] > before['conflicts'] or run['colors_used'] > before['colors_used']:
+                regressions.append(f"{name}: {run['colors_used']} colors, {run['conflicts']} conflicts "
+                                   f"(was {before['colors_used']} colors, {before['conflicts']} conflicts)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the map coloring strategies on random maps.")
+    parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument('--seeds', type=int, default=DEFAULT_SEEDS, help="random maps per family and size")
+    parser.add_argument('--time-limit', type=float, default=DEFAULT_TIME_LIMIT, help="seconds per coloring")
+    parser.add_argument('--gnp-degree', type=float, default=DEFAULT_GNP_DEGREE,
+                        help="average degree of the G(n, p) maps")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', default='coloring_benchmark.json', help="where to write the JSON report")
+    parser.add_argument('--baseline', default=None, help="earlier JSON report to check for regressions")
+    parser.add_argument('--slowdown', type=float, default=DEFAULT_SLOWDOWN,
+                        help="time factor over the baseline that counts as a regression")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.families, args.sizes, args.strategies, args.seeds, args.time_limit,
+                           args.gnp_degree, args.processes)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for run in report['runs']:
+        print(f"{run['family']:>8} n={run['size']:<8} seed={run['seed']} {run['strategy']:>6}: {run['status']:<13} "
+              f"{run['seconds']:8.3f} s  colors={run['colors_used']} conflicts={run['conflicts']} "
+              f"rss={run['peak_rss_mb']:.0f} MB")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(report, json.load(f), args.slowdown)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Crossing Detection for Projected Knot Curves
+
+Reading a knot diagram off a sampled curve (jones_polynomial.pd_from_curve) needs every self-crossing of its
+projection onto the xy-plane, with the height of both strands. Testing every pair of segments is O(n^2), too slow
+for the 10^5 samples of a smooth deformation. This module finds the crossings with a uniform grid instead:
+
+- The plane is cut into square cells about twice the median segment length, so a segment touches a handful of
+  cells. Segments much longer than a cell (such as the chord that closes an open arc) are split into cell-sized
+  pieces first, so they are binned along their length and not over their whole bounding box.
+- The (cell, segment) entries are kept sorted by cell. Candidate pairs are the segments that share a cell, found
+  with searchsorted, deduplicated, and tested for intersection all at once with numpy. For a curve of n segments
+  with k crossings this is O(n log n + k), dominated by the sort.
+- CrossingIndex keeps the grid and the crossings between calls. When the curve changes, only segments with a
+  moved endpoint are rebinned and retested against their cell neighbours; crossings between unmoved segments are
+  kept. When most of the curve moves, as under the Transform slider, it rebuilds from scratch, which is cheaper.
+
+Each crossing reports the two segments, the fractions along them at which they cross, and which one lies above.
+10^5 samples of a trefoil take a few tens of milliseconds.
+
+Libraries:
+- Numpy: For the grid binning, the sorted cell lookups and the batched intersection tests.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Self-crossings of a closed polyline: segment first[c] (from vertex first[c] to first[c] + 1) crosses segment
+# second[c] > first[c] at fractions s[c] and u[c] along them; first_over[c] when the first one is higher
+Crossings = namedtuple('Crossings', ['first', 'second', 's', 'u', 'first_over'])
+
+# Cell side as a multiple of the median segment length
+CELL_FACTOR = 2.0
+
+# Share of moved segments above which an update rebuilds the whole index
+REBUILD_FRACTION = 0.5
+
+# Offset that packs a (cell x, cell y) pair into one int64 key
+_KEY_SHIFT = 1 << 32
+
+
+# Default cell side for a curve
+def _cell_size(start, delta):
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    positive = length[length > 0]
+    return CELL_FACTOR * float(np.median(positive)) if len(positive) else 1.0
+
+
+# Sorted (cell key, segment) entries of some segments
+def _bin_segments(start, delta, segments, cell):
+    a = start[segments]
+    d = delta[segments]
+    # Split every segment into pieces no longer than a cell; each piece then spans at most 2 x 2 cells
+    pieces = np.maximum(1, np.ceil(np.hypot(d[:, 0], d[:, 1]) / cell)).astype(np.int64)
+    owner = np.repeat(np.arange(len(segments)), pieces)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    lo_t = (step / pieces[owner])[:, None]
+    hi_t = ((step + 1) / pieces[owner])[:, None]
+    p = a[owner] + lo_t * d[owner]
+    q = a[owner] + hi_t * d[owner]
+    lo = np.floor(np.minimum(p, q) / cell).astype(np.int64)
+    hi = np.floor(np.maximum(p, q) / cell).astype(np.int64)
+    cx = np.stack((lo[:, 0], hi[:, 0], lo[:, 0], hi[:, 0]), axis=1).ravel()
+    cy = np.stack((lo[:, 1], lo[:, 1], hi[:, 1], hi[:, 1]), axis=1).ravel()
+    keys = cx * _KEY_SHIFT + cy
+    ids = np.repeat(segments[owner], 4)
+    # Sort by cell, then segment, and drop repeated entries
+    order = np.lexsort((ids, keys))
+    keys, ids = keys[order], ids[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+    return keys[keep], ids[keep]
+
+
+# Segment pairs sharing a cell with one of the query entries
+def _candidate_pairs(keys, ids, query_keys, query_ids, moved, n):
+    left = np.searchsorted(keys, query_keys, side='left')
+    right = np.searchsorted(keys, query_keys, side='right')
+    counts = right - left
+    query = np.repeat(query_ids, counts)
+    other = ids[np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - left, counts)]
+    # A pair of two moved segments is found from both ends; keep it once
+    keep = (other != query) & (~moved[other] | (other > query))
+    first = np.minimum(query[keep], other[keep])
+    second = np.maximum(query[keep], other[keep])
+    # Segments that share a vertex always touch; they never cross
+    keep = (second != first + 1) & ~((first == 0) & (second == n - 1))
+    codes = np.unique(first[keep] * n + second[keep])
+    return codes // n, codes % n
+
+
+# Exact intersection tests of candidate segment pairs
+def _intersect(points, delta, first, second):
+    start = points[:, :2]
+    d1, d2 = delta[first, :2], delta[second, :2]
+    offset = start[second] - start[first]
+    denominator = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = (offset[:, 0] * d2[:, 1] - offset[:, 1] * d2[:, 0]) / denominator
+        u = (offset[:, 0] * d1[:, 1] - offset[:, 1] * d1[:, 0]) / denominator
+    hit = (denominator != 0) & (s >= 0) & (s < 1) & (u >= 0) & (u < 1)
+    first, second, s, u = first[hit], second[hit], s[hit], u[hit]
+    z_first = points[first, 2] + s * delta[first, 2]
+    z_second = points[second, 2] + u * delta[second, 2]
+    return Crossings(first, second, s, u, z_first > z_second)
+
+
+# Closed polyline as vertex and edge arrays
+def _as_curve(points):
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"points must have shape (n, 3), got {points.shape}")
+    return points, np.roll(points, -1, axis=0) - points
+
+
+# Self-crossings of a sampled closed curve
+def find_crossings(points, cell_size=None):
+    """
+    Find every self-crossing of the projection of a closed 3D polyline onto the xy-plane.
+
+    Parameters:
+    points (array-like): Vertices, shape (n, 3); the last vertex connects back to the first.
+    cell_size (float, optional): Side of the grid cells. Defaults to CELL_FACTOR times the median segment length.
+
+    Returns:
+    Crossings: The crossings, ordered by (first, second).
+    """
+    return CrossingIndex(points, cell_size).crossings
+
+
+class CrossingIndex:
+    """
+    Grid of the segments of a closed polyline, with its self-crossings, kept up to date as the curve moves.
+
+    Attributes:
+    points (numpy.ndarray): Current vertices, shape (n, 3).
+    cell_size (float): Side of the grid cells.
+    crossings (Crossings): Current crossings, ordered by (first, second).
+    """
+
+    def __init__(self, points, cell_size=None):
+        self._fixed_cell = cell_size
+        self._build(*_as_curve(points))
+
+    # Bin every segment and test all pairs that share a cell
+    def _build(self, points, delta):
+        n = len(points)
+        self.points = points
+        self._delta = delta
+        self.cell_size = self._fixed_cell or _cell_size(points[:, :2], delta[:, :2])
+        segments = np.arange(n)
+        self._keys, self._ids = _bin_segments(points[:, :2], delta[:, :2], segments, self.cell_size)
+        moved = np.ones(n, dtype=bool)
+        first, second = _candidate_pairs(self._keys, self._ids, self._keys, self._ids, moved, n)
+        self.crossings = _intersect(points, delta, first, second)
+
+    # Move the curve to new vertex positions
+    def update(self, points):
+        """
+        Update the crossings for new positions of the same number of vertices.
+
+        Segments whose endpoints did not move keep their grid entries and the crossings between them; the others
+        are rebinned and retested. An update that moves more than REBUILD_FRACTION of the segments, or changes the
+        number of vertices, rebuilds the index.
+
+        Parameters:
+        points (array-like): New vertices, shape (n, 3).
+
+        Returns:
+        Crossings: The updated crossings.
+        """
+        points, delta = _as_curve(points)
+        n = len(points)
+        if n != len(self.points):
+            self._build(points, delta)
+            return self.crossings
+        vertex_moved = np.any(points != self.points, axis=1)
+        # Segment i runs from vertex i to vertex i + 1
+        moved = vertex_moved | np.roll(vertex_moved, -1)
+        n_moved = np.count_nonzero(moved)
+        if n_moved == 0:
+            return self.crossings
+        if n_moved > REBUILD_FRACTION * n:
+            self._build(points, delta)
+            return self.crossings
+
+        self.points = points
+        self._delta = delta
+        # Rebin the moved segments, merging their entries into the sorted grid
+        keep = ~moved[self._ids]
+        keys, ids = self._keys[keep], self._ids[keep]
+        new_keys, new_ids = _bin_segments(points[:, :2], delta[:, :2], np.flatnonzero(moved), self.cell_size)
+        positions = np.searchsorted(keys, new_keys, side='right')
+        self._keys = np.insert(keys, positions, new_keys)
+        self._ids = np.insert(ids, positions, new_ids)
+
+        old = self.crossings
+        kept = ~(moved[old.first] | moved[old.second])
+        first, second = _candidate_pairs(self._keys, self._ids, new_keys, new_ids, moved, n)
+        found = _intersect(points, delta, first, second)
+        merged = [np.concatenate((a[kept], b)) for a, b in zip(old, found)]
+        order = np.lexsort((merged[1], merged[0]))
+        self.crossings = Crossings(*(field[order] for field in merged))
+        return self.crossings
@@ -0,0 +1,104 @@
+"""
+Single-Artist Edge Rendering for the 4D Scripts
+
+The tesseract scripts drew every edge with its own ax.plot call, and 4d_as_color.py also looked up the
+colormap once per edge. That is fine for the 32 edges of a tesseract, but an n-cube has n 2^(n-1) edges and
+every artist costs Matplotlib time on each draw. EdgeRenderer draws all edges of a wireframe as one
+Line3DCollection instead:
+
+- The (edges x 2 x 3) segment array is allocated once and refilled in place from the projected vertices on
+  every update (one fancy-indexing take), so animations create no artists or segment lists per frame.
+- Per-edge colors are either one fixed color or one value per edge mapped through a colormap by the collection
+  itself, in a single vectorized lookup at draw time.
+- update_scatter does the same for the vertex markers of a 3D scatter plot.
+
+Drawing one collection costs about the same for tens of thousands of edges as the old loop did for a few
+dozen, because the per-artist overhead is paid once.
+
+Libraries:
+- Matplotlib: For the 3D line collection.
+- Numpy: For the segment arrays.
+"""
+
+import numpy as np
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+
+class EdgeRenderer:
+    """
+    All edges of a wireframe in a 3D axes, drawn as one Line3DCollection.
+
+    Call update() with the projected 3D vertex positions whenever they move; the edge list is fixed.
+    """
+
+    def __init__(self, ax, edges, color='b', values=None, cmap=None, clim=None, **line_kwargs):
+        """
+        Parameters:
+        ax (mpl_toolkits.mplot3d.Axes3D): Axes to draw into.
+        edges (array-like): Vertex index pairs, shape (m, 2).
+        color: Color of every edge, when no 'values' are given.
+        values (array-like, optional): One value per edge, mapped to colors through 'cmap'.
+        cmap (str or Colormap, optional): Colormap for 'values'.
+        clim (tuple, optional): Value range mapped onto the colormap. Defaults to the range of 'values'.
+        line_kwargs: Further Line3DCollection properties, such as linewidths or alpha.
+        """
+        self.edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        self._segments = np.zeros((len(self.edges), 2, 3))
+        if values is None:
+            self.collection = Line3DCollection(self._segments, colors=color, **line_kwargs)
+        else:
+            self.collection = Line3DCollection(self._segments, cmap=cmap, **line_kwargs)
+            self.set_values(values, clim)
+        ax.add_collection3d(self.collection)
+
+    def update(self, points):
+        """
+        Move the edges to new vertex positions, reusing the segment array.
+
+        Parameters:
+        points (numpy.ndarray): Vertex positions, shape (n, 3) or wider (only the first three columns are used).
+        Float32 positions (as from projection4d) are used as they are, without a float64 copy.
+        """
+        points = np.asarray(points)
+        if points.dtype.kind != 'f':
+            points = points.astype(np.float64)
+        if points.dtype != self._segments.dtype:
+            # The segments follow the precision of the positions, so take() can fill them without casting
+            self._segments = np.empty(self._segments.shape, dtype=points.dtype)
+        np.take(points[:, :3], self.edges, axis=0, out=self._segments)
+        self.collection.set_segments(self._segments)
+
+    def set_values(self, values, clim=None):
+        """
+        Color the edges by one value each through the collection's colormap.
+
+        Parameters:
+        values (array-like): One value per edge.
+        clim (tuple, optional): Value range mapped onto the colormap. Defaults to the range of 'values'.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.collection.set_array(values)
+        if clim is not None:
+            self.collection.set_clim(*clim)
+        elif len(values):
+            self.collection.set_clim(values.min(), values.max())
+
+    def artists(self):
+        """
+        The artists to return from an animation update function.
+        """
+        return self.collection,
+
+
+# Move the markers of an existing 3D scatter plot
+def update_scatter(scatter, points):
+    """
+    Set the 3D positions of the markers of a scatter plot made with Axes3D.scatter.
+
+    Parameters:
+    scatter (mpl_toolkits.mplot3d.art3d.Path3DCollection): The scatter plot.
+    points (numpy.ndarray): Marker positions, shape (n, 3) or wider.
+    """
+    points = np.asarray(points)
+    scatter._offsets3d = (points[:, 0], points[:, 1], points[:, 2])
+    scatter.stale = True
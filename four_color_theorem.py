@@ -3,6 +3,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from four_coloring import color_graph
+from graph_layout import edge_coordinates, graph_layout, node_coordinates
+
 # Define four colors
 colors = ['red', 'blue', 'green', 'yellow']
 
@@ -30,21 +33,12 @@ def create_map_graph():
 def plot_map(G, node_colors=None):
     """
     Plots the graph using Plotly, with interactive color options for nodes (regions).
+    Returns the figure; call its show() method to display it.
     """
-    pos = nx.spring_layout(G)  # Position the nodes in a visually appealing way
-    edge_x = []
-    edge_y = []
+    pos = graph_layout(G)  # Cached force-directed layout, so redraws keep every region in place
     
     # Extract edge coordinates for Plotly
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.append(x0)
-        edge_x.append(x1)
-        edge_x.append(None)
-        edge_y.append(y0)
-        edge_y.append(y1)
-        edge_y.append(None)
+    edge_x, edge_y = edge_coordinates(G, pos)
     
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -52,12 +46,7 @@ def plot_map(G, node_colors=None):
         hoverinfo='none',
         mode='lines')
     
-    node_x = []
-    node_y = []
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
+    node_x, node_y = node_coordinates(G, pos)
     
     # Default node colors if none provided
     if node_colors is None:
@@ -83,8 +72,7 @@ def plot_map(G, node_colors=None):
     # Create the full figure
     fig = go.Figure(data=[edge_trace, node_trace],
                     layout=go.Layout(
-                        title='<b>Interactive Map Coloring - Four-Color Theorem</b>',
-                        titlefont_size=16,
+                        title=dict(text='<b>Interactive Map Coloring - Four-Color Theorem</b>', font=dict(size=16)),
                         showlegend=False,
                         hovermode='closest',
                         margin=dict(b=0, l=0, r=0, t=40),
@@ -93,27 +81,33 @@ def plot_map(G, node_colors=None):
                             xref="paper", yref="paper",
                             x=0.005, y=-0.002)]))
     
-    fig.show()
+    return fig
 
 # Function to assign colors while ensuring no two adjacent regions share the same color
 def assign_colors(G):
     """
     Assign colors to the graph using the four-color theorem.
     Ensures no two adjacent nodes share the same color.
+
+    Raises NotColorableError (from four_coloring) if the graph needs more than four colors.
     """
-    # Greedy coloring algorithm
-    color_map = nx.coloring.greedy_color(G, strategy="largest_first")
+    # Exact search: DSATUR ordering with forward checking and backjumping
+    color_map = color_graph(G, n_colors=len(colors))
     
     # Convert to a color format (using the predefined 4 colors)
     node_colors = []
     for node in G.nodes():
-        color_index = color_map[node] % len(colors)  # Ensuring 4 colors max
-        node_colors.append(colors[color_index])
+        node_colors.append(colors[color_map[node]])
     
     return node_colors
 
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    G = create_map_graph()
+    return [plot_map(G, assign_colors(G))]
+
 # Main execution
 if __name__ == "__main__":
     G = create_map_graph()        # Create the map graph
     node_colors = assign_colors(G)  # Assign colors according to the four-color theorem
-    plot_map(G, node_colors)        # Plot the graph with assigned colors
+    plot_map(G, node_colors).show()  # Plot the graph with assigned colors
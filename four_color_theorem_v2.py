@@ -3,6 +3,9 @@ import plotly.graph_objects as go
 import numpy as np
 import random
 
+from four_coloring import ColoringSession, NotColorableError, color_graph
+from graph_layout import edge_coordinates, graph_layout, node_coordinates
+
 # Define four colors
 colors = ['#FF6347', '#4682B4', '#32CD32', '#FFD700']  # Red, Blue, Green, Yellow
 color_names = ['Red', 'Blue', 'Green', 'Yellow']
@@ -17,25 +20,17 @@ def create_complex_map(num_nodes, edge_probability=0.3):
     return G
 
 # Function to plot the graph and allow color interactions
-def plot_map(G, node_colors):
+def plot_map(G, node_colors, pos=None):
     """
     Plots the graph using Plotly, with interactive color options for nodes (regions).
     The graph allows manual color changing.
+    Pass 'pos' to reuse node positions from an earlier plot instead of computing a new layout.
     """
-    pos = nx.spring_layout(G)  # Position the nodes using spring layout (for nicer visuals)
+    if pos is None:
+        pos = graph_layout(G)  # Cached force-directed layout, so redraws keep every region in place
     
     # Extract edges for Plotly
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.append(x0)
-        edge_x.append(x1)
-        edge_x.append(None)
-        edge_y.append(y0)
-        edge_y.append(y1)
-        edge_y.append(None)
+    edge_x, edge_y = edge_coordinates(G, pos)
     
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -44,12 +39,7 @@ def plot_map(G, node_colors):
         mode='lines')
 
     # Plot nodes (regions)
-    node_x = []
-    node_y = []
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
+    node_x, node_y = node_coordinates(G, pos)
 
     node_trace = go.Scatter(
         x=node_x, y=node_y,
@@ -72,8 +62,7 @@ def plot_map(G, node_colors):
     # Create the figure
     fig = go.Figure(data=[edge_trace, node_trace],
                     layout=go.Layout(
-                        title='<b>Interactive Map Coloring - Four-Color Theorem</b>',
-                        titlefont_size=16,
+                        title=dict(text='<b>Interactive Map Coloring - Four-Color Theorem</b>', font=dict(size=16)),
                         showlegend=False,
                         hovermode='closest',
                         margin=dict(b=0, l=0, r=0, t=40),
@@ -103,28 +92,66 @@ def plot_map(G, node_colors):
 
     return fig
 
+# Figure that can be changed after it is displayed
+def live_figure(fig):
+    """
+    Wraps 'fig' in a go.FigureWidget, which sends later changes to the displayed figure as small restyle messages
+    instead of drawing it again. Returns 'fig' itself when widget support (anywidget, in a notebook) is missing.
+    """
+    try:
+        return go.FigureWidget(fig)
+    except ImportError:
+        return fig
+
+# Push changed region colors into an existing figure
+def update_marker_colors(fig, changes, marker_colors=None):
+    """
+    Updates only the marker colors of the regions in 'changes' (region -> color number), leaving the layout and
+    the edge trace of the figure untouched. Pass the same 'marker_colors' list on every call to have it patched
+    in place instead of copying the figure's colors each time.
+    """
+    node_trace = fig.data[1]
+    if marker_colors is None:
+        marker_colors = list(node_trace.marker.color)
+    for node, color in changes.items():
+        marker_colors[node] = colors[color]
+    # One restyle message for the whole change on a FigureWidget
+    with fig.batch_update():
+        node_trace.marker.color = marker_colors
+    return marker_colors
+
 # Manual color change interaction
-def manual_color_change(G, node_colors):
+def manual_color_change(G, node_colors, fig):
     """
     Simulates manual color changes on the map and checks whether the Four-Color Theorem holds.
+    Conflicts are tracked incrementally, and each change only recolors its marker in 'fig'. A FigureWidget (see
+    live_figure) shows every change as it happens; a plain figure is shown once more when the loop ends.
     """
+    session = ColoringSession(G, dict(enumerate(node_colors)))
+    marker_colors = list(fig.data[1].marker.color)
     while True:
-        node = int(input("Enter region number to change color (1-N): ")) - 1
+        entry = input("Enter region number to change color (1-N, blank to finish): ").strip()
+        if not entry:
+            break
+        node = int(entry) - 1
         print("Select a color: 0=Red, 1=Blue, 2=Green, 3=Yellow")
         color = int(input("Enter color number: "))
         
         if node in G.nodes:
             node_colors[node] = color
+            clashes = session.recolor(node, color)
             
             # Validate the coloring
-            for neighbor in G.neighbors(node):
-                if node_colors[neighbor] == color:
-                    print(f"Invalid! Region {node + 1} shares the same color with its neighbor Region {neighbor + 1}.")
-                    break
+            if clashes:
+                print(f"Invalid! Region {node + 1} shares the same color with its neighbor Regions "
+                      f"{', '.join(str(n + 1) for n in sorted(clashes))}.")
             else:
                 print(f"Region {node + 1} is now {color_names[color]}.")
+            if not session.is_valid():
+                print(f"{len(session.conflicting_nodes())} regions still share a color with a neighbor.")
+            update_marker_colors(fig, {node: color}, marker_colors)
 
-        fig = plot_map(G, node_colors)
+    if not isinstance(fig, go.FigureWidget):
         fig.show()
 
 # Function to assign initial valid colors
@@ -132,13 +159,17 @@ def assign_colors(G):
     """
     Assign colors to the graph using the four-color theorem.
     Ensures no two adjacent nodes share the same color.
+
+    Raises NotColorableError (from four_coloring) if the graph needs more than four colors, which random
+    graphs often do since they need not be planar.
     """
-    color_map = nx.coloring.greedy_color(G, strategy="largest_first")
+    # Exact search: DSATUR ordering with forward checking and backjumping
+    color_map = color_graph(G, n_colors=len(colors))
     
     # Convert to a color format (using the predefined 4 colors)
     node_colors = []
     for node in G.nodes():
-        node_colors.append(color_map[node] % len(colors))  # Ensuring 4 colors max
+        node_colors.append(color_map[node])
     
     return node_colors
 
@@ -148,9 +179,14 @@ if __name__ == "__main__":
     edge_probability = 0.4  # The probability that two regions are adjacent
     G = create_complex_map(num_nodes, edge_probability)  # Create a random map graph
 
-    node_colors = assign_colors(G)  # Assign initial valid colors to regions
-    fig = plot_map(G, node_colors)  # Plot the map with initial coloring
-    fig.show()  # Display the initial graph
+    try:
+        node_colors = assign_colors(G)  # Assign initial valid colors to regions
+    except NotColorableError:
+        print("This random map cannot be colored with four colors (it is not planar). Try another one.")
+        raise SystemExit(1)
+    pos = graph_layout(G)  # Computed once and reused by every redraw
+    fig = live_figure(plot_map(G, node_colors, pos))  # Plot the map with initial coloring
+    fig.show()  # Display the initial graph once; later changes are patched into it
 
     # Allow the user to manually change colors and validate the theorem
-    manual_color_change(G, node_colors)
+    manual_color_change(G, node_colors, fig)
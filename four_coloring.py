@@ -0,0 +1,628 @@
+"""
+Exact Graph Coloring for the Four-Color Scripts
+
+The four-color scripts used to color their maps with networkx's greedy coloring and then reduce the colors
+modulo four, which quietly produces adjacent regions of the same color whenever greedy needed a fifth color.
+This module finds a proper coloring with at most k colors (four by default) or proves that none exists:
+
+- Regions with fewer than k neighbors can always be colored last, so they are peeled off first (repeatedly)
+  and only the remaining core is searched.
+- The core is colored in DSATUR order (most constrained region first), taken from a lazy heap of candidates.
+  Ties go to the region reached first by a breadth-first search, so the colored part grows as a compact ball
+  instead of several fronts that later have to be stitched together, which is what makes maps hard.
+- The colors still available to each region are kept as an integer bitmask. Every assignment removes its color
+  from the uncolored neighbors (forward checking), so a dead end is seen as soon as some region runs out.
+- On a dead end the search jumps straight back to the most recent assignment that actually caused it
+  (conflict-directed backjumping), instead of undoing assignments that had nothing to do with it.
+- Backtracking search times are heavy-tailed, so a search that hits too many dead ends restarts from another
+  breadth-first root with a growing allowance, which keeps the search complete.
+
+Maps with 10^5 regions color in seconds. The search is iterative, so deep searches cannot hit the recursion
+limit, and it stops with ColoringTimeoutError once its time budget is spent.
+
+Planar graphs (every real map) take a near-linear path when four colors are asked for:
+
+- Every planar graph has a vertex with at most five neighbors, so peeling vertices of degree <= 5 removes all
+  of them. Adding them back in reverse order, each one sees at most five colored neighbors.
+- Each returning vertex takes a free color among four. When its neighbors use all four, swapping the two colors
+  of a Kempe chain (a connected two-colored piece of the map) frees one, as in Kempe's proof; if no short chain
+  works, the vertex takes a fifth color or, with all five around it, the five-color theorem's chain swap frees
+  one. Chains are capped in size, since on large maps they would otherwise span the whole map.
+- A second pass retries the Kempe swaps on the few vertices with the fifth color (or none), now that the whole
+  map is colored.
+  Anything still left is recolored exactly in a small neighborhood with the search above, with the colors
+  around the neighborhood held fixed, and the neighborhood grows until it succeeds.
+
+All loops run over the CSR adjacency from graph_to_csr rather than networkx's dictionaries, so maps color in
+about ten seconds per million regions. Networkx's planarity test is slower than the coloring itself; callers
+that know their graph is planar can skip it with color_graph(..., planar=True).
+
+ColoringSession keeps track of the conflicts of a coloring that is being edited by hand, one region at a time.
+
+Libraries:
+- Networkx: For the input graphs and the planarity test.
+- Numpy: For the compressed adjacency arrays.
+"""
+
+import heapq
+import random
+import time
+from collections import deque
+
+import networkx as nx
+import numpy as np
+
+# Check the time budget once every this many search steps
+TIME_CHECK_INTERVAL = 1024
+
+# Dead ends allowed before the first restart (at least this, or one per RESTART_CORE_SHARE core regions), and the
+# factor by which the allowance grows after each restart
+RESTART_DEAD_ENDS = 100
+RESTART_CORE_SHARE = 10
+RESTART_GROWTH = 1.5
+
+# Planar graphs have a vertex of at most this degree, so peeling such vertices empties them
+PLANAR_DEGENERACY = 5
+
+# Kempe chains larger than this are not swapped: on large maps two-colored chains percolate across the map, and
+# the rare vertex that needs one is cheaper to fix by recoloring its neighborhood exactly
+KEMPE_CHAIN_LIMIT = 64
+
+# Breadth-first radius of the first neighborhood recolored exactly around vertices the Kempe passes left over
+REPAIR_RADIUS = 2
+
+
+class NotColorableError(ValueError):
+    """
+    Raised when a graph provably has no proper coloring with the requested number of colors.
+    """
+
+
+class ColoringTimeoutError(TimeoutError):
+    """
+    Raised when the search runs out of its time budget before finding a coloring or proving there is none.
+    """
+
+
+class NotPlanarError(ValueError):
+    """
+    Raised by color_planar_graph when peeling shows the graph is not planar.
+    """
+
+
+# Compressed sparse row adjacency of a networkx graph
+def graph_to_csr(G):
+    """
+    Convert a graph to compressed sparse row (CSR) form, with nodes numbered 0..n-1 in G.nodes() order.
+
+    Parameters:
+    G (networkx.Graph): The graph; self-loops are ignored.
+
+    Returns:
+    tuple: The node list, indptr and indices arrays; the neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges() if u != v], dtype=np.int64).reshape(-1, 2)
+
+    # Each edge appears once in each direction
+    rows = np.concatenate((edges[:, 0], edges[:, 1]))
+    cols = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(nodes)), out=indptr[1:])
+    return nodes, indptr, cols
+
+
+# Neighbor lists from the CSR arrays, as Python lists for the search loops
+def _csr_neighbors(indptr, indices):
+    flat = indices.tolist()
+    bounds = indptr.tolist()
+    return [flat[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+# Repeatedly remove vertices with fewer than k remaining neighbors
+def _peel_low_degree(neighbors, k):
+    """
+    Peel off every vertex that has fewer than k neighbors among the vertices not yet peeled.
+
+    Returns:
+    tuple: The peeled vertices in removal order, and a boolean list marking the vertices of the remaining core.
+    """
+    degree = [len(adj) for adj in neighbors]
+    in_core = [True] * len(neighbors)
+    stack = [v for v, d in enumerate(degree) if d < k]
+    for v in stack:
+        in_core[v] = False
+    peeled = []
+    while stack:
+        v = stack.pop()
+        peeled.append(v)
+        for u in neighbors[v]:
+            if in_core[u]:
+                degree[u] -= 1
+                if degree[u] < k:
+                    in_core[u] = False
+                    stack.append(u)
+    return peeled, in_core
+
+
+# Breadth-first order of the core, starting from 'start', so the colored region grows as a compact ball
+def _bfs_rank(neighbors, in_core, start):
+    n = len(neighbors)
+    rank = [n] * n
+    order = 0
+    for root in [start] + list(range(n)):
+        if not in_core[root] or rank[root] < n:
+            continue
+        rank[root] = order
+        order += 1
+        queue = deque([root])
+        while queue:
+            v = queue.popleft()
+            for u in neighbors[v]:
+                if in_core[u] and rank[u] == n:
+                    rank[u] = order
+                    order += 1
+                    queue.append(u)
+    return rank
+
+
+# Color of 'untried' that the fewest uncolored neighbors of v could still take
+def _least_constraining(untried, v, core_neighbors, color, domain):
+    best, best_count = 0, None
+    while untried:
+        bit = untried & -untried
+        untried ^= bit
+        count = 0
+        for u in core_neighbors[v]:
+            if color[u] < 0 and domain[u] & bit:
+                count += 1
+        if best_count is None or count < best_count:
+            best, best_count = bit, count
+    return best
+
+
+# DSATUR search with forward checking and conflict-directed backjumping on the core
+def _search_core(neighbors, in_core, k, deadline, rank, max_dead_ends, fixed=None):
+    """
+    Color the core vertices with k colors.
+
+    Parameters:
+    neighbors (list): Neighbor lists of every vertex.
+    in_core (list): Whether each vertex belongs to the core.
+    k (int): Number of colors.
+    deadline (float): time.perf_counter() value at which to give up, or None.
+    rank (list): Tie-break between vertices of equal saturation.
+    max_dead_ends (int): Dead ends after which the attempt is abandoned.
+    fixed (list, optional): Colors (-1 for none) of the vertices outside the core, which core neighbors must avoid.
+
+    Returns:
+    list: Color of every vertex, -1 outside the core, or None when the attempt was abandoned.
+
+    Raises:
+    NotColorableError: If the core has no k-coloring (consistent with 'fixed').
+    ColoringTimeoutError: If the deadline passes first.
+    """
+    n = len(neighbors)
+    full = (1 << k) - 1
+    color = [-1] * n
+    domain = [full] * n
+    core_neighbors = [[u for u in neighbors[v] if in_core[u]] if in_core[v] else [] for v in range(n)]
+    # pruned_by[u] lists the search levels that removed a color from u's domain, in order
+    pruned_by = [[] for _ in range(n)]
+
+    if fixed is not None:
+        # Fixed colors are never available to core neighbors, and no search level is to blame for that
+        for v in range(n):
+            if in_core[v]:
+                for u in neighbors[v]:
+                    if not in_core[u] and fixed[u] >= 0:
+                        domain[v] &= ~(1 << fixed[u])
+                if not domain[v]:
+                    raise NotColorableError(f"fixed colors leave no color for vertex {v}")
+
+    def key(v):
+        return domain[v].bit_count(), rank[v], v
+
+    heap = [key(v) for v in range(n) if in_core[v]]
+    heapq.heapify(heap)
+    remaining = len(heap)
+
+    # Per level: vertex, colors not tried yet, (neighbor, bit) prunings of the current color, conflict set
+    levels = []
+    steps = 0
+    dead_ends = 0
+
+    def select():
+        # Stale entries pile up during long searches; rebuild from the uncolored core now and then
+        if len(heap) > 8 * n + 1024:
+            heap[:] = [key(v) for v in range(n) if in_core[v] and color[v] < 0]
+            heapq.heapify(heap)
+        while heap:
+            size, _, v = heapq.heappop(heap)
+            if color[v] < 0 and domain[v].bit_count() == size:
+                return v
+        return None
+
+    def undo(level):
+        v, _, prunings, _ = level
+        for u, bit in prunings:
+            domain[u] |= bit
+            pruned_by[u].pop()
+            heapq.heappush(heap, key(u))
+        prunings.clear()
+        color[v] = -1
+
+    def push(v):
+        levels.append([v, domain[v], [], set(pruned_by[v])])
+
+    if remaining == 0:
+        return color
+    push(select())
+    while levels:
+        steps += 1
+        if deadline is not None and steps % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            raise ColoringTimeoutError("coloring search ran out of time")
+
+        depth = len(levels) - 1
+        level = levels[-1]
+        v, untried, prunings, conflicts = level
+        if color[v] >= 0:
+            undo(level)
+
+        assigned = False
+        while untried:
+            bit = _least_constraining(untried, v, core_neighbors, color, domain)
+            untried ^= bit
+            color[v] = bit.bit_length() - 1
+
+            # Forward checking: take the color away from every uncolored neighbor still allowed it
+            wiped = None
+            for u in core_neighbors[v]:
+                if color[u] < 0 and domain[u] & bit:
+                    domain[u] ^= bit
+                    pruned_by[u].append(depth)
+                    prunings.append((u, bit))
+                    if not domain[u]:
+                        wiped = u
+                        break
+                    heapq.heappush(heap, key(u))
+            if wiped is None:
+                assigned = True
+                break
+            # The levels that emptied the neighbor's domain, other than this one, share the blame
+            conflicts.update(d for d in pruned_by[wiped] if d != depth)
+            undo(level)
+        level[1] = untried
+
+        if assigned:
+            remaining -= 1
+            if remaining == 0:
+                return color
+            push(select())
+            continue
+
+        # Dead end: jump back to the deepest level in the conflict set, handing it the rest of the blame
+        if not conflicts:
+            raise NotColorableError(f"graph is not {k}-colorable")
+        dead_ends += 1
+        if dead_ends > max_dead_ends:
+            return None
+        target = max(conflicts)
+        levels.pop()
+        heapq.heappush(heap, key(v))
+        while len(levels) - 1 > target:
+            skipped = levels.pop()
+            undo(skipped)
+            remaining += 1
+            heapq.heappush(heap, key(skipped[0]))
+        levels[target][3].update(d for d in conflicts if d != target)
+        remaining += 1
+    raise NotColorableError(f"graph is not {k}-colorable")
+
+
+# Search the core with restarts until it is colored
+def _solve_core(neighbors, in_core, k, deadline, rng, fixed=None):
+    # Search times are heavy-tailed, so a stuck search restarts from another root with a larger allowance
+    n = len(neighbors)
+    rank = _bfs_rank(neighbors, in_core, rng.randrange(n))
+    max_dead_ends = max(RESTART_DEAD_ENDS, sum(in_core) // RESTART_CORE_SHARE)
+    while True:
+        color = _search_core(neighbors, in_core, k, deadline, rank, max_dead_ends, fixed)
+        if color is not None:
+            return color
+        rank = _bfs_rank(neighbors, in_core, rng.randrange(n))
+        max_dead_ends = int(max_dead_ends * RESTART_GROWTH)
+
+
+# Two-colored component (Kempe chain) through 'starts', or None as soon as it reaches one of 'targets' or
+# outgrows KEMPE_CHAIN_LIMIT
+def _kempe_chain(neighbors, color, starts, a, b, targets):
+    chain = set(starts)
+    stack = list(starts)
+    while stack:
+        v = stack.pop()
+        for u in neighbors[v]:
+            if (color[u] == a or color[u] == b) and u not in chain:
+                if u in targets or len(chain) >= KEMPE_CHAIN_LIMIT:
+                    return None
+                chain.add(u)
+                stack.append(u)
+    return chain
+
+
+# Give v one of colors 0..k-1, swapping a Kempe chain when its neighbors already use all of them
+def _kempe_insert(neighbors, color, v, k):
+    """
+    Color the uncolored vertex v with a color below k that none of its neighbors has.
+
+    When every such color is taken, look for colors a and b such that the a-b chains through the a-colored
+    neighbors reach no b-colored neighbor; swapping a and b on those chains frees a for v.
+
+    Returns:
+    bool: Whether v was colored.
+    """
+    by_color = [[] for _ in range(k)]
+    for u in neighbors[v]:
+        if 0 <= color[u] < k:
+            by_color[color[u]].append(u)
+    for c in range(k):
+        if not by_color[c]:
+            color[v] = c
+            return True
+
+    # Chains through fewer neighbors are cheaper to grow and less likely to run into the other color
+    for a in sorted(range(k), key=lambda c: len(by_color[c])):
+        for b in range(k):
+            if b == a:
+                continue
+            chain = _kempe_chain(neighbors, color, by_color[a], a, b, set(by_color[b]))
+            if chain is not None:
+                for u in chain:
+                    color[u] = a + b - color[u]
+                color[v] = a
+                return True
+    return False
+
+
+# Exact recoloring of a growing neighborhood of v, with the colors around it held fixed
+def _repair_neighborhood(neighbors, color, v, deadline, rng):
+    """
+    Recolor the vertices within some breadth-first radius of v so that all of them, v included, get one of
+    four colors. The radius starts at REPAIR_RADIUS and doubles while the fixed colors around the neighborhood
+    leave no solution.
+
+    Raises:
+    NotColorableError: If the neighborhood grows to the whole component of v and still has no 4-coloring.
+    """
+    radius = REPAIR_RADIUS
+    while True:
+        # Local numbering: the neighborhood first, then the vertices bordering it
+        local = {v: 0}
+        region = [v]
+        frontier = [v]
+        for _ in range(radius):
+            grown = []
+            for w in frontier:
+                for u in neighbors[w]:
+                    if u not in local:
+                        local[u] = len(region)
+                        region.append(u)
+                        grown.append(u)
+            frontier = grown
+        boundary = []
+        for w in frontier:
+            for u in neighbors[w]:
+                if u not in local:
+                    local[u] = len(region) + len(boundary)
+                    boundary.append(u)
+
+        sub_neighbors = [[local[u] for u in neighbors[w]] for w in region] + [[] for _ in boundary]
+        in_region = [True] * len(region) + [False] * len(boundary)
+        fixed = [-1] * len(region) + [color[u] for u in boundary]
+        try:
+            solved = _solve_core(sub_neighbors, in_region, 4, deadline, rng, fixed)
+        except NotColorableError:
+            # With nothing around the neighborhood the search was exact for the whole component
+            if not boundary:
+                raise
+            radius *= 2
+            continue
+        for i, w in enumerate(region):
+            color[w] = solved[i]
+        return
+
+
+# Four-coloring of a planar graph
+def color_planar_graph(G, time_limit=None, seed=0):
+    """
+    Four-color a planar graph by degree <= 5 peeling and Kempe chain swaps, in near-linear time.
+
+    Parameters:
+    G (networkx.Graph): A planar graph without self-loops; it is not tested for planarity.
+    time_limit (float, optional): Time budget in seconds. Defaults to no limit.
+    seed (int): Seed for the exact search of neighborhoods the Kempe swaps could not fix.
+
+    Returns:
+    dict: Color index, from 0 to 3, of every node.
+
+    Raises:
+    NotPlanarError: If peeling shows the graph is not planar.
+    ColoringTimeoutError: If the time budget runs out first.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    nodes, indptr, indices = graph_to_csr(G)
+    if not nodes:
+        return {}
+    neighbors = _csr_neighbors(indptr, indices)
+    peeled, in_core = _peel_low_degree(neighbors, PLANAR_DEGENERACY + 1)
+    if any(in_core):
+        raise NotPlanarError("graph is not planar: every remaining vertex has more than five neighbors")
+
+    # Added back in reverse, each vertex has at most five colored neighbors; the fifth color is a stopgap
+    color = [-1] * len(nodes)
+    for step, v in enumerate(reversed(peeled)):
+        if deadline is not None and step % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            raise ColoringTimeoutError("planar coloring ran out of time")
+        if not _kempe_insert(neighbors, color, v, 4):
+            _kempe_insert(neighbors, color, v, PLANAR_DEGENERACY)
+
+    # Retry the vertices left with the fifth color (or none) against the completed coloring
+    leftovers = [v for v in range(len(nodes)) if not 0 <= color[v] < 4]
+    while leftovers:
+        remaining = []
+        for v in leftovers:
+            color[v] = -1
+            if not _kempe_insert(neighbors, color, v, 4):
+                color[v] = 4
+                remaining.append(v)
+        if len(remaining) == len(leftovers):
+            break
+        leftovers = remaining
+    rng = random.Random(seed)
+    for v in leftovers:
+        if not 0 <= color[v] < 4:
+            _repair_neighborhood(neighbors, color, v, deadline, rng)
+    return {node: color[i] for i, node in enumerate(nodes)}
+
+
+# Proper coloring with at most k colors
+def color_graph(G, n_colors=4, time_limit=None, seed=0, planar=None):
+    """
+    Find a proper coloring of G with at most 'n_colors' colors, so that no two adjacent nodes share a color.
+
+    Parameters:
+    G (networkx.Graph): The graph (map) to color.
+    n_colors (int): Number of colors available.
+    time_limit (float, optional): Time budget in seconds. Defaults to no limit.
+    seed (int): Seed for the breadth-first roots of the searches.
+    planar (bool, optional): Whether G is planar, if already known; tested with networkx when four colors are
+    asked for and this is None. Planar graphs go to color_planar_graph.
+
+    Returns:
+    dict: Color index, from 0 to n_colors - 1, of every node.
+
+    Raises:
+    NotColorableError: If G has a self-loop or no coloring with 'n_colors' colors exists.
+    ColoringTimeoutError: If the time budget runs out first.
+    """
+    if any(u == v for u, v in G.edges()):
+        raise NotColorableError("a node adjacent to itself cannot be colored")
+    if n_colors == 4 and (planar if planar is not None else nx.check_planarity(G)[0]):
+        return color_planar_graph(G, time_limit, seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    nodes, indptr, indices = graph_to_csr(G)
+    if not nodes:
+        return {}
+    neighbors = _csr_neighbors(indptr, indices)
+
+    peeled, in_core = _peel_low_degree(neighbors, n_colors)
+    color = _solve_core(neighbors, in_core, n_colors, deadline, random.Random(seed))
+
+    # Peeled vertices had fewer than n_colors neighbors when they were removed, so one color is always free
+    for v in reversed(peeled):
+        used = 0
+        for u in neighbors[v]:
+            if color[u] >= 0:
+                used |= 1 << color[u]
+        free = ~used & ((1 << n_colors) - 1)
+        color[v] = (free & -free).bit_length() - 1
+    return {node: color[i] for i, node in enumerate(nodes)}
+
+
+class ColoringSession:
+    """
+    A coloring edited one node at a time, with its conflicts kept up to date.
+
+    Each node keeps the number of its neighbors that share its color, and the nodes where that number is
+    nonzero form the conflict set, so recolor() costs O(degree) and is_valid() O(1).
+    """
+
+    def __init__(self, G, coloring):
+        self.nodes, indptr, indices = graph_to_csr(G)
+        self._index = {node: i for i, node in enumerate(self.nodes)}
+        self._neighbors = _csr_neighbors(indptr, indices)
+        self._color = [coloring[node] for node in self.nodes]
+        self._conflict_count = [sum(1 for j in adj if self._color[j] == self._color[i])
+                                for i, adj in enumerate(self._neighbors)]
+        self._conflicts = {i for i, count in enumerate(self._conflict_count) if count}
+
+    def recolor(self, node, color):
+        """
+        Give a node a new color and update the conflicts around it.
+
+        Parameters:
+        node: The node to recolor.
+        color (int): Its new color.
+
+        Returns:
+        list: The neighbors that now share the node's color.
+        """
+        i = self._index[node]
+        old = self._color[i]
+        self._color[i] = color
+        clashes = []
+        for j in self._neighbors[i]:
+            if self._color[j] == color:
+                clashes.append(self.nodes[j])
+                if color != old:
+                    self._conflict_count[j] += 1
+                    self._conflicts.add(j)
+            elif self._color[j] == old:
+                self._conflict_count[j] -= 1
+                if not self._conflict_count[j]:
+                    self._conflicts.discard(j)
+
+        self._conflict_count[i] = len(clashes)
+        if clashes:
+            self._conflicts.add(i)
+        else:
+            self._conflicts.discard(i)
+        return clashes
+
+    def color(self, node):
+        """
+        Current color of a node.
+        """
+        return self._color[self._index[node]]
+
+    def conflict_count(self, node):
+        """
+        Number of neighbors sharing the node's color.
+        """
+        return self._conflict_count[self._index[node]]
+
+    def conflicting_nodes(self):
+        """
+        Nodes that share their color with at least one neighbor.
+        """
+        return [self.nodes[i] for i in self._conflicts]
+
+    def is_valid(self):
+        """
+        Whether the coloring is proper, in O(1).
+        """
+        return not self._conflicts
+
+    def coloring(self):
+        """
+        The current color of every node, as a dictionary.
+        """
+        return dict(zip(self.nodes, self._color))
+
+
+# Check a coloring
+def is_proper_coloring(G, coloring):
+    """
+    Check that no two adjacent nodes of G share a color.
+
+    Parameters:
+    G (networkx.Graph): The graph.
+    coloring (dict): Color of every node.
+
+    Returns:
+    bool: True when the coloring is proper.
+    """
+    return all(coloring[u] != coloring[v] for u, v in G.edges())
@@ -0,0 +1,88 @@
+"""
+Prime Gap Curve Geometry
+
+Builds the line geometry that the prime visualizations draw between consecutive primes. The coordinates of
+every gap are written into preallocated float arrays in one vectorized pass, with NaN separators between
+gaps (Plotly and Matplotlib both break a line at NaN), instead of growing Python lists pair by pair.
+
+Libraries:
+- Numpy: For the vectorized coordinate arrays.
+"""
+
+import numpy as np
+
+
+# Shared builder: one row per gap, 'samples' points along the gap followed by a NaN separator
+def _gap_polylines(primes, samples, profile, gaps=None):
+    """
+    Lay out one polyline per gap between consecutive primes.
+
+    Parameters:
+    primes (array-like): Increasing prime numbers.
+    samples (int): Points per gap, including both endpoints.
+    profile (numpy.ndarray): Height of each sample, relative to the gap's height, from 0 to 1.
+    gaps (array-like, optional): Indices i of the gaps (primes[i], primes[i + 1]) to draw. Defaults to all.
+
+    Returns:
+    tuple: Flat x, y, z float arrays with samples + 1 entries per gap.
+    """
+    if samples < 2:
+        raise ValueError("each gap needs at least 2 samples")
+    primes = np.asarray(primes, dtype=np.float64)
+    if gaps is None:
+        x0, x1 = primes[:-1], primes[1:]
+    else:
+        gaps = np.asarray(gaps, dtype=np.intp)
+        x0, x1 = primes[gaps], primes[gaps + 1]
+    n = len(x0)
+    s = np.linspace(0.0, 1.0, samples)
+
+    x = np.empty((n, samples + 1))
+    y = np.empty((n, samples + 1))
+    z = np.zeros((n, samples + 1))
+    np.multiply((x1 - x0)[:, None], s, out=x[:, :samples])
+    x[:, :samples] += x0[:, None]
+
+    # Logarithmic heights emphasize the gaps without letting the large ones dominate
+    curvature = np.log((x1 - x0) / 2 + 1)
+    np.multiply(curvature[:, None], profile, out=y[:, :samples])
+
+    for coords in (x, y, z):
+        coords[:, samples] = np.nan
+    return x.ravel(), y.ravel(), z.ravel()
+
+
+# Curved arcs between consecutive primes
+def curved_gap_lines(primes, samples=3, gaps=None):
+    """
+    Create curved arcs connecting consecutive primes, rising to log(gap / 2 + 1) at the midpoint.
+
+    With the default 3 samples each arc is the (start, midpoint, end) polyline the Riemann scripts have
+    always drawn; more samples trace a smooth half-sine arc through the same three points.
+
+    Parameters:
+    primes (array-like): Increasing prime numbers.
+    samples (int): Points per arc, including both endpoints.
+    gaps (array-like, optional): Indices i of the gaps (primes[i], primes[i + 1]) to draw. Defaults to all.
+
+    Returns:
+    tuple: Flat x, y, z coordinate arrays for plotting, with NaN between arcs.
+    """
+    profile = np.sin(np.pi * np.linspace(0.0, 1.0, samples))
+    profile[[0, -1]] = 0.0
+    return _gap_polylines(primes, samples, profile, gaps)
+
+
+# Straight segments between consecutive primes
+def straight_gap_lines(primes, gaps=None):
+    """
+    Create flat segments connecting consecutive primes along the number line.
+
+    Parameters:
+    primes (array-like): Increasing prime numbers.
+    gaps (array-like, optional): Indices i of the gaps (primes[i], primes[i + 1]) to draw. Defaults to all.
+
+    Returns:
+    tuple: Flat x, y, z coordinate arrays for plotting, with NaN between segments.
+    """
+    return _gap_polylines(primes, 2, np.zeros(2), gaps)
@@ -0,0 +1,271 @@
+"""
+Streaming Prime Gap Statistics
+
+The gap analyses in riemann_prime_distribution.py and riemann_distribution_v2.py used to materialize the full
+np.diff(primes) array before computing anything, so memory grew with the size of the range. This module replaces
+that with a one-pass accumulator that is fed the primes segment by segment, straight from the sieve.
+
+The accumulator tracks:
+- The number of gaps, their mean and variance (Welford / Chan et al. updates) and their min/max.
+- An exact gap histogram, which gives the exact mode and median.
+- The maximal gaps: every gap larger than all the gaps before it, with the prime it starts at.
+- Twin (p, p+2), cousin (p, p+4) and sexy (p, p+6) prime pair counts.
+
+Accumulators built over consecutive, disjoint ranges can be merged, so a range like [0, 10^12) can be split
+across a process pool and never held in memory as a list of primes.
+
+Libraries:
+- Numpy: For the per-segment vectorized updates.
+- concurrent.futures: For accumulating disjoint chunks in parallel.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from prime_sieve import DEFAULT_CHUNK_SIZE, base_primes, iter_prime_segments
+
+# Prime pairs (p, p + offset) that are counted, whether or not p and p + offset are consecutive primes
+PAIR_OFFSETS = {'twin': 2, 'cousin': 4, 'sexy': 6}
+MAX_PAIR_OFFSET = max(PAIR_OFFSETS.values())
+
+
+class GapAccumulator:
+    """
+    One-pass, mergeable statistics of the gaps between consecutive primes.
+
+    Feed it increasing segments of primes with update(), or combine accumulators of consecutive ranges
+    with merge(). Only O(largest gap + number of maximal gaps) state is kept.
+    """
+
+    def __init__(self):
+        self.prime_count = 0
+        self.count = 0  # Number of gaps seen
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self.min_gap = None
+        self.max_gap = None
+        self.histogram = np.zeros(0, dtype=np.int64)  # histogram[g] is the number of gaps of size g
+        self.maximal_gaps = []  # (prime, gap) for every gap larger than all earlier gaps
+        self.pair_counts = dict.fromkeys(PAIR_OFFSETS, 0)
+        self.first_prime = None
+        self.last_prime = None
+        self._head = np.zeros(0, dtype=np.int64)  # Primes below first_prime + MAX_PAIR_OFFSET
+        self._tail = np.zeros(0, dtype=np.int64)  # Primes above last_prime - MAX_PAIR_OFFSET
+
+    # Fold a batch of gaps into the running statistics
+    def _add_gaps(self, starts, gaps):
+        n = len(gaps)
+        if n == 0:
+            return
+        batch_mean = gaps.mean()
+        batch_m2 = float(((gaps - batch_mean) ** 2).sum())
+        self._combine_moments(n, batch_mean, batch_m2)
+
+        low, high = int(gaps.min()), int(gaps.max())
+        self.min_gap = low if self.min_gap is None else min(self.min_gap, low)
+
+        # A gap is maximal when it beats every gap before it, including earlier batches
+        record = 0 if self.max_gap is None else self.max_gap
+        previous = np.maximum(record, np.concatenate(([record], np.maximum.accumulate(gaps)[:-1])))
+        for i in np.flatnonzero(gaps > previous).tolist():
+            self.maximal_gaps.append((int(starts[i]), int(gaps[i])))
+        self.max_gap = max(record, high)
+
+        counts = np.bincount(gaps, minlength=len(self.histogram))
+        counts[:len(self.histogram)] += self.histogram
+        self.histogram = counts
+
+    # Chan et al. update of count, mean and sum of squared deviations
+    def _combine_moments(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def update(self, primes):
+        """
+        Add the next segment of primes; every prime must be larger than the primes seen so far.
+
+        Parameters:
+        primes (array-like): Increasing primes continuing the sequence already accumulated.
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        if len(primes) == 0:
+            return
+        if self.last_prime is not None and primes[0] <= self.last_prime:
+            raise ValueError("segments must be fed in increasing order")
+
+        # The first gap of the segment starts at the last prime of the previous one
+        sequence = primes if self.last_prime is None else np.concatenate(([self.last_prime], primes))
+        self._add_gaps(sequence[:-1], np.diff(sequence))
+
+        # Count each pair at its larger member, looking back into the previous segment's tail
+        window = np.concatenate((self._tail, primes))
+        for name, offset in PAIR_OFFSETS.items():
+            self.pair_counts[name] += _count_members(window, primes - offset)
+
+        if self.first_prime is None:
+            self.first_prime = int(primes[0])
+        if len(self._head) == 0 or self._head[-1] == self.last_prime:
+            head = primes[primes < self.first_prime + MAX_PAIR_OFFSET]
+            self._head = np.concatenate((self._head, head))
+        self.last_prime = int(primes[-1])
+        self._tail = window[window > self.last_prime - MAX_PAIR_OFFSET]
+        self.prime_count += len(primes)
+
+    def merge(self, other):
+        """
+        Combine with the accumulator of the range that immediately follows this one.
+
+        Parameters:
+        other (GapAccumulator): Statistics of primes that are all larger than the primes in this accumulator.
+
+        Returns:
+        GapAccumulator: Statistics of both ranges together, including the gap bridging them.
+        """
+        if other.prime_count == 0:
+            return self._copy()
+        if self.prime_count == 0:
+            return other._copy()
+        if other.first_prime <= self.last_prime:
+            raise ValueError("accumulators must cover consecutive, increasing ranges")
+
+        merged = self._copy()
+        bridge = other.first_prime - self.last_prime
+        merged._add_gaps(np.array([self.last_prime]), np.array([bridge]))
+        merged._combine_moments(other.count, other.mean, other._m2)
+        if other.count:
+            merged.min_gap = min(merged.min_gap, other.min_gap)
+            merged.maximal_gaps += [(p, g) for p, g in other.maximal_gaps if g > merged.max_gap]
+            merged.max_gap = max(merged.max_gap, other.max_gap)
+            counts = np.zeros(max(len(merged.histogram), len(other.histogram)), dtype=np.int64)
+            counts[:len(merged.histogram)] += merged.histogram
+            counts[:len(other.histogram)] += other.histogram
+            merged.histogram = counts
+
+        # Pairs straddling the boundary were invisible to both sides
+        for name, offset in PAIR_OFFSETS.items():
+            merged.pair_counts[name] += other.pair_counts[name]
+            merged.pair_counts[name] += _count_members(self._tail, other._head - offset)
+
+        head = np.concatenate((self._head, other._head))
+        merged._head = head[head < self.first_prime + MAX_PAIR_OFFSET]
+        merged._tail = np.concatenate((self._tail, other._tail))
+        merged._tail = merged._tail[merged._tail > other.last_prime - MAX_PAIR_OFFSET]
+        merged.last_prime = other.last_prime
+        merged.prime_count += other.prime_count
+        return merged
+
+    def _copy(self):
+        clone = GapAccumulator()
+        clone.__dict__.update(self.__dict__)
+        clone.maximal_gaps = list(self.maximal_gaps)
+        clone.pair_counts = dict(self.pair_counts)
+        return clone
+
+    def variance(self, ddof=0):
+        """
+        Variance of the gaps, with 'ddof' delta degrees of freedom like np.var.
+        """
+        return self._m2 / (self.count - ddof) if self.count > ddof else float('nan')
+
+    def std(self, ddof=0):
+        """
+        Standard deviation of the gaps, with 'ddof' delta degrees of freedom like np.std.
+        """
+        return math.sqrt(self.variance(ddof))
+
+    def mode(self):
+        """
+        Most common gap; the smallest one when several are equally common.
+        """
+        return int(np.argmax(self.histogram)) if self.count else None
+
+    def median(self):
+        """
+        Exact median gap, averaging the two middle gaps when the count is even (like np.median).
+        """
+        if self.count == 0:
+            return float('nan')
+        cumulative = np.cumsum(self.histogram)
+        lower = int(np.searchsorted(cumulative, (self.count - 1) // 2, side='right'))
+        upper = int(np.searchsorted(cumulative, self.count // 2, side='right'))
+        return (lower + upper) / 2
+
+    def summary(self):
+        """
+        Collect the statistics into a dictionary.
+
+        Returns:
+        dict: Count, mean, median, mode, variance, standard deviation, min/max, maximal gaps and pair counts.
+        """
+        return {
+            'prime_count': self.prime_count,
+            'gap_count': self.count,
+            'mean': self.mean,
+            'median': self.median(),
+            'mode': self.mode(),
+            'variance': self.variance(ddof=1),
+            'std_dev': self.std(),
+            'min_gap': self.min_gap,
+            'max_gap': self.max_gap,
+            'maximal_gaps': list(self.maximal_gaps),
+            **{f'{name}_pairs': count for name, count in self.pair_counts.items()},
+        }
+
+
+# Count how many of 'values' occur in the sorted array 'primes'
+def _count_members(primes, values):
+    if len(primes) == 0 or len(values) == 0:
+        return 0
+    idx = np.minimum(np.searchsorted(primes, values), len(primes) - 1)
+    return int(np.count_nonzero(primes[idx] == values))
+
+
+# Accumulate one chunk inside a pool worker
+def _accumulate_chunk(task):
+    """
+    Sieve the chunk [lo, hi) segment by segment and return its gap statistics.
+    """
+    lo, hi, base_limit = task
+    accumulator = GapAccumulator()
+    for segment in iter_prime_segments(lo, hi, base=base_primes(base_limit)):
+        accumulator.update(segment)
+    return accumulator
+
+
+# Gap statistics of a whole range without ever holding its primes
+def gap_statistics_for_range(lower, upper, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compute the gap statistics of the primes in [lower, upper), sieving disjoint chunks across a process pool
+    and merging the per-chunk accumulators in order.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+    processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    chunk_size (int): Numbers sieved per worker task.
+
+    Returns:
+    GapAccumulator: Statistics of the whole range.
+    """
+    base_limit = math.isqrt(max(int(upper) - 1, 0))
+    tasks = [(lo, min(lo + chunk_size, upper), base_limit) for lo in range(int(lower), int(upper), chunk_size)]
+    processes = processes or os.cpu_count() or 1
+
+    if len(tasks) <= 1 or processes == 1:
+        parts = map(_accumulate_chunk, tasks)
+        return _merge_all(parts)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return _merge_all(executor.map(_accumulate_chunk, tasks))
+
+
+def _merge_all(parts):
+    total = GapAccumulator()
+    for part in parts:
+        total = total.merge(part)
+    return total
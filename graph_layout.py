@@ -0,0 +1,378 @@
+"""
+Cached Graph Layouts for the Map Renderers
+
+Both four-color scripts called nx.spring_layout on every render: O(n²) work per iteration and a different random
+layout each time, so the map jumped around between redraws. This module lays a graph out once and remembers it:
+
+- Layouts are memoized by a hash of the graph (its nodes in order and its edges), so drawing the same map again
+  costs one hash, and the positions never move.
+- Positions come from a Fruchterman-Reingold force layout on NumPy arrays with a fixed seed. Small graphs use
+  exact all-pairs repulsion. Large graphs approximate it on a grid (the particle-mesh method): node masses are
+  spread onto a mesh, the mesh is convolved with the repulsion kernel by FFT, and each node reads its force
+  back from the mesh, so an iteration costs O(n + m + M² log M) for an M x M mesh instead of O(n²).
+- When a few edges of the graph have changed since an earlier layout of the same nodes (or of a graph the caller
+  names), the new layout warm-starts from it: nodes that survived keep their place, new nodes start next to
+  their placed neighbors, and a short, cool run settles the neighborhoods of the changes while the rest of the
+  map stays put. Without such a layout it starts from the seed alone, so results never depend on what was
+  laid out before.
+- edge_coordinates and node_coordinates turn a layout into Plotly-ready arrays without per-edge appends.
+
+Libraries:
+- Networkx: For the input graphs.
+- Numpy: For the force computations and coordinate arrays.
+"""
+
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from four_coloring import graph_to_csr
+
+# Graphs up to this many nodes use exact all-pairs repulsion
+DENSE_LAYOUT_NODES = 2000
+
+# Iterations of a fresh layout and of a warm-started one
+LAYOUT_ITERATIONS = 100
+WARM_ITERATIONS = 30
+
+# Largest step of the first iteration, as a fraction of the layout's width, for fresh and warm-started layouts;
+# the step then cools linearly to zero
+INITIAL_TEMPERATURE = 0.1
+WARM_TEMPERATURE = 0.005
+
+# Mesh of the approximate repulsion for large graphs: points per row for each sqrt(n) nodes (about one per
+# ideal edge length), within bounds
+MESH_POINTS_PER_NODE_ROW = 1
+MIN_MESH_SIZE = 64
+MAX_MESH_SIZE = 1024
+
+# Share of the graph's edges that a cached layout's graph must also have for an automatic warm start
+WARM_START_OVERLAP = 0.8
+
+# Nodes within this many edges of a change move during a warm start
+WARM_RADIUS = 3
+
+# Number of layouts remembered, most recently used last
+LAYOUT_CACHE_SIZE = 16
+_layout_cache = OrderedDict()
+
+
+# Hash identifying a graph's nodes (in order) and edges
+def graph_hash(G):
+    """
+    Hash a graph by its node list and edge set, so equal graphs built the same way share a layout.
+
+    Parameters:
+    G (networkx.Graph): The graph.
+
+    Returns:
+    str: Hexadecimal digest.
+    """
+    nodes, indptr, indices = graph_to_csr(G)
+    return _csr_hash(nodes, indptr, indices)
+
+
+def _csr_hash(nodes, indptr, indices):
+    digest = hashlib.sha1(repr(nodes).encode())
+    digest.update(indptr.tobytes())
+    digest.update(indices.tobytes())
+    return digest.hexdigest()
+
+
+# Repulsion k²/d between every pair of nodes
+def _dense_repulsion(pos, k):
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist2 = np.einsum('ijk,ijk->ij', delta, delta)
+    np.fill_diagonal(dist2, np.inf)
+    return np.einsum('ijk,ij->ik', delta, k * k / np.maximum(dist2, 1e-12))
+
+
+# Cloud-in-cell weights: the four mesh points around each node and the share of the node at each
+def _mesh_weights(pos, origin, spacing):
+    g = (pos - origin) / spacing
+    corner = np.floor(g).astype(np.int64)
+    f = g - corner
+    points = [(corner[:, 0] + dx, corner[:, 1] + dy) for dx in (0, 1) for dy in (0, 1)]
+    shares = [(f[:, 0] if dx else 1 - f[:, 0]) * (f[:, 1] if dy else 1 - f[:, 1]) for dx in (0, 1) for dy in (0, 1)]
+    return points, shares
+
+
+# Unit repulsion kernel r/|r|² over every mesh offset, laid out for a circular convolution padded to twice
+# the mesh size, with its spectrum
+@lru_cache(maxsize=4)
+def _unit_kernels(size):
+    offsets = np.fft.fftfreq(2 * size, 1 / (2 * size))
+    rx, ry = np.meshgrid(offsets, offsets, indexing='ij')
+    r2 = rx * rx + ry * ry
+    r2[0, 0] = np.inf
+    return [(r / r2, np.fft.rfft2(r / r2)) for r in (rx, ry)]
+
+
+# Repulsion k²/d from every node, through a mesh convolved with the force kernel by FFT
+def _mesh_repulsion(pos, k):
+    """
+    Approximate the all-pairs repulsion with the particle-mesh method: spread the nodes onto a square mesh,
+    convolve the mesh with the kernel k² r/|r|² by FFT, and read the field back at the nodes. The force of each
+    node on itself through the mesh is subtracted again.
+
+    Returns:
+    numpy.ndarray: Force on every node, shape (n, 2).
+    """
+    n = len(pos)
+    size = int(np.clip(np.sqrt(n) * MESH_POINTS_PER_NODE_ROW, MIN_MESH_SIZE, MAX_MESH_SIZE))
+    origin = pos.min(axis=0)
+    spacing = max(float((pos.max(axis=0) - origin).max()), k) / (size - 2)
+    points, shares = _mesh_weights(pos, origin, spacing)
+    mass = np.zeros(size * size)
+    for (x, y), share in zip(points, shares):
+        mass += np.bincount(x * size + y, share, minlength=size * size)
+
+    padded = np.zeros((2 * size, 2 * size))
+    padded[:size, :size] = mass.reshape(size, size)
+    spectrum = np.fft.rfft2(padded)
+    # With offsets measured in mesh spacings the kernel is k²/spacing times the unit kernel r/|r|²
+    scale = k * k / spacing
+    force = np.zeros_like(pos)
+    for axis, (kernel, kernel_spectrum) in enumerate(_unit_kernels(size)):
+        field = np.fft.irfft2(spectrum * kernel_spectrum, s=padded.shape)[:size, :size]
+        for (x, y), share in zip(points, shares):
+            force[:, axis] += share * field[x, y]
+        # Each node's own mass pushes it through the mesh as well
+        for (x1, y1), share1 in zip(points, shares):
+            for (x2, y2), share2 in zip(points, shares):
+                force[:, axis] -= share1 * share2 * kernel[x1 - x2, y1 - y2]
+    force *= scale
+    return force
+
+
+# Fruchterman-Reingold iterations with linear cooling
+def _fruchterman_reingold(pos, edges, k, iterations, temperature, mobility=None):
+    """
+    Move nodes under repulsion between all (nearby) nodes and attraction d²/k along edges.
+
+    Parameters:
+    pos (numpy.ndarray): Starting positions, shape (n, 2); updated in place.
+    edges (numpy.ndarray): Edge endpoints, shape (m, 2).
+    k (float): Ideal edge length.
+    iterations (int): Number of iterations.
+    temperature (float): Largest step of the first iteration.
+    mobility (numpy.ndarray, optional): Per-node factor on the step limit; 0 pins a node. Defaults to 1.
+
+    Returns:
+    numpy.ndarray: The final positions.
+    """
+    n = len(pos)
+    repulsion = _dense_repulsion if n <= DENSE_LAYOUT_NODES else _mesh_repulsion
+    for step in range(iterations):
+        force = repulsion(pos, k)
+        delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+        pull = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) / k)[:, None]
+        for axis in range(2):
+            force[:, axis] += (np.bincount(edges[:, 1], pull[:, axis], minlength=n)
+                               - np.bincount(edges[:, 0], pull[:, axis], minlength=n))
+
+        # Each node moves along its force, but never further than the current temperature
+        length = np.maximum(np.sqrt(np.einsum('ij,ij->i', force, force)), 1e-12)
+        limit = temperature * (1 - step / iterations)
+        if mobility is not None:
+            limit = limit * mobility
+        pos += force * (np.minimum(length, limit) / length)[:, None]
+    return pos
+
+
+# Edges (node pairs) added to and removed from an earlier layout's graph
+def _changed_edges(edges, previous_edges):
+    current, known = set(edges), set(previous_edges)
+    added = [(u, v) for u, v in edges if (u, v) not in known and (v, u) not in known]
+    removed = [(u, v) for u, v in previous_edges if (u, v) not in current and (v, u) not in current]
+    return added, removed
+
+
+# Starting positions that keep the nodes of an earlier layout in place
+def _warm_start(nodes, neighbors, previous, changed, rng, k):
+    """
+    Place every node that has a position in 'previous' there, and every other node at the mean of its placed
+    neighbors (spreading inwards from the placed part), or at random if it has none.
+
+    New nodes and the nodes in 'changed' (indices of nodes whose edges changed) get mobility 1, their
+    neighbors 1/2 and so on out to WARM_RADIUS edges; everything further away stays where it was.
+
+    Returns:
+    tuple: Positions, shape (n, 2), and the mobility of every node, or None when no node has a previous position.
+    """
+    n = len(nodes)
+    pos = np.zeros((n, 2))
+    placed = np.zeros(n, dtype=bool)
+    for i, node in enumerate(nodes):
+        if node in previous:
+            pos[i] = previous[node]
+            placed[i] = True
+    if not placed.any():
+        return None
+    known = placed.copy()
+
+    missing = np.flatnonzero(~placed).tolist()
+    while missing:
+        waiting = []
+        for i in missing:
+            anchors = [j for j in neighbors[i] if placed[j]]
+            if anchors:
+                # Jitter keeps new nodes with the same neighbors from landing on the same point
+                pos[i] = pos[anchors].mean(axis=0) + rng.normal(scale=0.1 * k, size=2)
+                placed[i] = True
+            else:
+                waiting.append(i)
+        if len(waiting) == len(missing):
+            low, high = pos[placed].min(axis=0), pos[placed].max(axis=0)
+            pos[waiting] = rng.uniform(low, high, size=(len(waiting), 2))
+            break
+        missing = waiting
+
+    mobility = np.zeros(n)
+    frontier = sorted(set(changed) | set(np.flatnonzero(~known).tolist()))
+    mobility[frontier] = 1.0
+    for distance in range(1, WARM_RADIUS + 1):
+        grown = []
+        for i in frontier:
+            for j in neighbors[i]:
+                if mobility[j] == 0:
+                    mobility[j] = 0.5 ** distance
+                    grown.append(j)
+        frontier = grown
+    return pos, mobility
+
+
+# Most recently used cached layout of the same nodes, when its graph shares enough of the edges
+def _cached_neighbor(node_set, node_edges, seed):
+    if not node_edges:
+        return None
+    for (_, cached_seed), (last_nodes, last_edges, last_pos) in reversed(_layout_cache.items()):
+        if cached_seed != seed or set(last_nodes) != node_set:
+            continue
+        added, _ = _changed_edges(node_edges, last_edges)
+        if len(node_edges) - len(added) >= WARM_START_OVERLAP * len(node_edges):
+            return last_nodes, last_edges, last_pos
+    return None
+
+
+# Positions of every node, memoized per graph
+def graph_layout(G, seed=0, initial=None, previous=None):
+    """
+    Lay out a graph with a force-directed layout, reusing the cached layout of an identical graph.
+
+    On a cache miss the layout warm-starts from:
+    - 'previous', a graph laid out before (its layout is computed first if it is not cached), with the nodes on
+      the edges that differ between the two graphs free to move;
+    - or 'initial' positions, with every node on an edge between two positioned nodes free to move (moved from
+      the 'previous' layout's positions instead when both are given);
+    - or else the most recently used cached layout of the same nodes and seed, when its graph has at least
+      WARM_START_OVERLAP of G's edges.
+    A warm start keeps the frame of the layout it started from. Otherwise the layout starts from positions
+    drawn from 'seed', so it depends on nothing but G and the seed.
+
+    Parameters:
+    G (networkx.Graph): The graph.
+    seed (int): Seed for the random starting positions.
+    initial (dict, optional): Starting positions (node -> (x, y)) for a warm start.
+    previous (networkx.Graph, optional): Earlier version of G to warm-start from.
+
+    Returns:
+    dict: Position array (x, y) of every node, a copy owned by the caller; fresh layouts are scaled into
+    [-1, 1] like nx.spring_layout.
+    """
+    nodes, indptr, indices = graph_to_csr(G)
+    key = (_csr_hash(nodes, indptr, indices), seed)
+    if key in _layout_cache:
+        _layout_cache.move_to_end(key)
+        return dict(zip(nodes, _layout_cache[key][2].copy()))
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    # Work in the [-1, 1] square, where n nodes have room for edges about k long
+    k = 2 / np.sqrt(n)
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    edges = np.column_stack((rows, indices))[rows < indices]
+    index = {node: i for i, node in enumerate(nodes)}
+
+    node_edges = [(nodes[u], nodes[v]) for u, v in edges.tolist()]
+    start = None
+    changed = set()
+    if previous is not None:
+        start = graph_layout(previous, seed)
+        previous_edges = list(previous.edges())
+    elif initial is None:
+        cached = _cached_neighbor(set(nodes), node_edges, seed)
+        if cached is not None:
+            last_nodes, previous_edges, last_pos = cached
+            start = dict(zip(last_nodes, last_pos))
+    if start is not None:
+        added, removed = _changed_edges(node_edges, previous_edges)
+        changed = {index[node] for edge in added + removed for node in edge if node in index}
+    elif initial:
+        # Without the graph the positions came from, any edge between positioned nodes may be new
+        changed = {index[node] for edge in node_edges for node in edge if edge[0] in initial and edge[1] in initial}
+    if initial:
+        start = initial
+
+    warm = None
+    if start:
+        neighbors = [indices[indptr[i]:indptr[i + 1]].tolist() for i in range(n)]
+        warm = _warm_start(nodes, neighbors, start, changed, rng, k)
+    if warm is None:
+        pos = rng.uniform(-1, 1, size=(n, 2))
+        pos = _fruchterman_reingold(pos, edges, k, LAYOUT_ITERATIONS, 2 * INITIAL_TEMPERATURE)
+        # Center and scale into [-1, 1]
+        pos -= pos.mean(axis=0)
+        extent = np.abs(pos).max()
+        if extent > 0:
+            pos /= extent
+    else:
+        pos, mobility = warm
+        pos = _fruchterman_reingold(pos, edges, k, WARM_ITERATIONS, 2 * WARM_TEMPERATURE, mobility)
+
+    _layout_cache[key] = (nodes, node_edges, pos)
+    while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+    return dict(zip(nodes, pos.copy()))
+
+
+# Node coordinates in G.nodes() order
+def node_coordinates(G, pos):
+    """
+    Collect node positions into coordinate arrays.
+
+    Parameters:
+    G (networkx.Graph): The graph.
+    pos (dict): Position of every node.
+
+    Returns:
+    tuple: x and y arrays, in G.nodes() order.
+    """
+    xy = np.array([pos[node] for node in G.nodes()], dtype=np.float64).reshape(-1, 2)
+    return xy[:, 0], xy[:, 1]
+
+
+# Line coordinates of every edge, NaN-separated for a single Plotly trace
+def edge_coordinates(G, pos):
+    """
+    Build the coordinates of all edges as one polyline broken by NaN gaps (x0, x1, NaN, x0, x1, NaN, ...).
+
+    Parameters:
+    G (networkx.Graph): The graph.
+    pos (dict): Position of every node.
+
+    Returns:
+    tuple: x and y arrays of length 3 * (number of edges).
+    """
+    index = {node: i for i, node in enumerate(G.nodes())}
+    x, y = node_coordinates(G, pos)
+    ends = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    lines_x = np.full((len(ends), 3), np.nan)
+    lines_y = np.full((len(ends), 3), np.nan)
+    lines_x[:, :2] = x[ends]
+    lines_y[:, :2] = y[ends]
+    return lines_x.ravel(), lines_y.ravel()
@@ -0,0 +1,148 @@
+"""
+Vertices, Edges and Faces of the n-Dimensional Hypercube
+
+The tesseract scripts each carried their own copy of tesseract_vertices() and found the edges with a 16 x 16
+double loop over bin(i ^ j).count('1') == 1, which is O(4^n) and only ever handled n = 4. Here everything
+comes from the binary labels of the vertices:
+
+- Vertex i has coordinate 2 * bit_j(i) - 1 along axis j, so the 2^n vertices are the corners of [-1, 1]^n.
+- Two vertices share an edge when their labels differ in one bit, so the edges along axis j pair every i
+  without bit j with i | (1 << j): n 2^(n-1) edges in O(n 2^n).
+- A k-dimensional face is spanned by k free axes from a base vertex whose bits on those axes are 0. Its 2^k
+  vertices are the base plus every subset of the free bits: C(n, k) 2^(n-k) faces (squares for k = 2, cubic
+  cells for k = 3).
+
+All arrays are built with NumPy bit operations, cached per dimension, and returned read-only, so repeated calls
+are free and cannot corrupt each other. Labels fit in int32 for n up to 30; n around 20 is practical.
+
+Libraries:
+- Numpy: For the bit operations and index arrays.
+"""
+
+import math
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+# Largest dimension whose vertex labels fit into the int32 index arrays
+MAX_DIMENSION = 30
+
+# Order of the vertices of a square face (2-face) around its boundary, from the binary order of the face
+SQUARE_CYCLE = (0, 1, 3, 2)
+
+
+def _check_dimension(n):
+    if not 0 <= n <= MAX_DIMENSION:
+        raise ValueError(f"hypercube dimension must be between 0 and {MAX_DIMENSION}, got {n}")
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+# Corners of [-1, 1]^n in binary label order
+@lru_cache(maxsize=None)
+def hypercube_vertices(n):
+    """
+    Compute the vertices of the n-dimensional hypercube [-1, 1]^n.
+
+    Parameters:
+    n (int): Dimension.
+
+    Returns:
+    numpy.ndarray: Read-only int8 array of shape (2^n, n); row i has 2 * bit_j(i) - 1 in column j.
+    """
+    _check_dimension(n)
+    labels = np.arange(1 << n, dtype=np.int32)
+    bits = (labels[:, None] >> np.arange(n, dtype=np.int32)) & 1
+    return _read_only((2 * bits - 1).astype(np.int8))
+
+
+# Pairs of vertex labels that differ in exactly one bit
+@lru_cache(maxsize=None)
+def hypercube_edges(n):
+    """
+    Compute the edges of the n-dimensional hypercube.
+
+    Parameters:
+    n (int): Dimension.
+
+    Returns:
+    numpy.ndarray: Read-only int32 array of shape (n 2^(n-1), 2) of vertex labels, smaller label first, grouped
+    by axis: the first 2^(n-1) edges run along axis 0, the next along axis 1, and so on.
+    """
+    _check_dimension(n)
+    if n == 0:
+        return _read_only(np.zeros((0, 2), dtype=np.int32))
+    return _read_only(hypercube_faces(n, 1).copy())
+
+
+# Axis along which each edge runs
+@lru_cache(maxsize=None)
+def hypercube_edge_axes(n):
+    """
+    Axis of every edge of hypercube_edges(n).
+
+    Returns:
+    numpy.ndarray: Read-only int8 array of n 2^(n-1) axis numbers.
+    """
+    _check_dimension(n)
+    if n == 0:
+        return _read_only(np.zeros(0, dtype=np.int8))
+    return _read_only(np.repeat(np.arange(n, dtype=np.int8), 1 << (n - 1)))
+
+
+# Labels from 0 to 2^n - 1 whose bits on 'axes' are all 0
+def _bases(n, axes):
+    free = np.arange(1 << (n - len(axes)), dtype=np.int32)
+    # Spread the bits of 'free' over the axes that are not in 'axes', lowest first
+    labels = np.zeros_like(free)
+    fixed = [j for j in range(n) if j not in axes]
+    for position, axis in enumerate(fixed):
+        labels |= ((free >> position) & 1) << axis
+    return labels
+
+
+# k-dimensional faces
+@lru_cache(maxsize=16)
+def hypercube_faces(n, k):
+    """
+    Compute the k-dimensional faces of the n-dimensional hypercube: edges for k = 1, squares for k = 2, cubic
+    cells for k = 3, and so on.
+
+    Each face is listed by the labels of its 2^k vertices in binary order over its free axes (vertex t of the
+    face sets free axis m when bit m of t is set). For squares, SQUARE_CYCLE gives the order around the edge.
+
+    Parameters:
+    n (int): Dimension of the hypercube.
+    k (int): Dimension of the faces, from 0 to n.
+
+    Returns:
+    numpy.ndarray: Read-only int32 array of shape (C(n, k) 2^(n-k), 2^k), grouped by the set of free axes in
+    lexicographic order.
+    """
+    _check_dimension(n)
+    if not 0 <= k <= n:
+        raise ValueError(f"face dimension must be between 0 and {n}, got {k}")
+    corners = np.arange(1 << k, dtype=np.int32)
+    faces = np.empty((math.comb(n, k) << (n - k), 1 << k), dtype=np.int32)
+    row = 0
+    for axes in combinations(range(n), k):
+        # Offsets from the base vertex to each vertex of the face
+        offsets = np.zeros_like(corners)
+        for m, axis in enumerate(axes):
+            offsets |= ((corners >> m) & 1) << axis
+        bases = _bases(n, axes)
+        faces[row:row + len(bases)] = bases[:, None] | offsets
+        row += len(bases)
+    return _read_only(faces)
+
+
+# Number of k-faces without building them
+def face_count(n, k):
+    """
+    Number of k-dimensional faces of the n-dimensional hypercube, C(n, k) 2^(n-k).
+    """
+    return math.comb(n, k) << (n - k) if 0 <= k <= n else 0
@@ -0,0 +1,468 @@
+"""
+Kauffman Bracket and Jones Polynomial of Knot Diagrams
+
+knots_tangles_and_the_jones_polynomial.py describes the Jones polynomial but never computes it. This module does,
+from a planar diagram (PD) code or from a sampled 3D curve such as trefoil_knot(t):
+
+- A PD code lists the crossings as 4-tuples of edge labels, X[a, b, c, d] read counterclockwise from the incoming
+  under-strand, the convention of KnotInfo and the KnotTheory package. Edges are numbered consecutively along
+  the orientation of each component.
+- A closed 3D curve is projected onto the xy-plane. Its self-crossings are found with the grid index of
+  crossing_index, the higher strand at each one is the over-strand, and the edges between consecutive crossing
+  passages are numbered into a PD code.
+- The Kauffman bracket <K> = sum over states of A^(#A - #B) d^(loops - 1), with d = -A^2 - A^-2, is summed by
+  contracting the diagram one crossing at a time instead of enumerating all 2^n states. After each step the
+  partial state sum is a map from the ways the arcs so far pair up their open ends (the boundary of the
+  processed tangle) to Laurent polynomials. States with the same pairing are merged, and loops closed
+  inside the tangle become factors of d. The crossings are taken in greedy order, next the one sharing the most
+  edges with the tangle so far, which keeps the boundary (and so the number of pairings) small, like a
+  low-width path decomposition. For planar diagrams the boundary grows with about the square root of the
+  crossing number, so 30-50 crossing knots take well under a second.
+- The Jones polynomial is V(t) = (-A^3)^(-w) <K> at A = t^(-1/4), with w the writhe.
+- Results are cached per canonical PD code (crossings sorted, edge labels rotated to the smallest form), so
+  relabelled or reordered copies of a diagram share one entry.
+
+Crossing signs (and so the writhe) come from orienting every over-strand from the under-strands of the diagram,
+which stays correct for kinks, where the edge labels alone are ambiguous. Running the module checks known
+polynomials, kinks, and the agreement of many projections of one curve.
+
+Polynomials are dicts from exponents to integer coefficients. Jones polynomials of links with an even number of
+components have half-integer exponents, which are Fractions.
+
+DT codes are not accepted: turning a DT code into a diagram needs a planar realization of its Gauss code, which
+this module does not implement.
+
+Libraries:
+- Numpy: For reading the crossings of sampled curves into PD codes.
+"""
+
+from collections import Counter
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+from crossing_index import find_crossings
+
+# Diagrams whose Jones polynomials are kept
+JONES_CACHE_SIZE = 256
+
+# Value of a closed loop, d = -A^2 - A^-2
+_LOOP = {2: -1, -2: -1}
+
+
+# Product of two Laurent polynomials
+def _multiply(p, q):
+    product = {}
+    for e1, c1 in p.items():
+        for e2, c2 in q.items():
+            product[e1 + e2] = product.get(e1 + e2, 0) + c1 * c2
+    return {e: c for e, c in product.items() if c}
+
+
+# Powers of the loop value, d^k
+@lru_cache(maxsize=None)
+def _loop_power(k):
+    return _LOOP if k == 1 else {0: 1} if k == 0 else _multiply(_loop_power(k - 1), _LOOP)
+
+
+# p / d for a polynomial p divisible by d
+def _divide_by_loop(p):
+    # d = -A^-2 (A^4 + 1): divide by A^4 + 1 from the top exponent down, then multiply by -A^2
+    remainder = dict(p)
+    quotient = {}
+    while remainder:
+        top = max(remainder)
+        coefficient = remainder.pop(top)
+        if not coefficient:
+            continue
+        if top < min(p) + 4:
+            raise ValueError("polynomial is not divisible by the loop value")
+        quotient[top - 2] = -coefficient
+        remainder[top - 4] = remainder.get(top - 4, 0) - coefficient
+    return {e: c for e, c in quotient.items() if c}
+
+
+# Validated PD code as a tuple of 4-tuples
+def _check_pd(pd):
+    crossings = tuple(tuple(int(label) for label in crossing) for crossing in pd)
+    if any(len(crossing) != 4 for crossing in crossings):
+        raise ValueError("every crossing of a PD code needs exactly four edge labels")
+    counts = Counter(label for crossing in crossings for label in crossing)
+    odd = sorted(label for label, count in counts.items() if count != 2)
+    if odd:
+        raise ValueError(f"every edge label of a PD code must appear exactly twice; {odd} do not")
+    return crossings
+
+
+# Sign of a crossing, from the direction of its over-strand
+def crossing_sign(crossing):
+    """
+    Sign of a PD crossing X[i, j, k, l] read from its labels alone: +1 when the over-strand runs from l to j, -1
+    when it runs from j to l (the KnotTheory convention, with kinks X[i, i, k, l] and X[i, j, k, k] counted
+    positive).
+
+    The labels only tell the direction apart when the over-strand's component has more than two edges; on a
+    component of two edges both j -> l and l -> j are consecutive. crossing_signs reads the direction off the
+    whole diagram instead.
+    """
+    i, j, k, l = crossing
+    return 1 if i == j or k == l or j - l == 1 or l - j > 1 else -1
+
+
+# Position (1 or 3) of the incoming over-strand at every crossing
+def _incoming_over(crossings):
+    """
+    Orient the over-strands from the under-strands, whose direction (i in, k out) is part of the PD code: an
+    edge enters one of its two ends and leaves the other, so the role of each edge at one crossing fixes its role
+    at the other, and that fixes the over-strand there. Only components that pass over every one of their
+    crossings are left; one crossing of each is oriented by crossing_sign, which then spreads to the rest.
+    """
+    occurrences = {}
+    for c, crossing in enumerate(crossings):
+        for position, label in enumerate(crossing):
+            occurrences.setdefault(label, []).append((c, position))
+    incoming = [None] * len(crossings)
+
+    def is_incoming(c, position):
+        return position == 0 if position in (0, 2) else incoming[c] == position
+
+    stack = [(c, position) for c in range(len(crossings)) for position in (0, 2)]
+    while True:
+        while stack:
+            c, position = stack.pop()
+            entering = is_incoming(c, position)
+            for c2, position2 in occurrences[crossings[c][position]]:
+                if (c2, position2) == (c, position) or position2 in (0, 2) or incoming[c2] is not None:
+                    continue
+                # The other end of the edge has the opposite role
+                incoming[c2] = 4 - position2 if entering else position2
+                stack.extend(((c2, 1), (c2, 3)))
+        unresolved = [c for c in range(len(crossings)) if incoming[c] is None]
+        if not unresolved:
+            return incoming
+        c = unresolved[0]
+        incoming[c] = 3 if crossing_sign(crossings[c]) > 0 else 1
+        stack.extend(((c, 1), (c, 3)))
+
+
+# Signs of every crossing of a diagram
+def crossing_signs(pd):
+    """
+    Signs of the crossings of a PD code, with the over-strands oriented from the under-strands of the diagram
+    rather than from label arithmetic, so components of one or two edges (kinks) are signed correctly.
+
+    Returns:
+    list: +1 or -1 for every crossing, in order.
+    """
+    return [1 if position == 3 else -1 for position in _incoming_over(_check_pd(pd))]
+
+
+# Writhe of a diagram
+def writhe(pd):
+    """
+    Sum of the crossing signs of a PD code.
+    """
+    return sum(crossing_signs(pd))
+
+
+# Greedy contraction order that keeps the tangle boundary small
+def _contraction_order(crossings):
+    remaining = set(range(len(crossings)))
+    boundary = set()
+    order = []
+    while remaining:
+        # Most edges shared with the boundary (fewest new open ends) first, then the lowest index
+        best = min(remaining, key=lambda c: (-sum(label in boundary for label in crossings[c]), c))
+        remaining.remove(best)
+        order.append(best)
+        boundary.symmetric_difference_update(crossings[best])
+    return order
+
+
+# Join two arc ends through a smoothing, updating the end pairing in place; returns the loops closed
+def _join(partner, x, y):
+    if x == y:
+        return 1
+    if partner.get(x) == y:
+        del partner[x], partner[y]
+        return 1
+    ex = partner.pop(x) if x in partner else x
+    ey = partner.pop(y) if y in partner else y
+    if ex != x:
+        del partner[ex]
+    if ey != y:
+        del partner[ey]
+    partner[ex] = ey
+    partner[ey] = ex
+    return 0
+
+
+# Unnormalized state sum, sum over states of A^(#A - #B) d^loops
+def _state_sum(crossings):
+    # Pairing of the open ends (sorted pairs) -> polynomial
+    states = {(): {0: 1}}
+    for c in _contraction_order(crossings):
+        a, b, cc, d = crossings[c]
+        merged = {}
+        for pairing, poly in states.items():
+            for shift, pairs in ((1, ((a, b), (cc, d))), (-1, ((a, d), (b, cc)))):
+                partner = {}
+                for x, y in pairing:
+                    partner[x] = y
+                    partner[y] = x
+                loops = sum(_join(partner, x, y) for x, y in pairs)
+                key = tuple(sorted((x, y) for x, y in partner.items() if x < y))
+                term = merged.setdefault(key, {})
+                weight = _loop_power(loops)
+                for e, coefficient in poly.items():
+                    for e2, c2 in weight.items():
+                        exponent = e + shift + e2
+                        term[exponent] = term.get(exponent, 0) + coefficient * c2
+        states = {key: {e: c for e, c in poly.items() if c} for key, poly in merged.items()}
+    return states.get((), {})
+
+
+# Smallest relabelling of a PD code
+def canonical_pd(pd):
+    """
+    Canonical form of a PD code: edge labels renumbered from 1 along their components, crossings sorted, and for
+    knots the labels rotated along the knot to the smallest result.
+
+    Knot diagrams that differ only in the numbering of their edges or the order of their crossings get the same
+    canonical form; link diagrams only share it when their components are numbered alike.
+
+    Returns:
+    tuple: Sorted tuple of crossing 4-tuples.
+    """
+    crossings = _check_pd(pd)
+    if not crossings:
+        return ()
+    labels = sorted({label for crossing in crossings for label in crossing})
+    # Walk every component along its orientation
+    successors = _label_successors(crossings, labels)
+    components = []
+    seen = set()
+    for label in labels:
+        if label in seen:
+            continue
+        component = [label]
+        seen.add(label)
+        while successors[component[-1]] not in seen:
+            component.append(successors[component[-1]])
+            seen.add(component[-1])
+        components.append(component)
+    best = None
+    for shifts in _component_shifts(components):
+        mapping = {}
+        next_label = 1
+        for component, shift in zip(components, shifts):
+            for position in range(len(component)):
+                mapping[component[(position + shift) % len(component)]] = next_label
+                next_label += 1
+        candidate = tuple(sorted(tuple(mapping[label] for label in crossing) for crossing in crossings))
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+
+# Next label along the orientation of each edge
+def _label_successors(crossings, labels):
+    """
+    Follow each edge to the next one: at a crossing X[i, j, k, l] the under-strand continues from i to k and the
+    over-strand from j to l or l to j, as oriented by _incoming_over.
+    """
+    successors = {}
+    for (i, j, k, l), position in zip(crossings, _incoming_over(crossings)):
+        successors[i] = k
+        if position == 3:
+            successors[l] = j
+        else:
+            successors[j] = l
+    for label in labels:
+        successors.setdefault(label, label)
+    return successors
+
+
+# Rotations tried per component when canonicalizing
+def _component_shifts(components):
+    if len(components) == 1:
+        return [(shift,) for shift in range(len(components[0]))]
+    # Links keep their numbering: a component that only passes over is oriented by its labels, which a rotation
+    # could flip
+    return [(0,) * len(components)]
+
+
+# Kauffman bracket
+def kauffman_bracket(pd):
+    """
+    Kauffman bracket <K> of a PD code, normalized so that a diagram of the unknot with no crossings gives 1.
+
+    Parameters:
+    pd (iterable): Crossings as 4-tuples of edge labels.
+
+    Returns:
+    dict: Exponent of A -> integer coefficient.
+
+    Raises:
+    ValueError: If the PD code is malformed.
+    """
+    crossings = _check_pd(pd)
+    if not crossings:
+        return {0: 1}
+    return _divide_by_loop(_state_sum(crossings))
+
+
+# Jones polynomial of a canonical PD code, as sorted (exponent, coefficient) pairs
+@lru_cache(maxsize=JONES_CACHE_SIZE)
+def _jones_canonical(crossings):
+    bracket = kauffman_bracket(crossings)
+    w = writhe(crossings)
+    # (-A^3)^(-w) <K>, then A = t^(-1/4)
+    sign = -1 if w % 2 else 1
+    return tuple(sorted((_t_exponent(-(e - 3 * w)), sign * c) for e, c in bracket.items()))
+
+
+# Exponent of t for an exponent of A = t^(-1/4), after the sign flip
+def _t_exponent(a_exponent):
+    exponent = Fraction(a_exponent, 4)
+    return int(exponent) if exponent.denominator == 1 else exponent
+
+
+# Jones polynomial
+def jones_polynomial(pd):
+    """
+    Jones polynomial V(t) of a PD code, with V(unknot) = 1.
+
+    Results are cached by canonical_pd, so repeated and relabelled diagrams are computed once.
+
+    Parameters:
+    pd (iterable): Crossings as 4-tuples of edge labels.
+
+    Returns:
+    dict: Exponent of t (int, or Fraction for half-integer powers of links) -> integer coefficient.
+
+    Raises:
+    ValueError: If the PD code is malformed.
+    """
+    return dict(_jones_canonical(canonical_pd(pd)))
+
+
+# Human-readable Laurent polynomial
+def format_laurent(poly, variable='t'):
+    """
+    Format a polynomial dict, highest power first, such as '-t^4 + t^3 + t'.
+    """
+    terms = []
+    for exponent in sorted(poly, reverse=True):
+        coefficient = poly[exponent]
+        if not coefficient:
+            continue
+        magnitude = abs(coefficient)
+        if exponent == 0:
+            body = str(magnitude)
+        else:
+            if exponent == 1:
+                power = variable
+            elif isinstance(exponent, Fraction):
+                power = f'{variable}^({exponent})'
+            else:
+                power = f'{variable}^{exponent}'
+            body = power if magnitude == 1 else f'{magnitude}{power}'
+        sign = '-' if coefficient < 0 else '+'
+        terms.append((sign, body))
+    if not terms:
+        return '0'
+    first_sign, first_body = terms[0]
+    text = ('-' if first_sign == '-' else '') + first_body
+    return text + ''.join(f' {sign} {body}' for sign, body in terms[1:])
+
+
+# PD code of the projection of a sampled closed curve
+def pd_from_curve(x, y, z, crossings=None):
+    """
+    Project a closed 3D curve onto the xy-plane and read off the PD code of the diagram.
+
+    The curve is the polyline through the samples, closed by a segment from the last sample back to the first.
+    At each self-crossing of the projection the strand with the larger z is the over-strand.
+
+    Parameters:
+    x, y, z (array-like): Coordinates of the samples, in order along the curve.
+    crossings (Crossings, optional): Crossings of the curve, as kept by a crossing_index.CrossingIndex.
+    Found with crossing_index.find_crossings by default.
+
+    Returns:
+    list: Crossings as 4-tuples of edge labels (empty for a projection without crossings).
+    """
+    points = np.column_stack((x, y, z)).astype(np.float64)
+    i, j, s, u, first_over = find_crossings(points) if crossings is None else crossings
+    if len(i) == 0:
+        return []
+    delta = np.roll(points, -1, axis=0) - points
+
+    # Two passages per crossing, ordered by their position along the curve
+    position = np.concatenate((i + s, j + u))
+    crossing_of = np.tile(np.arange(len(i)), 2)
+    segment = np.concatenate((i, j))
+    is_over = np.concatenate((first_over, ~first_over))
+    order = np.argsort(position, kind='stable')
+    n_passages = len(order)
+    # Passage m (in curve order) is entered by edge m (edge 0 is labelled n_passages) and left by edge m + 1
+    rank = np.empty(n_passages, dtype=np.int64)
+    rank[order] = np.arange(n_passages)
+    incoming = np.where(rank == 0, n_passages, rank)
+    outgoing = rank + 1
+
+    under = {}
+    over = {}
+    for passage in range(n_passages):
+        (over if is_over[passage] else under)[crossing_of[passage]] = passage
+    pd = []
+    for c in range(len(i)):
+        p, q = under[c], over[c]
+        du, dv = delta[segment[p], :2], delta[segment[q], :2]
+        # Counterclockwise from the incoming under-strand comes the incoming over-strand when the over-strand
+        # runs from right to left across the under-strand
+        if du[0] * dv[1] - du[1] * dv[0] > 0:
+            pd.append((int(incoming[p]), int(incoming[q]), int(outgoing[p]), int(outgoing[q])))
+        else:
+            pd.append((int(incoming[p]), int(outgoing[q]), int(outgoing[p]), int(incoming[q])))
+    return pd
+
+
+# Regression checks of the engine against known invariants
+def _self_check(n_views=24, seed=0):
+    """
+    Check known Jones polynomials, that one-crossing kinks are unknots, and that a curve seen from many
+    directions always gives the same polynomial. Raises AssertionError on the first failure.
+    """
+    trefoil = [(1, 5, 2, 4), (3, 1, 4, 6), (5, 3, 6, 2)]
+    figure_eight = [(4, 2, 5, 1), (8, 6, 1, 5), (6, 3, 7, 4), (2, 7, 3, 8)]
+    assert jones_polynomial(trefoil) == {1: 1, 3: 1, 4: -1}
+    assert jones_polynomial(figure_eight) == {-2: 1, -1: -1, 0: 1, 1: -1, 2: 1}
+    for kink in ([(2, 1, 1, 2)], [(1, 2, 2, 1)], [(2, 2, 1, 1)], [(1, 1, 2, 2)]):
+        assert jones_polynomial(kink) == {0: 1}, kink
+
+    # Every projection of one curve is a diagram of the same knot
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    curves = {
+        'unknot': (np.sin(t), np.sin(2 * t), np.cos(t)),
+        'trefoil': (np.sin(t) + 2 * np.sin(2 * t), np.cos(t) - 2 * np.cos(2 * t), -np.sin(3 * t)),
+    }
+    for name, curve in curves.items():
+        points = np.column_stack(curve)
+        expected = None
+        for _ in range(n_views):
+            rotation, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+            # A proper rotation: a reflection would mirror the knot
+            rotation *= np.sign(np.linalg.det(rotation))
+            V = jones_polynomial(pd_from_curve(*(points @ rotation).T))
+            expected = V if expected is None else expected
+            assert V == expected, (name, V, expected)
+        assert name != 'unknot' or expected == {0: 1}, expected
+
+
+if __name__ == "__main__":
+    _self_check()
+    print("jones_polynomial checks passed")
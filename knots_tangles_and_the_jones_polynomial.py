@@ -25,6 +25,9 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.widgets import Slider, Button
 
+from crossing_index import CrossingIndex
+from jones_polynomial import format_laurent, jones_polynomial, pd_from_curve
+
 # Create basic 3D knot visualization (example: trefoil knot)
 def trefoil_knot(t):
     """
@@ -39,49 +42,77 @@ def trefoil_knot(t):
 # Define the range for the parametric variable t
 t = np.linspace(0, 2 * np.pi, 500)
 
-# Generate the trefoil knot
-x, y, z = trefoil_knot(t)
-
-# Create a 3D plot for the knot
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-knot_plot, = ax.plot(x, y, z, label="Trefoil Knot")
-
-# Set labels and title
-ax.set_title('Trefoil Knot - Explore Knot Transformations')
-ax.set_xlabel('X')
-ax.set_ylabel('Y')
-ax.set_zlabel('Z')
-
-# Add sliders for user interaction (manipulation of knot parameters)
-axcolor = 'lightgoldenrodyellow'
-ax_slider = plt.axes([0.25, 0.01, 0.65, 0.03], facecolor=axcolor)
-t_slider = Slider(ax_slider, 'Transform', 0.1, 2.0, valinit=1.0)
-
-def update(val):
+# Jones polynomial of a sampled curve, closed by a straight segment back to its start
+def jones_label(x, y, z, crossings=None):
+    pd = pd_from_curve(x, y, z, crossings)
+    polynomial = format_laurent(jones_polynomial(pd))
+    # Long polynomials of self-overlapping curves are cut to fit above the plot
+    if len(polynomial) > 60:
+        polynomial = polynomial[:polynomial.rfind(' ', 0, 60)] + ' ...'
+    return f"{len(pd)} crossings, V(t) = {polynomial}"
+
+# Interactive knot figure
+def plot_knot():
     """
-    Update function for the slider interaction, allowing users to deform the knot
-    by changing the parametric equations.
+    Create the 3D trefoil knot figure with a slider that deforms the knot and a button that resets it.
+    Returns the figure and its widgets; keep the widgets referenced while the figure is shown, since they stop
+    responding once garbage collected.
     """
-    t_val = t_slider.val
-    new_x, new_y, new_z = trefoil_knot(t * t_val)
-    knot_plot.set_data(new_x, new_y)
-    knot_plot.set_3d_properties(new_z)
-    fig.canvas.draw_idle()
-
-t_slider.on_changed(update)
-
-# Add a button to reset the knot transformation
-resetax = plt.axes([0.8, 0.025, 0.1, 0.04])
-button = Button(resetax, 'Reset', color=axcolor, hovercolor='0.975')
-
-def reset(event):
-    """
-    Reset the knot back to its original form when the reset button is pressed.
-    """
-    t_slider.reset()
-
-button.on_clicked(reset)
+    # Generate the trefoil knot
+    x, y, z = trefoil_knot(t)
+
+    # Create a 3D plot for the knot
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    knot_plot, = ax.plot(x, y, z, label="Trefoil Knot")
+
+    # Set labels and title
+    ax.set_title('Trefoil Knot - Explore Knot Transformations')
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+    ax.set_zlabel('Z')
+    # Crossings of the projection, kept up to date as the slider deforms the knot
+    index = CrossingIndex(np.column_stack((x, y, z)))
+    jones_text = ax.text2D(0.02, 0.95, jones_label(x, y, z, index.crossings), transform=ax.transAxes)
+
+    # Add sliders for user interaction (manipulation of knot parameters)
+    axcolor = 'lightgoldenrodyellow'
+    ax_slider = fig.add_axes([0.25, 0.01, 0.65, 0.03], facecolor=axcolor)
+    t_slider = Slider(ax_slider, 'Transform', 0.1, 2.0, valinit=1.0)
+
+    def update(val):
+        """
+        Update function for the slider interaction, allowing users to deform the knot
+        by changing the parametric equations.
+        """
+        t_val = t_slider.val
+        new_x, new_y, new_z = trefoil_knot(t * t_val)
+        knot_plot.set_data(new_x, new_y)
+        knot_plot.set_3d_properties(new_z)
+        crossings = index.update(np.column_stack((new_x, new_y, new_z)))
+        jones_text.set_text(jones_label(new_x, new_y, new_z, crossings))
+        fig.canvas.draw_idle()
+
+    t_slider.on_changed(update)
+
+    # Add a button to reset the knot transformation
+    resetax = fig.add_axes([0.8, 0.025, 0.1, 0.04])
+    button = Button(resetax, 'Reset', color=axcolor, hovercolor='0.975')
+
+    def reset(event):
+        """
+        Reset the knot back to its original form when the reset button is pressed.
+        """
+        t_slider.reset()
+
+    button.on_clicked(reset)
+    return fig, (t_slider, button)
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_knot()[0]]
 
 # Display the plot
-plt.show()
+if __name__ == "__main__":
+    fig, widgets = plot_knot()
+    plt.show()
@@ -54,50 +54,64 @@ def hyperbolic_geometry():
     z = np.cosh(u) - np.cosh(v)
     return x, y, z
 
-# Initialize 3D plot
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-ax.set_box_aspect([1,1,1])
-
-# Default geometry: Euclidean
-x, y, z = euclidean_geometry()
-geometry_plot = ax.plot_surface(x, y, z, color='b', alpha=0.8)
+# Interactive geometry explorer
+def plot_geometries():
+    """
+    Create the 3D figure with radio buttons that switch between the spherical, Euclidean and hyperbolic
+    geometries. Returns the figure and its widgets; keep the widgets referenced while the figure is shown, since
+    they stop responding once garbage collected.
+    """
+    # Initialize 3D plot
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    ax.set_box_aspect([1,1,1])
 
-# Set titles and labels
-ax.set_title('Explore Geometries of 3-Manifolds')
-ax.set_xlabel('X')
-ax.set_ylabel('Y')
-ax.set_zlabel('Z')
+    # Default geometry: Euclidean
+    x, y, z = euclidean_geometry()
+    ax.plot_surface(x, y, z, color='b', alpha=0.8)
 
-# Function to update the geometry based on user selection
-def update_geometry(label):
-    ax.cla()  # Clear current plot
-    if label == 'Spherical':
-        x, y, z = spherical_geometry()
-        ax.plot_surface(x, y, z, color='r', alpha=0.8)
-        ax.set_title('Spherical Geometry')
-    elif label == 'Euclidean':
-        x, y, z = euclidean_geometry()
-        ax.plot_surface(x, y, z, color='b', alpha=0.8)
-        ax.set_title('Euclidean Geometry')
-    elif label == 'Hyperbolic':
-        x, y, z = hyperbolic_geometry()
-        ax.plot_surface(x, y, z, color='g', alpha=0.8)
-        ax.set_title('Hyperbolic Geometry')
-    
-    # Reset labels and aspect ratio
+    # Set titles and labels
+    ax.set_title('Explore Geometries of 3-Manifolds')
     ax.set_xlabel('X')
     ax.set_ylabel('Y')
     ax.set_zlabel('Z')
-    ax.set_box_aspect([1,1,1])
-    fig.canvas.draw_idle()
 
-# Create radio buttons for user interaction
-ax_radio = plt.axes([0.05, 0.7, 0.15, 0.15], facecolor='lightgoldenrodyellow')
-radio_buttons = RadioButtons(ax_radio, ('Spherical', 'Euclidean', 'Hyperbolic'))
+    # Function to update the geometry based on user selection
+    def update_geometry(label):
+        ax.cla()  # Clear current plot
+        if label == 'Spherical':
+            x, y, z = spherical_geometry()
+            ax.plot_surface(x, y, z, color='r', alpha=0.8)
+            ax.set_title('Spherical Geometry')
+        elif label == 'Euclidean':
+            x, y, z = euclidean_geometry()
+            ax.plot_surface(x, y, z, color='b', alpha=0.8)
+            ax.set_title('Euclidean Geometry')
+        elif label == 'Hyperbolic':
+            x, y, z = hyperbolic_geometry()
+            ax.plot_surface(x, y, z, color='g', alpha=0.8)
+            ax.set_title('Hyperbolic Geometry')
+        
+        # Reset labels and aspect ratio
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.set_zlabel('Z')
+        ax.set_box_aspect([1,1,1])
+        fig.canvas.draw_idle()
+
+    # Create radio buttons for user interaction
+    ax_radio = fig.add_axes([0.05, 0.7, 0.15, 0.15], facecolor='lightgoldenrodyellow')
+    radio_buttons = RadioButtons(ax_radio, ('Spherical', 'Euclidean', 'Hyperbolic'))
+
+    # Link radio buttons to the update function
+    radio_buttons.on_clicked(update_geometry)
+    return fig, (radio_buttons,)
 
-# Link radio buttons to the update function
-radio_buttons.on_clicked(update_geometry)
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_geometries()[0]]
 
 # Show plot with interactive elements
-plt.show()
+if __name__ == "__main__":
+    fig, widgets = plot_geometries()
+    plt.show()
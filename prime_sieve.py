@@ -0,0 +1,285 @@
+"""
+Segmented Sieve of Eratosthenes
+
+This module is the shared prime engine for the prime scripts in this repository. Instead of allocating one
+flag per integer up to the limit, the range is processed in cache-sized windows that only store odd numbers.
+Each window is pre-sieved with a small wheel (3, 5, 7, 11, 13), crossed off with the base primes up to
+sqrt(upper), and the primes it contains are yielded before the next window is touched.
+
+Memory use is O(sqrt(N) + segment) instead of O(N), so ranges like [10^10, 10^10 + 10^9) can be swept
+without holding more than one window of flags at a time.
+
+Large ranges can also be split into disjoint chunks and sieved by a process pool. Every worker receives the
+base primes once, sieves its chunks independently and sends back compact uint32 offsets, which are stitched
+back together in order by the parent.
+
+Libraries:
+- Numpy: For the flag windows and vectorized crossing-off.
+- concurrent.futures: For the process pool behind the parallel sieve.
+"""
+
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+# Number of odd candidates per window; 2^18 one-byte flags (256 KiB) sit comfortably in a typical L2 cache
+DEFAULT_SEGMENT_SIZE = 1 << 18
+
+# Primes removed by the wheel pattern before any crossing-off happens
+WHEEL_PRIMES = (3, 5, 7, 11, 13)
+WHEEL_PERIOD = 3 * 5 * 7 * 11 * 13  # Period of the pattern measured in odd numbers
+
+# Base primes spanning at most this many multiples per window are crossed off in one vectorized pass
+SPARSE_HITS = 16
+
+# Numbers handed to each worker task; offsets inside a chunk must fit in uint32
+DEFAULT_CHUNK_SIZE = 1 << 24
+
+# Base primes shared by every task of a pool worker, installed once by _init_worker
+_worker_base = None
+
+
+# Simple odd-only sieve for the base primes
+@lru_cache(maxsize=8)
+def base_primes(limit):
+    """
+    Generate all primes less than or equal to 'limit' with an odd-only Sieve of Eratosthenes.
+
+    Parameters:
+    limit (int): The upper limit (inclusive) for the base primes.
+
+    Returns:
+    numpy.ndarray: Read-only int64 array of primes up to the limit.
+    """
+    if limit < 2:
+        primes = np.zeros(0, dtype=np.int64)
+    else:
+        # Index k represents the odd number 2k + 1
+        flags = np.ones(limit // 2 + 1, dtype=bool)
+        flags[0] = False
+        for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+            if flags[i]:
+                p = 2 * i + 1
+                flags[p * p // 2::p] = False
+        odd = 2 * np.flatnonzero(flags[:(limit + 1) // 2]).astype(np.int64) + 1
+        primes = np.concatenate(([2], odd)).astype(np.int64)
+    primes.setflags(write=False)
+    return primes
+
+
+# Wheel pattern tiled to cover a full window at any phase
+@lru_cache(maxsize=4)
+def _wheel_pattern(segment_size):
+    """
+    Build the odd-number flags with multiples of the wheel primes removed, long enough to slice a window
+    of 'segment_size' flags starting at any phase of the wheel.
+    """
+    odd = 2 * np.arange(WHEEL_PERIOD, dtype=np.int64) + 1
+    period = np.ones(WHEEL_PERIOD, dtype=bool)
+    for p in WHEEL_PRIMES:
+        period &= (odd % p) != 0
+    reps = -(-(segment_size + WHEEL_PERIOD) // WHEEL_PERIOD)
+    pattern = np.tile(period, reps)
+    pattern.setflags(write=False)
+    return pattern
+
+
+# Sieve a single window of odd numbers
+def _sieve_window(lo, hi, base, segment_size):
+    """
+    Sieve the odd numbers in [lo, hi), where 'lo' is odd, and return the primes among them.
+
+    Parameters:
+    lo (int): Odd first candidate of the window.
+    hi (int): Exclusive end of the window.
+    base (numpy.ndarray): Odd base primes above the wheel primes, covering sqrt(hi).
+    segment_size (int): Window size the wheel pattern was built for.
+
+    Returns:
+    numpy.ndarray: int64 array of the primes in the window.
+    """
+    n = (hi - lo + 1) // 2
+    phase = ((lo - 1) // 2) % WHEEL_PERIOD
+    flags = _wheel_pattern(segment_size)[phase:phase + n].copy()
+
+    # Only base primes with p*p < hi can cross anything off
+    active = base[:np.searchsorted(base, math.isqrt(hi - 1), side='right')]
+    if active.size:
+        # First odd multiple of each prime inside the window, never below p*p
+        starts = np.maximum(active * active, -(-lo // active) * active)
+        starts += active * (starts % 2 == 0)
+        offsets = (starts - lo) // 2
+
+        # Small primes hit the window many times: cross off with one strided slice each
+        dense = active < n // SPARSE_HITS
+        for p, offset in zip(active[dense].tolist(), offsets[dense].tolist()):
+            flags[offset::p] = False
+
+        # Large primes hit it a handful of times: cross off all of them in one fancy-indexed pass
+        sparse_p = active[~dense]
+        if sparse_p.size:
+            hits = offsets[~dense, None] + sparse_p[:, None] * np.arange(SPARSE_HITS + 1)
+            flags[hits[hits < n]] = False
+
+    # The wheel removed the wheel primes themselves, and 1 is not prime
+    for p in WHEEL_PRIMES:
+        if lo <= p < hi:
+            flags[(p - lo) // 2] = True
+    if lo == 1:
+        flags[0] = False
+
+    return lo + 2 * np.flatnonzero(flags).astype(np.int64)
+
+
+# Stream the primes of a range window by window
+def iter_prime_segments(lower, upper, segment_size=DEFAULT_SEGMENT_SIZE, base=None):
+    """
+    Yield the primes in [lower, upper) one cache-sized window at a time.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+    segment_size (int): Number of odd candidates sieved per window.
+    base (numpy.ndarray, optional): Sorted primes covering at least sqrt(upper). Computed when omitted.
+
+    Yields:
+    numpy.ndarray: int64 array of the primes in each window, in increasing order.
+    """
+    lower = max(int(lower), 1)
+    upper = int(upper)
+    if upper <= lower:
+        return
+    if base is None:
+        base = base_primes(math.isqrt(upper - 1))
+    base = np.asarray(base, dtype=np.int64)
+    odd_base = base[base > WHEEL_PRIMES[-1]]
+
+    # 2 is the only even prime and never appears in an odd-only window
+    if lower <= 2 < upper:
+        yield np.array([2], dtype=np.int64)
+
+    span = 2 * segment_size
+    for lo in range(lower | 1, upper, span):
+        yield _sieve_window(lo, min(lo + span, upper), odd_base, segment_size)
+
+
+# Collect all primes of a range into a single array
+def primes_in_range(lower, upper, segment_size=DEFAULT_SEGMENT_SIZE):
+    """
+    Generate all primes in [lower, upper) with the segmented sieve.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+    segment_size (int): Number of odd candidates sieved per window.
+
+    Returns:
+    numpy.ndarray: int64 array of the primes in the range.
+    """
+    segments = list(iter_prime_segments(lower, upper, segment_size))
+    if not segments:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(segments)
+
+
+# Process pool worker setup
+def _init_worker(base):
+    """
+    Store the shared base primes in a pool worker so each task does not have to receive them again.
+    """
+    global _worker_base
+    _worker_base = base
+
+
+# Sieve one chunk inside a pool worker
+def _sieve_chunk(bounds):
+    """
+    Sieve the chunk [lo, hi) with the worker's base primes.
+
+    Parameters:
+    bounds (tuple): The (lo, hi) bounds of the chunk.
+
+    Returns:
+    numpy.ndarray: uint32 offsets of the primes from 'lo', a quarter of the size of int64 primes.
+    """
+    lo, hi = bounds
+    segments = list(iter_prime_segments(lo, hi, base=_worker_base))
+    if not segments:
+        return np.zeros(0, dtype=np.uint32)
+    return (np.concatenate(segments) - lo).astype(np.uint32)
+
+
+# Stream the primes of a range chunk by chunk from a process pool
+def iter_parallel_chunks(lower, upper, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the primes in [lower, upper) chunk by chunk, sieving the chunks in parallel across a process pool.
+
+    Chunks come back in increasing order. At most a few chunks per worker are in flight at once, so
+    streaming a very large range keeps memory bounded. Ranges that fit in a single chunk, or
+    'processes=1', are sieved in the calling process without starting a pool.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+    processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    chunk_size (int): Numbers sieved per worker task; must be below 2^32.
+
+    Yields:
+    numpy.ndarray: int64 array of the primes in each chunk, in increasing order.
+    """
+    if not 0 < chunk_size < 2 ** 32:
+        raise ValueError("chunk_size must be between 1 and 2^32 - 1")
+    lower = max(int(lower), 1)
+    upper = int(upper)
+    if upper <= lower:
+        return
+
+    processes = processes or os.cpu_count() or 1
+    chunks = [(lo, min(lo + chunk_size, upper)) for lo in range(lower, upper, chunk_size)]
+    base = base_primes(math.isqrt(upper - 1))
+
+    if len(chunks) == 1 or processes == 1:
+        for lo, hi in chunks:
+            segments = list(iter_prime_segments(lo, hi, base=base))
+            if segments:
+                yield np.concatenate(segments)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(base,)) as executor:
+        pending = deque()
+        remaining = iter(chunks)
+        for bounds in remaining:
+            pending.append((bounds[0], executor.submit(_sieve_chunk, bounds)))
+            if len(pending) >= 4 * processes:
+                break
+        while pending:
+            lo, future = pending.popleft()
+            offsets = future.result()
+            bounds = next(remaining, None)
+            if bounds is not None:
+                pending.append((bounds[0], executor.submit(_sieve_chunk, bounds)))
+            yield lo + offsets.astype(np.int64)
+
+
+# Collect all primes of a range into a single array using a process pool
+def parallel_primes(lower, upper, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate all primes in [lower, upper) by sieving disjoint chunks across a process pool.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+    processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    chunk_size (int): Numbers sieved per worker task.
+
+    Returns:
+    numpy.ndarray: int64 array of the primes in the range.
+    """
+    chunks = list(iter_parallel_chunks(lower, upper, processes, chunk_size))
+    if not chunks:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(chunks)
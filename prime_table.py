@@ -0,0 +1,218 @@
+"""
+Persistent Prime Table
+
+The prime scripts in this repository used to regenerate their primes from scratch on every run. This module
+keeps them on disk instead: the table is built once with the parallel segmented sieve, stored as a flat sorted
+uint32/uint64 array next to a sparse pi(x) checkpoint index, and opened with np.memmap afterwards.
+
+Queries never copy the primes:
+- prime_count(x) reads the checkpoint for x and binary-searches the primes between two checkpoints.
+- primes_between(a, b) turns two prime counts into a zero-copy slice of the memory-mapped array.
+
+The table lives in ~/.cache/le_math/prime_table by default (override with the LE_MATH_PRIME_TABLE environment
+variable) and is rebuilt automatically, with room to spare, when a script asks for primes beyond its limit.
+
+Libraries:
+- Numpy: For the memory-mapped arrays and binary searches.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from prime_sieve import iter_parallel_chunks
+
+DEFAULT_TABLE_DIR = os.environ.get(
+    "LE_MATH_PRIME_TABLE", os.path.join(os.path.expanduser("~"), ".cache", "le_math", "prime_table"))
+
+# Smallest table ever built, so small requests do not trigger a rebuild each time they grow a little
+MIN_TABLE_LIMIT = 10 ** 7
+
+# Spacing of the pi(x) checkpoints; a lookup searches at most the primes inside one step
+CHECKPOINT_STEP = 1 << 16
+
+PRIMES_FILE = "primes.bin"
+INDEX_FILE = "pi_index.bin"
+META_FILE = "meta.json"
+
+# Opened tables, keyed by directory, so repeated queries do not re-read the metadata
+_open_tables = {}
+
+
+class PrimeTable:
+    """
+    Read-only view of a prime table built by build_prime_table.
+
+    Attributes:
+    limit (int): Every prime less than or equal to the limit is stored.
+    step (int): Spacing of the pi(x) checkpoints.
+    primes (numpy.ndarray): Memory-mapped sorted primes.
+    index (numpy.ndarray): Memory-mapped checkpoints; index[k] is the number of primes below k * step.
+    """
+
+    def __init__(self, directory=DEFAULT_TABLE_DIR):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.limit = meta["limit"]
+        self.step = meta["step"]
+        self.primes = np.asarray(np.memmap(os.path.join(directory, PRIMES_FILE), dtype=meta["dtype"],
+                                           mode="r", shape=(meta["count"],)))
+        self.index = np.asarray(np.memmap(os.path.join(directory, INDEX_FILE), dtype=np.int64,
+                                          mode="r", shape=(self.limit // self.step + 2,)))
+
+    def __len__(self):
+        return len(self.primes)
+
+    def prime_count(self, x):
+        """
+        Count the primes less than or equal to x, i.e. pi(x).
+
+        Parameters:
+        x (int or array-like): Value(s) at which to evaluate pi, at most the table limit.
+
+        Returns:
+        int or numpy.ndarray: pi(x) for each value.
+        """
+        values = np.asarray(x, dtype=np.int64)
+        if values.size and values.max() > self.limit:
+            raise ValueError(f"prime table only covers numbers up to {self.limit}")
+
+        if values.ndim == 0:
+            # Scalars only search the primes between the two surrounding checkpoints
+            value = max(int(values), 0)
+            k = value // self.step
+            lo, hi = int(self.index[k]), int(self.index[k + 1])
+            return lo + int(np.searchsorted(self.primes[lo:hi], value, side="right"))
+
+        # Arrays run one binary search per value, all in lockstep, each inside its own checkpoint window
+        flat = np.maximum(values.ravel(), 0)
+        k = flat // self.step
+        lo = np.asarray(self.index[k], dtype=np.int64)
+        hi = np.asarray(self.index[k + 1], dtype=np.int64)
+        active = np.flatnonzero(lo < hi)
+        while active.size:
+            mid = (lo[active] + hi[active]) // 2
+            below = self.primes[mid] <= flat[active]
+            lo[active] = np.where(below, mid + 1, lo[active])
+            hi[active] = np.where(below, hi[active], mid)
+            active = active[lo[active] < hi[active]]
+        return lo.reshape(values.shape)
+
+    def primes_between(self, lower, upper):
+        """
+        Return the primes in [lower, upper) as a zero-copy slice of the table.
+
+        Parameters:
+        lower (int): Lower bound (inclusive) of the range.
+        upper (int): Upper bound (exclusive) of the range, at most the table limit plus one.
+
+        Returns:
+        numpy.ndarray: Read-only view of the primes in the range.
+        """
+        if upper <= lower:
+            return self.primes[:0]
+        return self.primes[self.prime_count(lower - 1):self.prime_count(upper - 1)]
+
+
+# Build the table files with the parallel sieve
+def build_prime_table(limit, directory=DEFAULT_TABLE_DIR, processes=None):
+    """
+    Sieve every prime up to 'limit' and write the memory-mappable table files.
+
+    The primes are streamed chunk by chunk straight to disk, so building never holds the whole list in
+    memory. Files are written under temporary names and moved into place once complete.
+
+    Parameters:
+    limit (int): Largest number covered by the table.
+    directory (str): Directory holding the table files.
+    processes (int, optional): Number of sieve worker processes. Defaults to the number of CPUs.
+
+    Returns:
+    PrimeTable: The freshly built table.
+    """
+    os.makedirs(directory, exist_ok=True)
+    dtype = np.uint32 if limit < 2 ** 32 else np.uint64
+    suffix = f".{os.getpid()}.tmp"
+    primes_path = os.path.join(directory, PRIMES_FILE)
+    index_path = os.path.join(directory, INDEX_FILE)
+
+    count = 0
+    with open(primes_path + suffix, "wb") as f:
+        for chunk in iter_parallel_chunks(2, limit + 1, processes):
+            f.write(chunk.astype(dtype).tobytes())
+            count += len(chunk)
+
+    # index[k] is the number of primes below k * step, with one extra checkpoint past the limit
+    primes = np.memmap(primes_path + suffix, dtype=dtype, mode="r", shape=(count,))
+    checkpoints = np.arange(limit // CHECKPOINT_STEP + 2, dtype=np.int64) * CHECKPOINT_STEP
+    index = np.searchsorted(primes, checkpoints, side="left").astype(np.int64)
+    del primes
+    index.tofile(index_path + suffix)
+
+    os.replace(primes_path + suffix, primes_path)
+    os.replace(index_path + suffix, index_path)
+    meta = {"limit": int(limit), "step": CHECKPOINT_STEP, "count": count, "dtype": np.dtype(dtype).name}
+    with open(os.path.join(directory, META_FILE) + suffix, "w") as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(directory, META_FILE) + suffix, os.path.join(directory, META_FILE))
+
+    _open_tables.pop(directory, None)
+    return PrimeTable(directory)
+
+
+# Open the table, building or growing it when it does not reach 'limit'
+def open_prime_table(limit=MIN_TABLE_LIMIT, directory=DEFAULT_TABLE_DIR):
+    """
+    Open the prime table covering at least 'limit', building it on first use.
+
+    A table that is too small is rebuilt to at least twice its previous limit, so scripts that keep asking
+    for slightly larger ranges do not rebuild on every run.
+
+    Parameters:
+    limit (int): Largest number the caller needs covered.
+    directory (str): Directory holding the table files.
+
+    Returns:
+    PrimeTable: A table whose limit is at least 'limit'.
+    """
+    table = _open_tables.get(directory)
+    if table is None and os.path.exists(os.path.join(directory, META_FILE)):
+        table = PrimeTable(directory)
+    if table is None or table.limit < limit:
+        previous = table.limit if table is not None else 0
+        target = max(int(limit), MIN_TABLE_LIMIT, 2 * previous)
+        table = build_prime_table(-(-target // CHECKPOINT_STEP) * CHECKPOINT_STEP, directory)
+    _open_tables[directory] = table
+    return table
+
+
+# Primes in a range from the default table
+def primes_between(lower, upper):
+    """
+    Return the primes in [lower, upper) from the default prime table.
+
+    Parameters:
+    lower (int): Lower bound (inclusive) of the range.
+    upper (int): Upper bound (exclusive) of the range.
+
+    Returns:
+    numpy.ndarray: Read-only view of the primes in the range.
+    """
+    return open_prime_table(upper - 1).primes_between(lower, upper)
+
+
+# pi(x) from the default table
+def prime_count(x):
+    """
+    Count the primes less than or equal to x using the default prime table.
+
+    Parameters:
+    x (int or array-like): Value(s) at which to evaluate pi.
+
+    Returns:
+    int or numpy.ndarray: pi(x) for each value.
+    """
+    values = np.asarray(x)
+    return open_prime_table(int(values.max()) if values.size else 0).prime_count(x)
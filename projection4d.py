@@ -0,0 +1,203 @@
+"""
+Perspective and Stereographic 4D Projections
+
+The 4D scripts project by dropping W (4d_as_color.py shows it as color instead), which flattens the tesseract
+into two coincident cubes. This module projects 4D points the way the usual tesseract pictures do, for anything
+from a handful of vertices to millions of points sampled on a 4D surface:
+
+- Transforms are 5 x 5 homogeneous matrices acting on row vectors [x, y, z, w, 1] @ M, the convention of
+  rotation4d. Rotations, translations and the projection itself compose into one matrix per frame, and a stack
+  of matrices (frames x 5 x 5) drives a whole animation.
+- The perspective projection from a viewpoint on the W axis at distance d maps (x, y, z, w) to
+  (x, y, z) d / (d - w). Stereographic projection of the 3-sphere of radius r from its pole (0, 0, 0, r) is
+  the same map with d = r, so both are a homogeneous matrix followed by the division.
+- A second perspective division along Z takes 3D points on to a 2D screen.
+- Points are float32 and processed in chunks of PROJECTION_CHUNK rows with preallocated scratch space, so
+  projecting millions of points needs no temporaries the size of the input. The results go into caller-owned
+  output arrays that can be handed to the renderer and refilled every frame.
+- clifford_torus samples the flat torus (cos u, sin u, cos v, sin v) / sqrt(2) on the unit 3-sphere, which
+  stereographic projection turns into a torus of revolution in 3D.
+
+Libraries:
+- Numpy: For the chunked, in-place float32 arithmetic.
+"""
+
+import numpy as np
+
+from rotation4d import rotation_frames
+
+# Rows of points projected at a time
+PROJECTION_CHUNK = 1 << 16
+
+# Default distance of the viewpoint from the origin, along W for 4D and along Z for 3D
+DEFAULT_DISTANCE = 3.0
+
+
+# 5 x 5 homogeneous matrix from a linear part and a translation
+def homogeneous_matrix(linear=None, translation=None):
+    """
+    Build the homogeneous matrix of the affine map p -> p @ linear + translation.
+
+    Parameters:
+    linear (array-like, optional): 4 x 4 matrix, or a stack of them (..., 4, 4). Defaults to the identity.
+    translation (array-like, optional): Translation (4,), or a stack of them (..., 4). Defaults to zero.
+
+    Returns:
+    numpy.ndarray: Matrix (5, 5), or a stack (..., 5, 5) when either argument is stacked.
+    """
+    linear = np.eye(4) if linear is None else np.asarray(linear, dtype=np.float64)
+    translation = np.zeros(4) if translation is None else np.asarray(translation, dtype=np.float64)
+    shape = np.broadcast_shapes(linear.shape[:-2], translation.shape[:-1])
+    matrix = np.zeros(shape + (5, 5))
+    matrix[..., :4, :4] = linear
+    matrix[..., 4, :4] = translation
+    matrix[..., 4, 4] = 1.0
+    return matrix
+
+
+# Homogeneous rotations of an animation
+def rotation_matrices(planes='xw', frames=100, turns=1.0):
+    """
+    Homogeneous versions of rotation4d.rotation_frames.
+
+    Returns:
+    numpy.ndarray: Stack of 5 x 5 matrices, shape (frames, 5, 5).
+    """
+    return homogeneous_matrix(rotation_frames(planes, frames, turns))
+
+
+# Perspective from a viewpoint on the W axis
+def perspective_matrix(distance=DEFAULT_DISTANCE):
+    """
+    Homogeneous matrix of the perspective projection from (0, 0, 0, distance): after division by the last
+    coordinate, (x, y, z, w) lands on (x, y, z) distance / (distance - w).
+
+    Parameters:
+    distance (float): Distance of the viewpoint from the origin; points must have w < distance.
+
+    Returns:
+    numpy.ndarray: Matrix (5, 5).
+    """
+    matrix = np.eye(5)
+    matrix[3, 4] = -1.0 / distance
+    return matrix
+
+
+# Stereographic projection of the 3-sphere
+def stereographic_matrix(radius=1.0):
+    """
+    Homogeneous matrix of the stereographic projection of the 3-sphere of the given radius from its pole
+    (0, 0, 0, radius) onto the hyperplane w = 0. It is the perspective projection from the pole.
+
+    Returns:
+    numpy.ndarray: Matrix (5, 5).
+    """
+    return perspective_matrix(radius)
+
+
+# 4D -> 3D through a homogeneous matrix
+def project_points(points, matrix, out=None, chunk=PROJECTION_CHUNK):
+    """
+    Transform 4D points by a homogeneous matrix and divide by the homogeneous coordinate, keeping x, y and z.
+
+    Parameters:
+    points (numpy.ndarray): Points, shape (n, 4); float32 avoids a conversion copy.
+    matrix (array-like): Homogeneous matrix (5, 5), such as rotation @ perspective.
+    out (numpy.ndarray, optional): float32 array (n, 3) to fill. Defaults to a new one.
+    chunk (int): Rows processed at a time.
+
+    Returns:
+    numpy.ndarray: The projected points, 'out' if given.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    n = len(points)
+    if out is None:
+        out = np.empty((n, 3), dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    # Only the x, y, z and homogeneous columns of the result are needed
+    columns = matrix[:, [0, 1, 2, 4]]
+    linear, offset = np.ascontiguousarray(columns[:4]), columns[4]
+    scratch = np.empty((min(chunk, n), 4), dtype=np.float32)
+    for lo in range(0, n, chunk):
+        hi = min(lo + chunk, n)
+        block = scratch[:hi - lo]
+        np.matmul(points[lo:hi], linear, out=block)
+        block += offset
+        np.divide(block[:, :3], block[:, 3:], out=out[lo:hi])
+    return out
+
+
+# 3D -> 2D perspective along Z
+def project_to_screen(points, distance=DEFAULT_DISTANCE, out=None, chunk=PROJECTION_CHUNK):
+    """
+    Project 3D points onto the plane z = 0 from the viewpoint (0, 0, distance): (x, y) distance / (distance - z).
+
+    Parameters:
+    points (numpy.ndarray): Points, shape (n, 3) or wider.
+    distance (float): Distance of the viewpoint; points must have z < distance.
+    out (numpy.ndarray, optional): float32 array (n, 2) to fill. Defaults to a new one.
+    chunk (int): Rows processed at a time.
+
+    Returns:
+    numpy.ndarray: The screen coordinates, 'out' if given.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    n = len(points)
+    if out is None:
+        out = np.empty((n, 2), dtype=np.float32)
+    scratch = np.empty((min(chunk, n), 1), dtype=np.float32)
+    for lo in range(0, n, chunk):
+        hi = min(lo + chunk, n)
+        scale = scratch[:hi - lo]
+        np.subtract(distance, points[lo:hi, 2:3], out=scale)
+        np.divide(distance, scale, out=scale)
+        np.multiply(points[lo:hi, :2], scale, out=out[lo:hi])
+    return out
+
+
+# The same points through a stack of matrices, one frame at a time
+def iter_projected_frames(points, matrices, out=None, chunk=PROJECTION_CHUNK):
+    """
+    Project the points through each matrix of a stack in turn, refilling one output array.
+
+    Each yielded array is 'out' itself, overwritten by the next frame, so it can be handed straight to a
+    renderer (EdgeRenderer.update, update_scatter) and must be copied if it is kept.
+
+    Parameters:
+    points (numpy.ndarray): Points, shape (n, 4).
+    matrices (array-like): Homogeneous matrices, shape (frames, 5, 5).
+    out (numpy.ndarray, optional): float32 array (n, 3) to refill. Defaults to a new one.
+    chunk (int): Rows processed at a time.
+
+    Yields:
+    numpy.ndarray: The projected points of each frame.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    if out is None:
+        out = np.empty((len(points), 3), dtype=np.float32)
+    for matrix in matrices:
+        yield project_points(points, matrix, out, chunk)
+
+
+# Points on the Clifford torus
+def clifford_torus(n_u, n_v=None):
+    """
+    Sample the Clifford torus (cos u, sin u, cos v, sin v) / sqrt(2) on the unit 3-sphere on an n_u x n_v grid.
+
+    Parameters:
+    n_u (int): Samples around the first circle.
+    n_v (int, optional): Samples around the second circle. Defaults to n_u.
+
+    Returns:
+    numpy.ndarray: float32 points, shape (n_u * n_v, 4).
+    """
+    n_v = n_u if n_v is None else n_v
+    u = np.linspace(0, 2 * np.pi, n_u, endpoint=False, dtype=np.float32)
+    v = np.linspace(0, 2 * np.pi, n_v, endpoint=False, dtype=np.float32)
+    points = np.empty((n_u, n_v, 4), dtype=np.float32)
+    points[:, :, 0] = np.cos(u)[:, None]
+    points[:, :, 1] = np.sin(u)[:, None]
+    points[:, :, 2] = np.cos(v)
+    points[:, :, 3] = np.sin(v)
+    points *= np.float32(np.sqrt(0.5))
+    return points.reshape(-1, 4)
@@ -0,0 +1,232 @@
+"""
+Headless Batch Renderer for the Visualization Scripts
+
+Every visualization script builds its figures in a make_figures() function and only shows them under its
+__main__ guard, so the figures can be built without a display. This module imports each script in a worker
+process, builds its figures with Matplotlib's Agg backend, and writes them out:
+
+- Matplotlib figures are saved as PNG and SVG.
+- Plotly figures are saved as standalone HTML, and as PNG and SVG through Kaleido when it is installed (it is
+  optional; without it those files are listed as skipped rather than failing the run).
+- Each script runs as a separate task in a process pool, in a fresh worker process, so module-level state and
+  memory of one script never leak into the next, and one failing script does not stop the others.
+- The report records, for every script, the time spent importing it, building its figures and writing each
+  format, the files written, and the error if it failed. Run it as a script:
+
+    python render_all.py --output-dir renders --formats png svg html
+
+The interactive 4d_rotation_animation.py and four_color_theorem_v2.py are not in the batch: the animation has
+its own offline renderer (rotation4d.render_rotation), and the recoloring loop reads from standard input.
+
+Libraries:
+- Matplotlib: For the Agg backend.
+- Plotly: For writing the Plotly figures (Kaleido for their images).
+- concurrent.futures: For rendering the scripts in parallel.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+# Scripts rendered by default, by module name
+SCRIPTS = (
+    '4d_as_color',
+    '4d_hypercube',
+    'coherence_decay_viz',
+    'four_color_theorem',
+    'knots_tangles_and_the_jones_polynomial',
+    'perelmans_solution',
+    'prime_number_distribution',
+    'riemann_distribution_v2',
+    'riemann_prime_distribution',
+    'riemann_zeta_function',
+    'thurston_geometries',
+    'time_slider',
+    'twin_prime_conjecture',
+    'universe_geometry',
+    'vibrational_lorentz_factor',
+)
+
+# Formats written for each kind of figure
+FORMATS = ('png', 'svg', 'html')
+MATPLOTLIB_FORMATS = ('png', 'svg')
+PLOTLY_FORMATS = ('html', 'png', 'svg')
+
+# Resolution of the Matplotlib PNGs
+DEFAULT_DPI = 100
+
+# Options of a pool worker (output directory, formats, dpi), set by _init_worker
+_worker_options = None
+
+
+# Process pool worker setup
+def _init_worker(output_dir, formats, dpi):
+    """
+    Switch the worker to the Agg backend before any script imports pyplot.
+    """
+    global _worker_options
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    _worker_options = output_dir, tuple(formats), dpi
+
+
+# Write one figure in every requested format it supports
+def _save_figure(fig, stem, formats, dpi, stages, artifacts, skipped):
+    import matplotlib.figure
+
+    if isinstance(fig, matplotlib.figure.Figure):
+        for fmt in formats:
+            if fmt not in MATPLOTLIB_FORMATS:
+                continue
+            start = time.perf_counter()
+            fig.savefig(f'{stem}.{fmt}', format=fmt, dpi=dpi)
+            stages[fmt] = stages.get(fmt, 0.0) + time.perf_counter() - start
+            artifacts.append(f'{stem}.{fmt}')
+        return
+
+    # Plotly figures: HTML needs nothing else, images need Kaleido
+    for fmt in formats:
+        if fmt not in PLOTLY_FORMATS:
+            continue
+        start = time.perf_counter()
+        if fmt == 'html':
+            fig.write_html(f'{stem}.html', include_plotlyjs='cdn')
+        else:
+            try:
+                fig.write_image(f'{stem}.{fmt}')
+            except (ImportError, ValueError, RuntimeError) as error:
+                # Plotly reports a missing or broken Kaleido through one of these
+                skipped.append({'file': f'{stem}.{fmt}', 'reason': ' '.join(str(error).split())})
+                continue
+        stages[fmt] = stages.get(fmt, 0.0) + time.perf_counter() - start
+        artifacts.append(f'{stem}.{fmt}')
+
+
+# Release the pyplot figures of a script once they are written
+def _close_figures(figures):
+    import matplotlib.figure
+    import matplotlib.pyplot as plt
+
+    for fig in figures:
+        if isinstance(fig, matplotlib.figure.Figure):
+            plt.close(fig)
+
+
+# Render one script, inside a fresh worker process
+def _render_script(script):
+    """
+    Import a script, build its figures and write them out.
+
+    Parameters:
+    script (str): Module name of the script.
+
+    Returns:
+    dict: 'script', 'status' ('ok' or 'failed'), 'figures', 'stages' (seconds per stage: 'import', 'build' and
+    one per format), 'seconds', 'artifacts', 'skipped' and 'error'.
+    """
+    output_dir, formats, dpi = _worker_options
+    figures = []
+    result = {'script': script, 'status': 'ok', 'figures': 0, 'stages': {}, 'artifacts': [], 'skipped': [],
+              'error': None}
+    stages = result['stages']
+    begin = time.perf_counter()
+    try:
+        start = time.perf_counter()
+        module = importlib.import_module(script)
+        stages['import'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        figures = module.make_figures()
+        stages['build'] = time.perf_counter() - start
+        result['figures'] = len(figures)
+
+        for index, fig in enumerate(figures, start=1):
+            stem = os.path.join(output_dir, f'{script}_{index}')
+            _save_figure(fig, stem, formats, dpi, stages, result['artifacts'], result['skipped'])
+    except Exception:
+        result['status'] = 'failed'
+        result['error'] = traceback.format_exc()
+    finally:
+        # Serial runs share the caller's process, where pyplot would otherwise keep every figure alive
+        _close_figures(figures)
+    result['seconds'] = time.perf_counter() - begin
+    return result
+
+
+# Render every script across a process pool
+def render_all(scripts=SCRIPTS, output_dir='renders', formats=FORMATS, dpi=DEFAULT_DPI, processes=None):
+    """
+    Render the figures of every script to files without a display.
+
+    Parameters:
+    scripts (iterable): Module names of the scripts, from SCRIPTS or any module with a make_figures() function.
+    output_dir (str): Directory for the files; created if needed.
+    formats (iterable): Formats to write, from FORMATS.
+    dpi (int): Resolution of the Matplotlib PNGs.
+    processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+    dict: 'environment' (Python, platform, CPU count, time of the run) and 'runs' (one dict per script, as
+    returned by _render_script, in the order of 'scripts').
+    """
+    scripts = list(scripts)
+    formats = tuple(formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"unsupported formats {', '.join(sorted(unknown))}; expected some of {', '.join(FORMATS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    initargs = (output_dir, formats, dpi)
+    processes = processes or os.cpu_count() or 1
+    if len(scripts) <= 1 or processes == 1:
+        _init_worker(*initargs)
+        runs = [_render_script(script) for script in scripts]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=initargs,
+                                 max_tasks_per_child=1) as executor:
+            runs = list(executor.map(_render_script, scripts))
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'processes': processes,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'runs': runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every visualization script to files without a display.")
+    parser.add_argument('scripts', nargs='*', default=list(SCRIPTS), help="module names (default: all)")
+    parser.add_argument('--output-dir', default='renders')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--report', default=None,
+                        help="where to write the JSON report (default: render_report.json in the output directory)")
+    args = parser.parse_args()
+
+    report = render_all(args.scripts, args.output_dir, args.formats, args.dpi, args.processes)
+    with open(args.report or os.path.join(args.output_dir, 'render_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for run in report['runs']:
+        stages = '  '.join(f"{stage}={seconds:.2f}s" for stage, seconds in run['stages'].items())
+        print(f"{run['script']:<40} {run['status']:<6} {run['seconds']:7.2f} s  figures={run['figures']}  {stages}")
+        for skipped in run['skipped']:
+            print(f"    skipped {skipped['file']}: {skipped['reason']}")
+        if run['error']:
+            print('    ' + run['error'].strip().splitlines()[-1])
+    if any(run['status'] != 'ok' for run in report['runs']):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,46 @@
 import numpy as np
 import plotly.graph_objects as go
-import math
-from sympy import primerange, zeta, I
-from scipy.stats import describe
+
+from explicit_formula import compare_with_primes
+from gap_curves import curved_gap_lines
+from gap_statistics import GapAccumulator
+from prime_table import primes_between
+from zeta_zero_finder import zeta_zero_ordinates
 
 # Generate primes in a given range
 def generate_primes(lower, upper):
     """
-    Generate a list of primes between lower and upper bounds.
+    Look up the primes between lower and upper bounds in the memory-mapped prime table.
     
     Parameters:
     lower (int): Lower bound for prime generation.
     upper (int): Upper bound for prime generation.
 
     Returns:
-    list: List of primes between lower and upper bounds.
+    numpy.ndarray: Array of primes between lower and upper bounds.
     """
-    return list(primerange(lower, upper))
+    return primes_between(lower, upper)
 
 # Function to calculate the non-trivial zeros of the Riemann zeta function
 def zeta_zeros(num_zeros):
     """
     Generate a list of the first non-trivial zeros of the Riemann zeta function.
+
+    The zeros are located by Gram-point bracketing of Z(t), verified with Turing's method and cached on disk
+    (see zeta_zero_finder.py), so only the first run pays for them.
     
     Parameters:
     num_zeros (int): Number of zeta zeros to generate.
 
     Returns:
-    list: Imaginary parts of the first non-trivial zeros of the Riemann zeta function.
-    """
-    zeros = []
-    for n in range(1, num_zeros + 1):
-        zeta_zero = zeta(0.5 + n * I)
-        zeros.append(zeta_zero.imag)
-    return zeros
-
-# Function to create curved paths between consecutive primes
-def create_curved_lines(primes):
-    """
-    Create a set of curved lines connecting consecutive primes to represent the gaps.
-
-    Parameters:
-    primes (list): List of prime numbers.
-
-    Returns:
-    tuple: Arrays of x, y, z coordinates for plotting.
+    numpy.ndarray: Imaginary parts of the first non-trivial zeros of the Riemann zeta function.
     """
-    curve_x = []
-    curve_y = []
-    curve_z = []
-    
-    for i in range(len(primes) - 1):
-        x0, x1 = primes[i], primes[i + 1]
-        mid_x = (x0 + x1) / 2
-        gap = (x1 - x0) / 2
-        curvature = math.log(gap + 1)  # Logarithmic curve to emphasize gaps
-        
-        curve_x.extend([x0, mid_x, x1, None])  # x-coordinates
-        curve_y.extend([0, curvature, 0, None])  # y-coordinates
-        curve_z.extend([0, 0, 0, None])  # z-coordinates (flat for simplicity)
-    
-    return curve_x, curve_y, curve_z
+    return zeta_zero_ordinates(num_zeros)
 
 # Statistical analysis of prime gaps
 def analyze_prime_gaps(primes):
     """
-    Analyze the gaps between consecutive prime numbers.
+    Analyze the gaps between consecutive prime numbers in a single streaming pass.
     
     Parameters:
     primes (list): List of prime numbers.
@@ -73,13 +48,13 @@ def analyze_prime_gaps(primes):
     Returns:
     dict: Descriptive statistics of the prime gaps.
     """
-    prime_gaps = np.diff(primes)
-    stats = describe(prime_gaps)
+    accumulator = GapAccumulator()
+    accumulator.update(primes)
     return {
-        'mean_gap': stats.mean,
-        'variance_gap': stats.variance,
-        'min_gap': stats.minmax[0],
-        'max_gap': stats.minmax[1]
+        'mean_gap': accumulator.mean,
+        'variance_gap': accumulator.variance(ddof=1),
+        'min_gap': accumulator.min_gap,
+        'max_gap': accumulator.max_gap
     }
 
 # Function to visualize primes, prime gaps, and zeta function zeros in 3D
@@ -93,6 +68,9 @@ def plot_prime_solar_system(primes, zeta_zeros, lower_bound, upper_bound):
     zeta_zeros (list): List of non-trivial zeros of the Riemann zeta function.
     lower_bound (int): Lower bound for the plot.
     upper_bound (int): Upper bound for the plot.
+
+    Returns:
+    plotly.graph_objects.Figure: The figure; call its show() method to display it.
     """
     # Coordinates for prime markers (like planets)
     prime_x = primes
@@ -105,7 +83,7 @@ def plot_prime_solar_system(primes, zeta_zeros, lower_bound, upper_bound):
     zeta_z = np.zeros(len(zeta_zeros))
     
     # Create curved lines between consecutive primes
-    curve_x, curve_y, curve_z = create_curved_lines(primes)
+    curve_x, curve_y, curve_z = curved_gap_lines(primes)
 
     # Plot prime points (planets)
     prime_trace = go.Scatter3d(
@@ -160,7 +138,46 @@ def plot_prime_solar_system(primes, zeta_zeros, lower_bound, upper_bound):
                         hovermode='closest'
                     ))
 
-    fig.show()
+    return fig
+
+# Function to compare the prime counting function with its reconstruction from the zeta zeros
+def plot_prime_counting_reconstruction(lower_bound, upper_bound, num_zeros, num_points=20000):
+    """
+    Plot the exact prime counting function pi(x) next to Riemann's R(x) and the explicit formula built from
+    the first 'num_zeros' zeta zeros.
+
+    Parameters:
+    lower_bound (int): Lower bound for the plot.
+    upper_bound (int): Upper bound for the plot.
+    num_zeros (int): Number of zeta zeros in the explicit formula.
+    num_points (int): Number of x values to evaluate.
+
+    Returns:
+    plotly.graph_objects.Figure: The figure; call its show() method to display it.
+    """
+    x = np.linspace(lower_bound, upper_bound, num_points)
+    comparison = compare_with_primes(x, num_zeros)
+
+    fig = go.Figure(data=[
+        go.Scatter(x=x, y=comparison['pi'], mode='lines', name='pi(x) (exact)'),
+        go.Scatter(x=x, y=comparison['R'], mode='lines', name='R(x)'),
+        go.Scatter(x=x, y=comparison['explicit_pi'], mode='lines', name=f'Explicit formula ({num_zeros} zeros)'),
+    ], layout=go.Layout(
+        title=f'Prime Counting Function Rebuilt from Zeta Zeros ({lower_bound} to {upper_bound})',
+        xaxis_title='x',
+        yaxis_title='Number of primes up to x',
+        hovermode='x unified'
+    ))
+    print(f"Largest error of R(x): {comparison['max_error_R']:.2f}")
+    print(f"Largest error of the explicit formula: {comparison['max_error_explicit_pi']:.2f}")
+    return fig
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures(lower_bound=10000, upper_bound=100000):
+    primes = generate_primes(lower_bound, upper_bound)
+    num_zeros = len(primes)
+    return [plot_prime_solar_system(primes, zeta_zeros(num_zeros), lower_bound, upper_bound),
+            plot_prime_counting_reconstruction(lower_bound, upper_bound, num_zeros)]
 
 # Main execution
 if __name__ == "__main__":
@@ -175,7 +192,7 @@ if __name__ == "__main__":
     zeta_zeros_list = zeta_zeros(num_zeros)
 
     # Plot the prime solar system and zeta function zeros
-    plot_prime_solar_system(primes, zeta_zeros_list, lower_bound, upper_bound)
+    plot_prime_solar_system(primes, zeta_zeros_list, lower_bound, upper_bound).show()
 
     # Analyze prime gaps
     stats = analyze_prime_gaps(primes)
@@ -184,3 +201,6 @@ if __name__ == "__main__":
     print(f"Variance of gaps: {stats['variance_gap']}")
     print(f"Minimum gap: {stats['min_gap']}")
     print(f"Maximum gap: {stats['max_gap']}")
+
+    # Connect the zeros back to the primes through the explicit formula
+    plot_prime_counting_reconstruction(lower_bound, upper_bound, num_zeros).show()
@@ -1,85 +1,62 @@
 import numpy as np
 import plotly.graph_objects as go
-import math
-from sympy import primerange, zeta, I
-import scipy.stats as stats
+
+from gap_curves import curved_gap_lines
+from gap_statistics import GapAccumulator
+from prime_table import primes_between
+from trace_decimation import decimate_prime_gaps, gap_endpoints
+from zeta_zero_finder import zeta_zero_ordinates
 
 # Generate primes in a given range
 def generate_primes(lower, upper):
     """
-    Generate a list of primes between lower and upper bounds using the Sieve of Eratosthenes.
+    Look up the primes between lower and upper bounds in the memory-mapped prime table.
     
     Parameters:
     lower (int): Lower bound for prime generation.
     upper (int): Upper bound for prime generation.
 
     Returns:
-    list: List of primes between lower and upper bounds.
+    numpy.ndarray: Array of primes between lower and upper bounds.
     """
-    return list(primerange(lower, upper))
+    return primes_between(lower, upper)
 
 # Calculate non-trivial zeros of the zeta function
 def zeta_zeros(n_zeros):
     """
     Calculate the first 'n_zeros' non-trivial zeros of the Riemann zeta function.
 
+    The zeros are located by Gram-point bracketing of Z(t), verified with Turing's method and cached on disk
+    (see zeta_zero_finder.py), so only the first run pays for them.
+
     Parameters:
     n_zeros (int): Number of zeros to calculate.
 
     Returns:
-    list: List of non-trivial zeros of the zeta function.
-    """
-    zeros = []
-    for n in range(1, n_zeros + 1):
-        # Riemann zeta zeros occur at approximately 1/2 + it (imaginary part)
-        zeros.append((1/2, (n * np.pi)))
-    return zeros
-
-# Function to create a curved line between consecutive primes
-def create_curved_lines(primes):
+    list: List of non-trivial zeros of the zeta function, as (real part, imaginary part) pairs.
     """
-    Create a set of curved lines connecting consecutive primes to represent the gaps.
-
-    Parameters:
-    primes (list): List of prime numbers.
-
-    Returns:
-    tuple: Arrays of x, y, z coordinates for plotting.
-    """
-    curve_x = []
-    curve_y = []
-    curve_z = []
-    
-    # Create curved lines between consecutive primes
-    for i in range(len(primes) - 1):
-        x0, x1 = primes[i], primes[i + 1]
-        mid_x = (x0 + x1) / 2
-        gap = (x1 - x0) / 2
-        curvature = math.log(gap + 1)  # Use a logarithmic function to emphasize gaps
-        
-        curve_x.extend([x0, mid_x, x1, None])  # x-coordinates
-        curve_y.extend([0, curvature, 0, None])  # y-coordinates
-        curve_z.extend([0, 0, 0, None])  # z-coordinates (keep flat)
-    
-    return curve_x, curve_y, curve_z
+    return [(1/2, t) for t in zeta_zero_ordinates(n_zeros).tolist()]
 
 # Statistical analysis of prime gaps
 def prime_gap_stats(primes):
     """
     Perform statistical analysis on the gaps between consecutive prime numbers.
 
+    The gaps are folded into a streaming GapAccumulator instead of being materialized with np.diff.
+
     Parameters:
     primes (list): List of prime numbers.
 
     Returns:
     dict: A dictionary containing mean, median, mode, and standard deviation of the prime gaps.
     """
-    gaps = np.diff(primes)
+    accumulator = GapAccumulator()
+    accumulator.update(primes)
     stats_data = {
-        'mean': np.mean(gaps),
-        'median': np.median(gaps),
-        'mode': stats.mode(gaps)[0][0],
-        'std_dev': np.std(gaps)
+        'mean': accumulator.mean,
+        'median': accumulator.median(),
+        'mode': accumulator.mode(),
+        'std_dev': accumulator.std()
     }
     return stats_data
 
@@ -89,20 +66,29 @@ def plot_prime_and_zeta_distribution(primes, zeta_zeros, lower_bound, upper_boun
     Plot a 3D number line of primes with curved lines to emphasize gaps between primes,
     along with zeta function zeros for comparison.
 
+    Wide ranges are decimated to the primes and gaps visible at screen resolution, always keeping every
+    maximal gap.
+
     Parameters:
     primes (list): List of prime numbers.
     zeta_zeros (list): List of zeros of the Riemann zeta function.
     lower_bound (int): Lower bound for the plot.
     upper_bound (int): Upper bound for the plot.
     gap_stats (dict): Statistical data on the prime gaps.
+
+    Returns:
+    plotly.graph_objects.Figure: The figure; call its show() method to display it.
     """
+    # Keep only the gaps (and the primes at their ends) that are visible at screen resolution
+    gaps = decimate_prime_gaps(primes)
+
     # Coordinates for prime markers (flat on the z-axis)
-    prime_x = primes
-    prime_y = np.zeros(len(primes))
-    prime_z = np.zeros(len(primes))
+    prime_x = np.asarray(primes)[gap_endpoints(gaps, len(primes))]
+    prime_y = np.zeros(len(prime_x))
+    prime_z = np.zeros(len(prime_x))
     
     # Create curved lines between consecutive primes
-    curve_x, curve_y, curve_z = create_curved_lines(primes)
+    curve_x, curve_y, curve_z = curved_gap_lines(primes, gaps=gaps)
 
     # Plot prime points
     prime_trace = go.Scatter3d(
@@ -170,7 +156,7 @@ def plot_prime_and_zeta_distribution(primes, zeta_zeros, lower_bound, upper_boun
                         }]
                     ))
 
-    fig.show()
+    return fig
 
 # Function to allow interactive exploration with a slider
 def explore_prime_and_zeta_distribution(lower_bound, upper_bound, step_size, n_zeros):
@@ -191,7 +177,7 @@ def explore_prime_and_zeta_distribution(lower_bound, upper_bound, step_size, n_z
         # Generate primes for the current range
         primes = generate_primes(start, end)
         
-        if primes:
+        if len(primes) > 0:
             # Perform statistical analysis on the prime gaps
             gap_stats = prime_gap_stats(primes)
             
@@ -199,7 +185,7 @@ def explore_prime_and_zeta_distribution(lower_bound, upper_bound, step_size, n_z
             zeta_zero_vals = zeta_zeros(n_zeros)
             
             # Plot the primes, zeta zeros, and prime gaps for the current range
-            plot_prime_and_zeta_distribution(primes, zeta_zero_vals, start, end, gap_stats)
+            plot_prime_and_zeta_distribution(primes, zeta_zero_vals, start, end, gap_stats).show()
         else:
             print(f"No primes found in the range {start} to {end}")
         
@@ -212,6 +198,12 @@ def explore_prime_and_zeta_distribution(lower_bound, upper_bound, step_size, n_z
             print("Exploration ended.")
             break
 
+# Figures of this script, built without showing them (used by render_all.py): the first range of the exploration
+def make_figures(lower_bound=10000, step_size=10000, n_zeros=10):
+    primes = generate_primes(lower_bound, lower_bound + step_size)
+    return [plot_prime_and_zeta_distribution(primes, zeta_zeros(n_zeros), lower_bound, lower_bound + step_size,
+                                             prime_gap_stats(primes))]
+
 # Main execution
 if __name__ == "__main__":
     # Set initial parameters
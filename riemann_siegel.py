@@ -0,0 +1,250 @@
+"""
+Vectorized Riemann-Siegel Evaluation of Z(t)
+
+On the critical line the zeta function can be written as ζ(1/2 + it) = Z(t) e^(-iθ(t)), where the Riemann-Siegel
+functions θ(t) and Z(t) are real. This module evaluates both for whole NumPy arrays of heights t in float64:
+
+- θ(t) uses its asymptotic expansion for t >= 10 and the exact log-gamma formula below that.
+- Z(t) uses the Riemann-Siegel formula: a main sum of sqrt(t/2π) cosines, evaluated in memory-bounded batches,
+  plus the remainder terms C0..C4 (Gabcke's coefficients), which are polynomials in the fractional part of
+  sqrt(t/2π) built once in high precision.
+
+Each value carries Gabcke's bound on its truncation error. Where the bound exceeds the requested tolerance
+(at small heights, where the asymptotic formula breaks down) the value is recomputed with mpmath.siegelz.
+That keeps the slow path to a handful of points while t in the 10^6 - 10^8 range costs O(sqrt(t)) vectorized
+float64 work per point. At those heights the absolute accuracy is limited by rounding of the phases t log n
+to roughly 1e-16 t log t (about 1e-7 at t = 10^7), which is far below what a plot or a zero search can see.
+
+Libraries:
+- Numpy: For the batched main sum and remainder polynomials.
+- Scipy: For the complex log-gamma behind θ(t) at small heights.
+- Mpmath: For the high-precision remainder coefficients and the accuracy fallback.
+"""
+
+from functools import lru_cache
+
+import mpmath
+import numpy as np
+from scipy.special import loggamma
+
+# Values whose truncation error bound exceeds this are recomputed with mpmath
+DEFAULT_TOLERANCE = 1e-6
+
+# Upper bound on the number of (t, n) terms of the main sum held in memory at once
+MAX_BATCH_TERMS = 1 << 22
+
+# Below this height θ(t) comes from log-gamma instead of the asymptotic expansion
+THETA_ASYMPTOTIC_MIN = 10.0
+
+# Degree of the power series of Ψ(p) behind the remainder coefficients
+PSI_SERIES_DEGREE = 70
+
+
+# The Riemann-Siegel theta function
+def riemann_siegel_theta(t):
+    """
+    Compute θ(t) = arg Γ(1/4 + it/2) - (t/2) log π, continuous in t.
+
+    Parameters:
+    t (float or array-like): Heights on the critical line.
+
+    Returns:
+    numpy.ndarray: θ(t) for each height.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    theta = np.empty_like(t)
+    large = np.abs(t) >= THETA_ASYMPTOTIC_MIN
+
+    # θ(t) = t/2 log(t/2π) - t/2 - π/8 + 1/(48t) + 7/(5760t³) + 31/(80640t⁵) + 127/(430080t⁷) + ...
+    tl = t[large]
+    inv = 1.0 / tl
+    inv2 = inv * inv
+    theta[large] = (tl / 2 * np.log(np.abs(tl) / (2 * np.pi)) - tl / 2 - np.sign(tl) * np.pi / 8
+                    + inv * (1 / 48 + inv2 * (7 / 5760 + inv2 * (31 / 80640 + inv2 * 127 / 430080))))
+
+    ts = t[~large]
+    theta[~large] = loggamma(0.25 + 0.5j * ts).imag - ts / 2 * np.log(np.pi)
+    return theta
+
+
+# Remainder coefficients as polynomials in u = p - 1/2
+@lru_cache(maxsize=1)
+def _remainder_polynomials():
+    """
+    Build Gabcke's remainder coefficients C0..C4 as float64 polynomial coefficients in u = p - 1/2, where p is
+    the fractional part of sqrt(t/2π).
+
+    With u = p - 1/2, Ψ(p) = cos(2π(p² - p - 1/16)) / cos(2πp) = -cos(2πu² - 5π/8) / cos(2πu). Ψ is entire, so
+    its power series is computed exactly by series division in 100-digit arithmetic, and every C_k is a linear
+    combination of its derivatives.
+
+    Returns:
+    list: Five coefficient arrays (lowest degree first) for C0..C4.
+    """
+    degree = PSI_SERIES_DEGREE
+    with mpmath.workdps(100):
+        pi = mpmath.pi
+        c, s = mpmath.cos(5 * pi / 8), mpmath.sin(5 * pi / 8)
+
+        # Numerator -cos(2πu² - 5π/8) = -(cos(5π/8) cos(2πu²) + sin(5π/8) sin(2πu²))
+        numerator = [mpmath.mpf(0)] * (degree + 1)
+        for k in range(0, degree // 2 + 1):
+            term = (2 * pi) ** k / mpmath.factorial(k)
+            sign = (-1) ** (k // 2)
+            numerator[2 * k] = -sign * term * (c if k % 2 == 0 else s)
+
+        # Denominator cos(2πu)
+        denominator = [mpmath.mpf(0)] * (degree + 1)
+        for k in range(0, degree // 2 + 1):
+            denominator[2 * k] = (-1) ** k * (2 * pi) ** (2 * k) / mpmath.factorial(2 * k)
+
+        psi = []
+        for k in range(degree + 1):
+            psi.append((numerator[k] - sum(psi[j] * denominator[k - j] for j in range(k))) / denominator[0])
+
+        def derivative(order):
+            return [psi[k] * mpmath.ff(k, order) for k in range(order, degree + 1)]
+
+        def combine(*terms):
+            coeffs = [mpmath.mpf(0)] * (degree + 1)
+            for weight, order in terms:
+                for k, value in enumerate(derivative(order)):
+                    coeffs[k] += weight * value
+            return np.array([float(v) for v in coeffs])
+
+        pi2, pi4, pi6, pi8 = pi ** 2, pi ** 4, pi ** 6, pi ** 8
+        return [
+            combine((1, 0)),
+            combine((-1 / (96 * pi2), 3)),
+            combine((1 / (64 * pi2), 2), (1 / (18432 * pi4), 6)),
+            combine((-1 / (64 * pi2), 1), (-1 / (3840 * pi4), 5), (-1 / (5308416 * pi6), 9)),
+            combine((1 / (128 * pi2), 0), (19 / (24576 * pi4), 4), (11 / (5898240 * pi6), 8),
+                    (1 / (2038431744 * pi8), 12)),
+        ]
+
+
+# Main sum 2 Σ cos(θ(t) - t log n) / sqrt(n) over n <= N(t), for sorted heights
+def _main_sum(ts, theta, n_terms):
+    """
+    Evaluate the Riemann-Siegel main sum in batches of at most MAX_BATCH_TERMS terms.
+
+    Parameters:
+    ts (numpy.ndarray): Increasing heights.
+    theta (numpy.ndarray): θ(t) at each height.
+    n_terms (numpy.ndarray): Number of terms N(t) = floor(sqrt(t/2π)) at each height.
+
+    Returns:
+    numpy.ndarray: The main sum at each height.
+    """
+    main = np.empty_like(ts)
+    start = 0
+    while start < len(ts):
+        rows = max(MAX_BATCH_TERMS // max(int(n_terms[start]), 1), 1)
+        stop = min(start + rows, len(ts))
+        # Term counts grow along the sorted batch, so shrink it until its widest row fits
+        while stop - start > 1 and (stop - start) * int(n_terms[stop - 1]) > MAX_BATCH_TERMS:
+            stop = start + (stop - start) // 2
+        width = int(n_terms[stop - 1])
+
+        n = np.arange(1, width + 1, dtype=np.float64)
+        phase = theta[start:stop, None] - ts[start:stop, None] * np.log(n)
+        terms = np.cos(phase) / np.sqrt(n)
+        terms[n > n_terms[start:stop, None]] = 0.0
+        main[start:stop] = 2 * terms.sum(axis=1)
+        start = stop
+    return main
+
+
+# Remainder terms C0..C4 of the Riemann-Siegel formula
+def _remainder(t):
+    """
+    Evaluate the Riemann-Siegel remainder (-1)^(N-1) (t/2π)^(-1/4) Σ C_k(p) (t/2π)^(-k/2) for heights t >= 2π.
+
+    Parameters:
+    t (numpy.ndarray): Heights, at least 2π.
+
+    Returns:
+    tuple: The remainder and Gabcke's bound on the error left after the C4 term, at each height.
+    """
+    root = np.sqrt(t / (2 * np.pi))
+    n_terms = np.floor(root)
+    u = root - n_terms - 0.5
+    a = 1.0 / root
+    coefficients = [np.polynomial.polynomial.polyval(u, c) for c in _remainder_polynomials()]
+    series = coefficients[-1]
+    for c in reversed(coefficients[:-1]):
+        series = c + a * series
+    sign = np.where(n_terms % 2 == 1, 1.0, -1.0)
+    return sign / np.sqrt(root) * series, 0.017 * t ** -2.75
+
+
+# Riemann-Siegel formula for Z(t) without any fallback
+def _riemann_siegel_z(t):
+    """
+    Evaluate Z(t) with the Riemann-Siegel formula for heights t >= 2π.
+
+    Parameters:
+    t (numpy.ndarray): Heights, at least 2π.
+
+    Returns:
+    tuple: Z(t) and a bound on the truncation error at each height.
+    """
+    z = np.empty_like(t)
+    error = np.empty_like(t)
+    if t.size == 0:
+        return z, error
+
+    # Sorting groups heights with similar numbers of main-sum terms into the same batch
+    order = np.argsort(t)
+    ts = t[order]
+    n_terms = np.floor(np.sqrt(ts / (2 * np.pi))).astype(np.int64)
+    remainder, bound = _remainder(ts)
+    z[order] = _main_sum(ts, riemann_siegel_theta(ts), n_terms) + remainder
+    error[order] = bound
+    return z, error
+
+
+# Hardy's Z function on arrays of heights
+def siegel_z(t, tol=DEFAULT_TOLERANCE):
+    """
+    Evaluate Hardy's Z function, Z(t) = e^(iθ(t)) ζ(1/2 + it), which is real and satisfies |Z(t)| = |ζ(1/2 + it)|.
+
+    Heights where the Riemann-Siegel error bound exceeds 'tol' (including every t < 2π, where the formula
+    has no main sum) are evaluated with mpmath.siegelz instead.
+
+    Parameters:
+    t (float or array-like): Heights on the critical line.
+    tol (float): Largest acceptable absolute error bound before falling back to mpmath.
+
+    Returns:
+    numpy.ndarray: Z(t) for each height.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    flat = np.abs(t).ravel()  # Z is even
+    z = np.empty_like(flat)
+
+    fast = flat >= 2 * np.pi
+    fast_z, error = _riemann_siegel_z(flat[fast])
+    z[fast] = fast_z
+    retry = np.flatnonzero(fast)[error > tol]
+
+    slow = np.concatenate((np.flatnonzero(~fast), retry))
+    for i in slow.tolist():
+        z[i] = float(mpmath.siegelz(flat[i]))
+    return z.reshape(t.shape)
+
+
+# ζ(1/2 + it) itself
+def zeta_critical_line(t, tol=DEFAULT_TOLERANCE):
+    """
+    Evaluate ζ(1/2 + it) = Z(t) e^(-iθ(t)) for arrays of heights.
+
+    Parameters:
+    t (float or array-like): Heights on the critical line.
+    tol (float): Largest acceptable absolute error bound on Z before falling back to mpmath.
+
+    Returns:
+    numpy.ndarray: Complex values of the zeta function on the critical line.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    return siegel_z(t, tol) * np.exp(-1j * riemann_siegel_theta(t))
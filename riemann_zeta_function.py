@@ -2,6 +2,8 @@ import mpmath
 import numpy as np
 import matplotlib.pyplot as plt
 
+from zeta_multieval import zeta_critical_line_grid
+
 # Define a function to calculate the zeta function
 def zeta_function(s):
     return mpmath.zeta(s)
@@ -10,16 +12,24 @@ def zeta_function(s):
 def is_on_critical_line(zero):
     return np.isclose(zero.real, 0.5)
 
-# Evaluate the zeta function on the critical line
-critical_line_values = []
-for t in np.linspace(0, 50, 1000):  # Imaginary part varies
-    s = 0.5 + 1j * t  # s = 0.5 + it
-    zeta_val = zeta_function(s)
-    critical_line_values.append(zeta_val)
+# Plot |zeta(0.5 + it)| for 0 <= t <= t_max
+def plot_critical_line(t_max=50, num_points=1000):
+    # Evaluate the zeta function on the critical line, s = 0.5 + it, for the whole grid at once
+    t_values = np.linspace(0, t_max, num_points)  # Imaginary part varies
+    critical_line_values = zeta_critical_line_grid(t_values[0], t_values[1] - t_values[0], len(t_values))
+
+    # Visualize the magnitude of the zeta function on the critical line
+    fig, ax = plt.subplots()
+    ax.plot(t_values, np.abs(critical_line_values))
+    ax.set_title("Magnitude of the Riemann Zeta Function on the Critical Line")
+    ax.set_xlabel("Imaginary part t")
+    ax.set_ylabel("|ζ(0.5 + it)|")
+    return fig
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_critical_line()]
 
-# Visualize the magnitude of the zeta function on the critical line
-plt.plot(np.linspace(0, 50, 1000), [abs(val) for val in critical_line_values])
-plt.title("Magnitude of the Riemann Zeta Function on the Critical Line")
-plt.xlabel("Imaginary part t")
-plt.ylabel("|ζ(0.5 + it)|")
-plt.show()
+if __name__ == "__main__":
+    make_figures()
+    plt.show()
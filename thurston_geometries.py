@@ -1,25 +1,18 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from mayavi import mlab
 
 # Function to visualize Euclidean space (a 3D grid)
 def plot_euclidean_space():
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
 
-    # Create a grid in Euclidean space
-    x = np.linspace(-1, 1, 10)
-    y = np.linspace(-1, 1, 10)
-    z = np.linspace(-1, 1, 10)
-
-    for i in x:
-        for j in y:
-            for k in z:
-                ax.scatter(i, j, k, color='b')
+    # Create a grid in Euclidean space, drawn as one scatter plot
+    x, y, z = np.meshgrid(np.linspace(-1, 1, 10), np.linspace(-1, 1, 10), np.linspace(-1, 1, 10), indexing='ij')
+    ax.scatter(x.ravel(), y.ravel(), z.ravel(), color='b')
 
     ax.set_title('Euclidean Space (Flat)')
-    plt.show()
+    return fig
 
 # Function to visualize Spherical Geometry (a sphere in 3D)
 def plot_spherical_geometry():
@@ -33,7 +26,7 @@ def plot_spherical_geometry():
     ax.plot_surface(x, y, z, color='r', alpha=0.6)
 
     ax.set_title('Spherical Geometry')
-    plt.show()
+    return fig
 
 # Function to visualize Hyperbolic Geometry (a hyperbolic paraboloid)
 def plot_hyperbolic_geometry():
@@ -47,14 +40,18 @@ def plot_hyperbolic_geometry():
     ax.plot_surface(x, y, z, color='g', alpha=0.6)
 
     ax.set_title('Hyperbolic Geometry')
-    plt.show()
+    return fig
 
 # Main function to visualize Thurston geometries
 def visualize_thurston_geometries():
     print("Visualizing Euclidean, Spherical, and Hyperbolic geometries...")
-    plot_euclidean_space()
-    plot_spherical_geometry()
-    plot_hyperbolic_geometry()
+    make_figures()
+    plt.show()
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_euclidean_space(), plot_spherical_geometry(), plot_hyperbolic_geometry()]
 
 # Run the visualization
-visualize_thurston_geometries()
+if __name__ == "__main__":
+    visualize_thurston_geometries()
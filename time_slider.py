@@ -17,24 +17,32 @@ frequencies = initial_frequency * np.ones(num_points)  # Uniform initial frequen
 def update_positions(expansion_factor):
     return x * expansion_factor, y * expansion_factor, z * expansion_factor
 
-# Visualization
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-scatter = ax.scatter(x, y, z, c=frequencies, cmap='plasma', marker='o')
-plt.colorbar(scatter, label='Vibrational Frequency (Hz)')
-
-# Slider for Time (Expanding Universe)
-ax_time = plt.axes([0.25, 0.02, 0.65, 0.03])
-time_slider = Slider(ax_time, 'Time', 0.1, 10, valinit=1, valstep=0.1)
-
-# Update function for the slider
-def update(val):
-    expansion_factor = time_slider.val
-    x_new, y_new, z_new = update_positions(expansion_factor)
-    scatter._offsets3d = (x_new, y_new, z_new)
-    fig.canvas.draw_idle()
-
-# Link slider to update function
-time_slider.on_changed(update)
-
-plt.show()
+# Visualization with a time slider; returns the figure and its widgets, which must stay referenced while it is shown
+def plot_expanding_universe():
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    scatter = ax.scatter(x, y, z, c=frequencies, cmap='plasma', marker='o')
+    fig.colorbar(scatter, label='Vibrational Frequency (Hz)')
+
+    # Slider for Time (Expanding Universe)
+    ax_time = fig.add_axes([0.25, 0.02, 0.65, 0.03])
+    time_slider = Slider(ax_time, 'Time', 0.1, 10, valinit=1, valstep=0.1)
+
+    # Update function for the slider
+    def update(val):
+        expansion_factor = time_slider.val
+        x_new, y_new, z_new = update_positions(expansion_factor)
+        scatter._offsets3d = (x_new, y_new, z_new)
+        fig.canvas.draw_idle()
+
+    # Link slider to update function
+    time_slider.on_changed(update)
+    return fig, (time_slider,)
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_expanding_universe()[0]]
+
+if __name__ == "__main__":
+    fig, widgets = plot_expanding_universe()
+    plt.show()
@@ -0,0 +1,186 @@
+"""
+Level-of-Detail Decimation for Prime Traces
+
+Past ~10^5 points, Plotly traces stall the browser and Matplotlib lines stall the event loop, even though a
+screen is only a couple of thousand pixels wide. This module reduces a series to what can actually be seen:
+the x-range is split into one bucket per pixel and each bucket keeps only its first, last, lowest and highest
+point (the M4 scheme), so the decimated line is drawn with the same extremes as the full one.
+
+For prime gaps the highest point of a bucket is its largest gap, and every maximal gap (a gap larger than all
+gaps before it) is always kept, so no visually significant gap can disappear. When the view is zoomed in, the
+visible range is decimated again at full resolution through a Matplotlib 'xlim_changed' callback or a Plotly
+FigureWidget relayout callback.
+
+Libraries:
+- Numpy: For the vectorized per-bucket reductions.
+"""
+
+import numpy as np
+
+# Roughly the width of a plot in pixels; one bucket per pixel
+DEFAULT_BUCKETS = 2000
+
+
+# Record gaps: larger than every gap before them
+def maximal_gap_indices(gaps):
+    """
+    Find the maximal gaps, i.e. the gaps strictly larger than every earlier gap.
+
+    Parameters:
+    gaps (array-like): Gaps between consecutive primes, in order.
+
+    Returns:
+    numpy.ndarray: Indices of the maximal gaps.
+    """
+    gaps = np.asarray(gaps)
+    if len(gaps) == 0:
+        return np.zeros(0, dtype=np.intp)
+    previous = np.concatenate(([gaps[0] - 1], np.maximum.accumulate(gaps)[:-1]))
+    return np.flatnonzero(gaps > previous)
+
+
+# First index of each run of equal buckets reaching the run's extreme value
+def _bucket_extreme(values, runs, starts, reduce):
+    extreme = reduce.reduceat(values, starts)
+    hits = np.flatnonzero(values == extreme[runs])
+    _, first = np.unique(runs[hits], return_index=True)
+    return hits[first]
+
+
+# Per-pixel M4 decimation
+def decimate_indices(x, y, n_buckets=DEFAULT_BUCKETS, x_range=None, keep=None):
+    """
+    Select the points of a series that survive per-pixel decimation.
+
+    Parameters:
+    x (array-like): Increasing x-coordinates.
+    y (array-like): Values at each x.
+    n_buckets (int): Number of pixel buckets across the visible range.
+    x_range (tuple, optional): Visible (x_min, x_max). Defaults to the full data range.
+    keep (array-like, optional): Indices that must be kept whenever they are visible.
+
+    Returns:
+    numpy.ndarray: Sorted indices of the points to draw, including one point on each side of the visible
+    range so lines run off the edge of the plot instead of stopping short.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    if x_range is None:
+        lo, hi = 0, n
+        x_min, x_max = x[0], x[-1]
+    else:
+        x_min, x_max = x_range
+        lo = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+        hi = min(int(np.searchsorted(x, x_max, side='right')) + 1, n)
+    if hi - lo <= 4 * n_buckets:
+        return np.arange(lo, hi)
+
+    xs, ys = x[lo:hi].astype(np.float64), y[lo:hi]
+    width = float(x_max - x_min) or 1.0
+    buckets = np.clip(((xs - x_min) / width * n_buckets).astype(np.int64), -1, n_buckets)
+
+    # x is sorted, so each bucket is one contiguous run
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(xs)) - 1
+    runs = np.repeat(np.arange(len(starts)), ends - starts + 1)
+
+    selected = [starts, ends,
+                _bucket_extreme(ys, runs, starts, np.minimum),
+                _bucket_extreme(ys, runs, starts, np.maximum)]
+    if keep is not None:
+        keep = np.asarray(keep, dtype=np.intp)
+        selected.append(keep[(keep >= lo) & (keep < hi)] - lo)
+    return lo + np.unique(np.concatenate(selected))
+
+
+# Decimation of the gaps between consecutive primes
+def decimate_prime_gaps(primes, n_buckets=DEFAULT_BUCKETS, x_range=None):
+    """
+    Select the gaps between consecutive primes worth drawing at the current zoom level.
+
+    Every bucket keeps its first, last, smallest and largest gap, and every maximal gap is kept.
+
+    Parameters:
+    primes (array-like): Increasing prime numbers.
+    n_buckets (int): Number of pixel buckets across the visible range.
+    x_range (tuple, optional): Visible (x_min, x_max). Defaults to the full data range.
+
+    Returns:
+    numpy.ndarray: Indices i of the gaps (primes[i], primes[i + 1]) to draw.
+    """
+    primes = np.asarray(primes)
+    gaps = np.diff(primes)
+    return decimate_indices(primes[:-1], gaps, n_buckets, x_range, keep=maximal_gap_indices(gaps))
+
+
+# Endpoints of a set of gaps
+def gap_endpoints(gaps, prime_count):
+    """
+    Indices of the primes at either end of the given gaps.
+
+    Parameters:
+    gaps (array-like): Indices i of the gaps (primes[i], primes[i + 1]).
+    prime_count (int): Number of primes the gaps were taken from; a lone prime has no gaps but is still shown.
+
+    Returns:
+    numpy.ndarray: Sorted, unique prime indices.
+    """
+    if prime_count < 2:
+        return np.arange(prime_count)
+    gaps = np.asarray(gaps, dtype=np.intp)
+    return np.union1d(gaps, gaps + 1)
+
+
+# Zoom refinement for Matplotlib lines
+def attach_matplotlib_refinement(ax, line, x, y, n_buckets=DEFAULT_BUCKETS, keep=None):
+    """
+    Draw a decimated series on a Matplotlib line and re-decimate the visible range whenever the x-limits change.
+
+    Parameters:
+    ax (matplotlib.axes.Axes): Axes holding the line.
+    line (matplotlib.lines.Line2D): Line to update.
+    x (array-like): Full increasing x-coordinates.
+    y (array-like): Full values at each x.
+    n_buckets (int): Number of pixel buckets across the visible range.
+    keep (array-like, optional): Indices that must be kept whenever they are visible.
+
+    Returns:
+    int: The callback id, for ax.callbacks.disconnect.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    def refine(axes):
+        idx = decimate_indices(x, y, n_buckets, axes.get_xlim(), keep)
+        line.set_data(x[idx], y[idx])
+        axes.figure.canvas.draw_idle()
+
+    idx = decimate_indices(x, y, n_buckets, keep=keep)
+    line.set_data(x[idx], y[idx])
+    return ax.callbacks.connect('xlim_changed', refine)
+
+
+# Zoom refinement for Plotly figure widgets
+def attach_plotly_refinement(figure, refine, axis='xaxis'):
+    """
+    Call refine(x_range) inside a batch update whenever the x-axis range of a Plotly FigureWidget changes.
+
+    Plain go.Figure objects are static once shown, so only FigureWidget (which needs the optional
+    'anywidget' package) can receive relayout events. For 3D plots pass axis='scene.xaxis'; camera zoom does
+    not change the data range, so refinement follows explicit range changes only.
+
+    Parameters:
+    figure (plotly.graph_objects.FigureWidget): Figure to watch.
+    refine (callable): Receives the new (x_min, x_max) and updates the figure's traces.
+    axis (str): Layout path of the x-axis to watch.
+    """
+    def on_range(layout, x_range):
+        if x_range is not None:
+            with figure.batch_update():
+                refine(tuple(x_range))
+
+    figure.layout.on_change(on_range, f'{axis}.range')
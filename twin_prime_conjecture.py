@@ -6,7 +6,8 @@ The gaps between consecutive primes are illustrated using lines connecting them.
 and explore the distribution of prime numbers and their gaps, emphasizing that bounded gaps exist 
 between consecutive primes, even as the numbers grow.
 
-Prime numbers are calculated using the Sieve of Eratosthenes, and the gaps between consecutive primes are highlighted.
+Prime numbers are calculated using the segmented Sieve of Eratosthenes in prime_sieve.py and read back from the
+memory-mapped prime table in prime_table.py, and the gaps between consecutive primes are highlighted.
 
 Libraries:
 - Plotly: For 3D interactive plotting.
@@ -21,45 +22,56 @@ Features:
 import numpy as np
 import plotly.graph_objects as go
 
-# Prime number generator using the Sieve of Eratosthenes
+from gap_curves import straight_gap_lines
+from prime_table import primes_between
+from trace_decimation import attach_plotly_refinement, decimate_prime_gaps, gap_endpoints
+
+# Prime number lookup in the persistent prime table
 def generate_primes(limit):
     """
-    Generates prime numbers up to a given limit using the Sieve of Eratosthenes.
+    Returns the prime numbers up to a given limit from the memory-mapped prime table.
 
     Parameters:
     limit (int): The upper limit for prime generation.
 
     Returns:
-    list: A list of prime numbers less than or equal to the limit.
+    numpy.ndarray: An array of prime numbers less than or equal to the limit.
     """
-    sieve = np.ones(limit + 1, dtype=bool)
-    sieve[:2] = False
-    for i in range(2, int(np.sqrt(limit)) + 1):
-        if sieve[i]:
-            sieve[i*i:limit+1:i] = False
-    return np.nonzero(sieve)[0]
+    return primes_between(2, limit + 1)
 
 # Function to generate 3D plot for prime numbers and their gaps
-def plot_prime_gaps(primes):
+def plot_prime_gaps(primes, interactive=False):
     """
     Creates a 3D interactive plot showing prime numbers on a number line with lines connecting consecutive primes 
     to represent the gaps.
 
+    Large inputs are decimated to the primes and gaps visible at screen resolution, always keeping every
+    maximal gap (see trace_decimation.py).
+
     Parameters:
     primes (list): A list of prime numbers to visualize.
+    interactive (bool): Return a FigureWidget that re-decimates the visible range whenever the x-axis range
+                        changes, instead of a static figure.
+
+    Returns:
+    plotly.graph_objects.Figure: The figure; call its show() method to display it.
     """
     # Scale the primes for better visualization
     primes_scaled = np.array(primes) * 0.1
 
+    # Keep only the gaps (and the primes at their ends) that are visible at screen resolution
+    gaps = decimate_prime_gaps(primes_scaled)
+    shown = primes_scaled[gap_endpoints(gaps, len(primes_scaled))]
+
     # 3D scatter plot of primes
     prime_trace = go.Scatter3d(
-        x=primes_scaled,  # Prime numbers on the x-axis
-        y=np.zeros_like(primes_scaled),  # Keep y and z fixed to create a number line effect
-        z=np.zeros_like(primes_scaled),
+        x=shown,  # Prime numbers on the x-axis
+        y=np.zeros_like(shown),  # Keep y and z fixed to create a number line effect
+        z=np.zeros_like(shown),
         mode='markers',
         marker=dict(
             size=5,
-            color=primes_scaled,  # Color according to prime position
+            color=shown,  # Color according to prime position
             colorscale='Viridis',
             opacity=0.8
         ),
@@ -67,14 +79,7 @@ def plot_prime_gaps(primes):
     )
 
     # Lines between consecutive primes to show gaps
-    lines_x = []
-    lines_y = []
-    lines_z = []
-    
-    for i in range(len(primes_scaled) - 1):
-        lines_x += [primes_scaled[i], primes_scaled[i + 1], None]
-        lines_y += [0, 0, None]
-        lines_z += [0, 0, None]
+    lines_x, lines_y, lines_z = straight_gap_lines(primes_scaled, gaps)
 
     gap_trace = go.Scatter3d(
         x=lines_x,  # Lines along the x-axis (between consecutive primes)
@@ -104,8 +109,24 @@ def plot_prime_gaps(primes):
         showlegend=True
     )
 
-    # Show the interactive plot
-    fig.show()
+    if interactive:
+        fig = go.FigureWidget(fig)
+
+        # Re-decimate the visible part of the number line at full resolution
+        def refine(x_range):
+            gaps = decimate_prime_gaps(primes_scaled, x_range=x_range)
+            shown = primes_scaled[gap_endpoints(gaps, len(primes_scaled))]
+            fig.data[0].update(x=shown, y=np.zeros_like(shown), z=np.zeros_like(shown), marker_color=shown)
+            fig.data[1].update(dict(zip('xyz', straight_gap_lines(primes_scaled, gaps))))
+
+        attach_plotly_refinement(fig, refine, axis='scene.xaxis')
+        return fig
+
+    return fig
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures(upper_limit=1000):
+    return [plot_prime_gaps(generate_primes(upper_limit))]
 
 # Main execution
 if __name__ == "__main__":
@@ -116,4 +137,4 @@ if __name__ == "__main__":
     primes = generate_primes(upper_limit)
 
     # Plot the primes and their gaps in 3D
-    plot_prime_gaps(primes)
+    plot_prime_gaps(primes).show()
@@ -49,49 +49,58 @@ initial_omega_m = 0.3
 initial_omega_dm = 0.25
 initial_omega_k = 0.05
 
-# Simulate the initial expansion
-scale_factor = universe_expansion(time, initial_omega_m, initial_omega_dm, initial_omega_k)
-
-# Create a 3D plot to visualize the expansion of the universe's geometry over time
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-plot, = ax.plot(time, scale_factor, time * 0, label="Universe Expansion")
-
-# Labels and titles
-ax.set_title("Universe Geometry Evolution - Post Big Bang")
-ax.set_xlabel('Time (normalized)')
-ax.set_ylabel('Scale Factor (a(t))')
-ax.set_zlabel('Expansion Geometry')
-
-# Create sliders to manipulate the parameters (Ω_m, Ω_dm, Ω_k)
-axcolor = 'lightgoldenrodyellow'
-ax_omega_m = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor=axcolor)
-ax_omega_dm = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor=axcolor)
-ax_omega_k = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor=axcolor)
-
-# Slider initialization
-omega_m_slider = Slider(ax_omega_m, 'Omega_m (Energy)', 0.0, 1.0, valinit=initial_omega_m)
-omega_dm_slider = Slider(ax_omega_dm, 'Omega_dm (Dark Matter)', 0.0, 1.0, valinit=initial_omega_dm)
-omega_k_slider = Slider(ax_omega_k, 'Omega_k (Curvature)', -1.0, 1.0, valinit=initial_omega_k)
-
-# Update function for the sliders
-def update(val):
-    omega_m_val = omega_m_slider.val
-    omega_dm_val = omega_dm_slider.val
-    omega_k_val = omega_k_slider.val
-    
-    # Recompute the scale factor based on the updated parameters
-    new_scale_factor = universe_expansion(time, omega_m_val, omega_dm_val, omega_k_val)
-    
-    # Update the plot with the new scale factor
-    plot.set_ydata(new_scale_factor)
-    plot.set_3d_properties(time * 0)  # Z-axis stays 0 to represent flat expansion plane
-    fig.canvas.draw_idle()
-
-# Connect the sliders to the update function
-omega_m_slider.on_changed(update)
-omega_dm_slider.on_changed(update)
-omega_k_slider.on_changed(update)
+# Interactive plot of the expansion; returns the figure and its sliders, which must stay referenced while it is shown
+def plot_universe_expansion():
+    # Simulate the initial expansion
+    scale_factor = universe_expansion(time, initial_omega_m, initial_omega_dm, initial_omega_k)
+
+    # Create a 3D plot to visualize the expansion of the universe's geometry over time
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    plot, = ax.plot(time, scale_factor, time * 0, label="Universe Expansion")
+
+    # Labels and titles
+    ax.set_title("Universe Geometry Evolution - Post Big Bang")
+    ax.set_xlabel('Time (normalized)')
+    ax.set_ylabel('Scale Factor (a(t))')
+    ax.set_zlabel('Expansion Geometry')
+
+    # Create sliders to manipulate the parameters (Ω_m, Ω_dm, Ω_k)
+    axcolor = 'lightgoldenrodyellow'
+    ax_omega_m = fig.add_axes([0.25, 0.15, 0.65, 0.03], facecolor=axcolor)
+    ax_omega_dm = fig.add_axes([0.25, 0.10, 0.65, 0.03], facecolor=axcolor)
+    ax_omega_k = fig.add_axes([0.25, 0.05, 0.65, 0.03], facecolor=axcolor)
+
+    # Slider initialization
+    omega_m_slider = Slider(ax_omega_m, 'Omega_m (Energy)', 0.0, 1.0, valinit=initial_omega_m)
+    omega_dm_slider = Slider(ax_omega_dm, 'Omega_dm (Dark Matter)', 0.0, 1.0, valinit=initial_omega_dm)
+    omega_k_slider = Slider(ax_omega_k, 'Omega_k (Curvature)', -1.0, 1.0, valinit=initial_omega_k)
+
+    # Update function for the sliders
+    def update(val):
+        omega_m_val = omega_m_slider.val
+        omega_dm_val = omega_dm_slider.val
+        omega_k_val = omega_k_slider.val
+        
+        # Recompute the scale factor based on the updated parameters
+        new_scale_factor = universe_expansion(time, omega_m_val, omega_dm_val, omega_k_val)
+        
+        # Update the plot with the new scale factor
+        plot.set_ydata(new_scale_factor)
+        plot.set_3d_properties(time * 0)  # Z-axis stays 0 to represent flat expansion plane
+        fig.canvas.draw_idle()
+
+    # Connect the sliders to the update function
+    omega_m_slider.on_changed(update)
+    omega_dm_slider.on_changed(update)
+    omega_k_slider.on_changed(update)
+    return fig, (omega_m_slider, omega_dm_slider, omega_k_slider)
+
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_universe_expansion()[0]]
 
 # Display the plot
-plt.show()
+if __name__ == "__main__":
+    fig, widgets = plot_universe_expansion()
+    plt.show()
@@ -49,23 +49,31 @@ df['vibrational_slowdown_velocity'] = df['velocity'].apply(
 # Step 3: Visualization in 4D (Projected in 3D)
 # We will now visualize the spatial dimensions (X, Y, Z) and use the vibrational slowdown due to gravity as the color dimension to represent the "fourth dimension."
 # Create a 3D scatter plot where color represents vibrational slowdown
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
+def plot_vibrational_slowdown():
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
 
-# Extract data for 3D plotting
-x = df['x']
-y = df['y']
-z = df['z']
-colors = df['vibrational_slowdown_gravity']  # Color representing vibrational slowdown
+    # Extract data for 3D plotting
+    x = df['x']
+    y = df['y']
+    z = df['z']
+    colors = df['vibrational_slowdown_gravity']  # Color representing vibrational slowdown
 
-# Scatter plot in 3D with color scale
-scatter = ax.scatter(x, y, z, c=colors, cmap='viridis', marker='o')
-plt.colorbar(scatter, label='Vibrational Slowdown (Hz)')
+    # Scatter plot in 3D with color scale
+    scatter = ax.scatter(x, y, z, c=colors, cmap='viridis', marker='o')
+    fig.colorbar(scatter, label='Vibrational Slowdown (Hz)')
 
-# Labels and title
-ax.set_xlabel('X Position (m)')
-ax.set_ylabel('Y Position (m)')
-ax.set_zlabel('Z Position (m)')
-plt.title("Vibrational Slowdown in 4D Space (Projected in 3D)")
+    # Labels and title
+    ax.set_xlabel('X Position (m)')
+    ax.set_ylabel('Y Position (m)')
+    ax.set_zlabel('Z Position (m)')
+    ax.set_title("Vibrational Slowdown in 4D Space (Projected in 3D)")
+    return fig
 
-plt.show()
+# Figures of this script, built without showing them (used by render_all.py)
+def make_figures():
+    return [plot_vibrational_slowdown()]
+
+if __name__ == "__main__":
+    make_figures()
+    plt.show()
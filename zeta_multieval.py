@@ -0,0 +1,332 @@
+"""
+Batch Evaluation of Z(t) in the Style of Odlyzko and Schönhage
+
+The Riemann-Siegel main sum F(t) = Σ_{n<=N} n^(-1/2) e^(-it log n) costs O(N) = O(sqrt(t)) per height, which
+adds up quickly when the critical line is sampled densely far from the origin. This module shares that work
+between many heights:
+
+- On an equally spaced grid t_j = t_0 + jδ, F(t_j) is a non-uniform discrete Fourier transform with frequencies
+  δ log n. Each frequency is rounded to the nearest FFT bin and the rounding error is expanded in a short Taylor
+  series, so all grid values come from a handful of FFTs: O(N + M log M) work for M grid points instead of
+  O(NM).
+- F is band-limited (its frequencies lie in [-log N, 0]), so at arbitrary heights it is interpolated from an
+  oversampled grid with a Gaussian-windowed sinc kernel, at a cost independent of t.
+
+Terms whose index n exceeds the N of the start of a block (N grows slowly with t) are added directly, and the
+remainder terms, error bounds and mpmath fallback are shared with riemann_siegel.py. Whenever a block is too
+small for the FFT to pay off, the plain Riemann-Siegel evaluation is used instead.
+
+Libraries:
+- Numpy: For the FFTs, bin sums and interpolation kernels.
+"""
+
+import math
+
+import numpy as np
+
+from riemann_siegel import (DEFAULT_TOLERANCE, MAX_BATCH_TERMS, _remainder, riemann_siegel_theta, siegel_z)
+
+# Taylor terms of the off-grid frequency correction; the expansion argument never exceeds π/4
+TAYLOR_TERMS = 16
+
+# Grid spacing of the interpolation grid is 1/INTERPOLATION_OVERSAMPLING of the Nyquist spacing of F
+INTERPOLATION_OVERSAMPLING = 2
+
+# Grid points on each side of a height that enter its interpolation
+INTERPOLATION_HALF_WIDTH = 32
+
+# Blocks with fewer main-sum terms than this are always evaluated directly
+MIN_FAST_TERMS = 64
+
+# A block ends before N(t) grows by more than this, so its extra terms stay cheap
+MAX_EXTRA_TERMS = 32
+
+# Largest grid transformed at once
+MAX_GRID_BLOCK = 1 << 20
+
+
+# Number of main-sum terms at each height
+def _term_count(t):
+    return np.floor(np.sqrt(np.asarray(t) / (2 * np.pi))).astype(np.int64)
+
+
+# Exponential sum on an equally spaced grid through FFTs
+def _nonuniform_dft(frequencies, weights, t_start, step, count):
+    """
+    Evaluate Σ_k w_k e^(-itω_k) at t_start + j * step for j < count.
+
+    Each frequency is rounded to the nearest bin of an FFT at least four times as long as the grid is wide
+    either side of its center, so the leftover phase is at most π/4 and a short Taylor series corrects it.
+
+    Parameters:
+    frequencies (numpy.ndarray): Frequencies ω_k.
+    weights (numpy.ndarray): Weights w_k, or a 2D array with one column of weights per sum.
+    t_start (float): First point of the grid.
+    step (float): Grid spacing.
+    count (int): Number of grid points.
+
+    Returns:
+    numpy.ndarray: Complex sums on the grid, with one column per column of weights.
+    """
+    # Working from the middle of the grid halves the largest Taylor argument
+    center = count // 2
+    half = max(center, count - 1 - center, 1)
+    size = 1 << math.ceil(math.log2(4 * half))
+
+    # Round each frequency to an FFT bin, keeping the remainder for the Taylor correction
+    omega = step * frequencies
+    bins = np.rint(omega * size / (2 * np.pi))
+    offset = (omega - 2 * np.pi * bins / size) * half
+    bins = bins.astype(np.int64) % size
+    phase = np.exp(-1j * (t_start + center * step) * frequencies)
+    weights = (phase * weights.T).T
+
+    j = np.arange(count) - center
+    rows = j % size
+    factor = -1j * j / half
+    power = np.ones(count, dtype=np.complex128)
+    values = np.zeros((count,) + weights.shape[1:], dtype=np.complex128)
+    for p in range(TAYLOR_TERMS):
+        for column in np.ndindex(weights.shape[1:]):
+            w = weights[(slice(None),) + column]
+            binned = np.bincount(bins, w.real, minlength=size) + 1j * np.bincount(bins, w.imag, minlength=size)
+            values[(slice(None),) + column] += power * np.fft.fft(binned)[rows]
+        weights = (offset * weights.T).T
+        power = power * factor / (p + 1)
+    return values
+
+
+# Main sum on an equally spaced grid
+def _grid_main_sum(t_start, step, count, n_terms):
+    """
+    Evaluate F(t) = Σ_{n<=n_terms} n^(-1/2) e^(-it log n) at t_start + j * step for j < count.
+    """
+    n = np.arange(1, n_terms + 1, dtype=np.float64)
+    return _nonuniform_dft(np.log(n), 1 / np.sqrt(n), t_start, step, count)
+
+
+# Terms n_terms < n <= N(t) that a block's shared sum leaves out
+def _extra_terms(t, n_terms):
+    extra = np.zeros(len(t), dtype=np.complex128)
+    needed = _term_count(t)
+    for n in range(n_terms + 1, int(needed.max(initial=n_terms)) + 1):
+        rows = needed >= n
+        extra[rows] += np.exp(-1j * t[rows] * math.log(n)) / math.sqrt(n)
+    return extra
+
+
+# Z(t) from the main sum F(t), with remainder and mpmath fallback
+def _assemble_z(t, main, tol):
+    z = 2 * (np.exp(1j * riemann_siegel_theta(t)) * main).real
+    remainder, error = _remainder(t)
+    z += remainder
+    retry = np.flatnonzero(error > tol)
+    if len(retry):
+        z[retry] = siegel_z(t[retry], tol)
+    return z
+
+
+# Whether a grid transform, plus 'per_point' work at each height, beats summing n_terms terms per height
+def _fft_pays_off(points, grid_size, n_terms, per_point=0):
+    grid_cost = TAYLOR_TERMS * (n_terms + 2 * grid_size * math.log2(4 * grid_size))
+    return n_terms >= MIN_FAST_TERMS and grid_cost + points * per_point < points * n_terms
+
+
+# Z(t) on an equally spaced grid
+def siegel_z_grid(t_start, step, count, tol=DEFAULT_TOLERANCE):
+    """
+    Evaluate Hardy's Z function on the grid t_start + j * step, j = 0, ..., count - 1.
+
+    Parameters:
+    t_start (float): First height of the grid.
+    step (float): Positive grid spacing.
+    count (int): Number of grid points.
+    tol (float): Largest acceptable absolute error bound before falling back to mpmath.
+
+    Returns:
+    numpy.ndarray: Z(t) at each grid point.
+    """
+    if step <= 0:
+        raise ValueError("grid spacing must be positive")
+    t = t_start + step * np.arange(count, dtype=np.float64)
+    z = np.empty(count)
+
+    start = int(np.searchsorted(t, 2 * np.pi * MIN_FAST_TERMS ** 2))
+    z[:start] = siegel_z(t[:start], tol)
+    while start < count:
+        n_terms = int(_term_count(t[start]))
+        stop = int(np.searchsorted(t, 2 * np.pi * (n_terms + MAX_EXTRA_TERMS + 1) ** 2))
+        stop = max(min(stop, start + MAX_GRID_BLOCK, count), start + 1)
+        ts = t[start:stop]
+        if _fft_pays_off(stop - start, stop - start, n_terms):
+            main = _grid_main_sum(ts[0], step, stop - start, n_terms) + _extra_terms(ts, n_terms)
+            z[start:stop] = _assemble_z(ts, main, tol)
+        else:
+            z[start:stop] = siegel_z(ts, tol)
+        start = stop
+    return z
+
+
+# ζ(1/2 + it) on an equally spaced grid
+def zeta_critical_line_grid(t_start, step, count, tol=DEFAULT_TOLERANCE):
+    """
+    Evaluate ζ(1/2 + it) = Z(t) e^(-iθ(t)) on the grid t_start + j * step, j = 0, ..., count - 1.
+
+    Parameters:
+    t_start (float): First height of the grid.
+    step (float): Positive grid spacing.
+    count (int): Number of grid points.
+    tol (float): Largest acceptable absolute error bound on Z before falling back to mpmath.
+
+    Returns:
+    numpy.ndarray: Complex values of the zeta function on the grid.
+    """
+    t = t_start + step * np.arange(count, dtype=np.float64)
+    return siegel_z_grid(t_start, step, count, tol) * np.exp(-1j * riemann_siegel_theta(t))
+
+
+# Grid spacing that samples a sum with the given frequencies INTERPOLATION_OVERSAMPLING times too densely
+def _interpolation_step(frequencies):
+    tau = max(0.5 * (frequencies.max() - frequencies.min()), 1.0)
+    return np.pi / (INTERPOLATION_OVERSAMPLING * tau)
+
+
+# Exponential sum at sorted points, interpolated from an oversampled grid
+def _interpolated_sum(ts, frequencies, weights):
+    """
+    Interpolate S(t) = Σ_k w_k e^(-itω_k) at increasing points from values on an equally spaced grid.
+
+    Shifted by e^(ict), with c the middle of the frequency range, S has frequencies in [-τ, τ]. Sampled at
+    δ = π / (ρτ), with ρ the oversampling factor, it is recovered by
+    f(t) = Σ_j f(t_j) sinc((t - t_j) / δ) exp(-(t - t_j)² / 2σ²), where the Gaussian's width balances its
+    spectral leakage against the kernel truncation.
+
+    Parameters:
+    ts (numpy.ndarray): Increasing points.
+    frequencies (numpy.ndarray): Frequencies ω_k.
+    weights (numpy.ndarray): Weights w_k, or a 2D array with one column of weights per sum.
+
+    Returns:
+    numpy.ndarray: Complex values of S at each point, with one column per column of weights.
+    """
+    half_width = INTERPOLATION_HALF_WIDTH
+    center = 0.5 * (frequencies.max() + frequencies.min())
+    delta = _interpolation_step(frequencies)
+    tau = np.pi / (INTERPOLATION_OVERSAMPLING * delta)
+    sigma2 = half_width * delta / (np.pi / delta - tau)
+
+    grid_start = ts[0] - half_width * delta
+    count = int(math.ceil((ts[-1] - ts[0]) / delta)) + 2 * half_width + 1
+    # Phases are taken relative to the grid start to keep them small
+    shift = np.exp(1j * center * delta * np.arange(count))
+    grid = (_nonuniform_dft(frequencies, weights, grid_start, delta, count).T * shift).T
+
+    values = np.empty((len(ts),) + grid.shape[1:], dtype=np.complex128)
+    taps = np.arange(2 * half_width)
+    rows = max(MAX_BATCH_TERMS // len(taps), 1)
+    for lo in range(0, len(ts), rows):
+        position = (ts[lo:lo + rows] - grid_start) / delta
+        index = np.floor(position).astype(np.int64)[:, None] - half_width + 1 + taps
+        u = position[:, None] - index
+        kernel = np.sinc(u) * np.exp(-(u * delta) ** 2 / (2 * sigma2))
+        unshift = np.exp(-1j * center * position * delta)
+        values[lo:lo + rows] = (np.einsum('ij,ij...->i...', kernel, grid[index]).T * unshift).T
+    return values
+
+
+# Exponential sum summed term by term, in memory-bounded tiles
+def _direct_sum(ts, frequencies, weights):
+    values = np.zeros((len(ts),) + weights.shape[1:], dtype=np.complex128)
+    step = max(MAX_BATCH_TERMS // max(len(ts), 1), 1)
+    for lo in range(0, len(frequencies), step):
+        phases = np.exp(-1j * np.multiply.outer(ts, frequencies[lo:lo + step]))
+        values += phases @ weights[lo:lo + step]
+    return values
+
+
+# Exponential sums at arbitrary points
+def exponential_sum(t, frequencies, weights):
+    """
+    Evaluate S(t) = Σ_k w_k e^(-itω_k) at many points, through grid evaluation and band-limited interpolation
+    wherever that is cheaper than summing every term at every point.
+
+    This is the engine behind siegel_z_batch, and serves any other sum over fixed frequencies, such as the
+    sums over zeta zeros in the explicit formulas.
+
+    Parameters:
+    t (array-like): Points at which to evaluate, 1D.
+    frequencies (array-like): Frequencies ω_k.
+    weights (array-like): Weights w_k, or a 2D array with one column of weights per sum.
+
+    Returns:
+    numpy.ndarray: Complex sums at each point, with one column per column of weights.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    weights = np.asarray(weights)
+    order = np.argsort(t)
+    ts = t[order]
+    values = np.empty((len(ts),) + weights.shape[1:], dtype=np.complex128)
+    if len(frequencies) == 0:
+        values[:] = 0
+        return values
+
+    delta = _interpolation_step(frequencies)
+    span = (MAX_GRID_BLOCK - 2 * INTERPOLATION_HALF_WIDTH - 2) * delta
+    start = 0
+    while start < len(ts):
+        stop = max(int(np.searchsorted(ts, ts[start] + span)), start + 1)
+        block = ts[start:stop]
+        grid_size = int((block[-1] - block[0]) / delta) + 2 * INTERPOLATION_HALF_WIDTH + 1
+        if _fft_pays_off(len(block), grid_size, len(frequencies), 2 * INTERPOLATION_HALF_WIDTH):
+            values[start:stop] = _interpolated_sum(block, frequencies, weights)
+        else:
+            values[start:stop] = _direct_sum(block, frequencies, weights)
+        start = stop
+
+    result = np.empty_like(values)
+    result[order] = values
+    return result
+
+
+# Z(t) at arbitrary heights
+def siegel_z_batch(t, tol=DEFAULT_TOLERANCE):
+    """
+    Evaluate Hardy's Z function at many arbitrary heights, sharing the main sum between nearby heights through
+    grid evaluation and band-limited interpolation wherever that is cheaper than summing directly.
+
+    Parameters:
+    t (float or array-like): Heights on the critical line.
+    tol (float): Largest acceptable absolute error bound before falling back to mpmath.
+
+    Returns:
+    numpy.ndarray: Z(t) for each height, same shape as t.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    flat = np.abs(t).ravel()  # Z is even
+    order = np.argsort(flat)
+    ts = flat[order]
+    z = np.empty_like(ts)
+
+    start = int(np.searchsorted(ts, 2 * np.pi * MIN_FAST_TERMS ** 2))
+    z[:start] = siegel_z(ts[:start], tol)
+    while start < len(ts):
+        n_terms = int(_term_count(ts[start]))
+        n = np.arange(1, n_terms + 1, dtype=np.float64)
+        delta = _interpolation_step(np.log(n))
+        limit = min(2 * np.pi * (n_terms + MAX_EXTRA_TERMS + 1) ** 2,
+                    ts[start] + (MAX_GRID_BLOCK - 2 * INTERPOLATION_HALF_WIDTH - 2) * delta)
+        stop = max(int(np.searchsorted(ts, limit)), start + 1)
+        block = ts[start:stop]
+
+        grid_size = int((block[-1] - block[0]) / delta) + 2 * INTERPOLATION_HALF_WIDTH + 1
+        if _fft_pays_off(len(block), grid_size, n_terms, 2 * INTERPOLATION_HALF_WIDTH):
+            main = _interpolated_sum(block, np.log(n), 1 / np.sqrt(n)) + _extra_terms(block, n_terms)
+            z[start:stop] = _assemble_z(block, main, tol)
+        else:
+            z[start:stop] = siegel_z(block, tol)
+        start = stop
+
+    result = np.empty_like(z)
+    result[order] = z
+    return result.reshape(t.shape)
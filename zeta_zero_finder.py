@@ -0,0 +1,270 @@
+"""
+Zeros of the Riemann Zeta Function on the Critical Line
+
+The Riemann scripts used to fake their zeros: one evaluated ζ(1/2 + in) at integer heights and called the values
+zeros, the other just returned nπ. This module locates the actual ordinates t of the non-trivial zeros 1/2 + it
+with the usual machinery of large-scale zero verification:
+
+- Gram points g_n, where θ(g_n) = nπ, are found with vectorized Newton iterations. Z(g_n) usually has the sign
+  (-1)^n; such "good" Gram points split the line into Gram blocks, and a block between good points g_a < g_b
+  normally holds exactly b - a zeros (Rosser's rule).
+- Each block is scanned for sign changes of Z(t), first at its Gram points and then on finer and finer grids
+  until it shows the expected number of zeros. Every sign change brackets one zero.
+- All brackets are refined together with the Illinois variant of regula falsi, one batched Z(t) evaluation
+  (zeta_multieval.py) per iteration.
+- Turing's method proves nothing was missed: the sign changes give N(g_n) >= n + 1, and the Gram blocks after
+  g_n, each scanned until it satisfies Rosser's rule, give N(g_n) <= n + 1 once there are enough of them
+  (Brent's criterion, with their number taken at g_n). Any block that does not behave raises RuntimeError
+  instead of returning a silently wrong count.
+
+The zeros found are kept in ~/.cache/le_math/zeta_zeros (override with the LE_MATH_ZETA_ZEROS environment
+variable) as a .npy file that is memory-mapped on later runs and extended from its last verified Gram point
+when more zeros are needed.
+
+Libraries:
+- Numpy: For the vectorized Gram points, sign-change scans and root refinement.
+- Scipy: For the Lambert W starting guesses of the Gram points.
+"""
+
+import math
+import os
+
+import numpy as np
+from scipy.special import lambertw
+
+from riemann_siegel import DEFAULT_TOLERANCE, riemann_siegel_theta, siegel_z
+from zeta_multieval import siegel_z_batch
+
+DEFAULT_ZEROS_DIR = os.environ.get(
+    "LE_MATH_ZETA_ZEROS", os.path.join(os.path.expanduser("~"), ".cache", "le_math", "zeta_zeros"))
+ZEROS_FILE = "zeros.npy"
+
+# Smallest number of zeros ever computed, so small requests do not extend the cache a few zeros at a time
+MIN_CACHED_ZEROS = 1000
+
+# Each refinement level doubles the sampling density inside a Gram block that is missing zeros
+MAX_REFINE_LEVEL = 8
+
+# Error tolerance of Z(t) at the final Newton step on each zero; tighter than the tolerance used for scanning
+# and bracketing, so low zeros are accurate too while only one slow evaluation per zero is paid for it
+ZERO_TOLERANCE = 1e-9
+
+# Root refinement stops once a bracket is narrower than this (plus a few ulps of t)
+ZERO_XTOL = 1e-10
+MAX_REFINE_ITERATIONS = 100
+
+# Zeros already loaded, keyed by directory
+_loaded_zeros = {}
+
+
+# Gram points g_n, solving θ(g_n) = nπ
+def gram_points(n):
+    """
+    Compute the Gram points g_n, defined by θ(g_n) = nπ, for n >= -1.
+
+    Parameters:
+    n (int or array-like): Gram indices.
+
+    Returns:
+    numpy.ndarray: The Gram points.
+    """
+    n = np.asarray(n, dtype=np.float64)
+    # θ(t) ≈ t/2 log(t/2πe) - π/8 inverts to t = 2π exp(1 + W((8n + 1) / 8e))
+    t = 2 * np.pi * np.exp(1 + lambertw((8 * n + 1) / (8 * np.e)).real)
+    for _ in range(50):
+        # θ'(t) ≈ log(t/2π) / 2 is plenty for Newton to converge
+        step = (riemann_siegel_theta(t) - n * np.pi) / (0.5 * np.log(t / (2 * np.pi)))
+        t = t - step
+        if np.all(np.abs(step) <= 1e-13 * t):
+            break
+    return t
+
+
+# Number of Gram blocks that must follow g_n for Turing's method to bound N(g_n) from above
+def _turing_blocks(t):
+    log_t = math.log(t)
+    return max(1, math.ceil(0.0061 * log_t ** 2 + 0.08 * log_t))
+
+
+# Sign-change brackets of one Gram block, refined until the block satisfies Rosser's rule
+def _scan_block(g, z, a, b, start, tol):
+    """
+    Find b - a sign changes of Z in the Gram block [g_a, g_b] between two good Gram points, subdividing its
+    Gram intervals until they all show.
+
+    Returns:
+    tuple: Bracket ends (lo, hi) and Z at both ends.
+
+    Raises:
+    RuntimeError: If the block keeps missing zeros, or holds more sign changes than Gram intervals.
+    """
+    ts, zs = g[a:b + 1], z[a:b + 1]
+    level = 0
+    while np.count_nonzero(np.signbit(zs[1:]) != np.signbit(zs[:-1])) < b - a:
+        level += 1
+        if level > MAX_REFINE_LEVEL:
+            raise RuntimeError(f"Gram block [g_{start + a}, g_{start + b}] is missing zeros "
+                               f"(Rosser's rule fails or a zero is multiple)")
+        # Subdivide every Gram interval of the block into 2^level pieces
+        s = np.linspace(0.0, 1.0, 2 ** level + 1)[:-1]
+        ts = np.append((g[a:b, None] + (g[a + 1:b + 1] - g[a:b])[:, None] * s).ravel(), g[b])
+        zs = siegel_z_batch(ts, tol)
+    change = np.flatnonzero(np.signbit(zs[1:]) != np.signbit(zs[:-1]))
+    if len(change) > b - a:
+        raise RuntimeError(f"Gram block [g_{start + a}, g_{start + b}] holds more zeros than Gram points; "
+                           f"Turing's method cannot confirm the count")
+    return ts[change], ts[change + 1], zs[change], zs[change + 1]
+
+
+# Sign-change brackets inside the Gram blocks starting at good Gram point index 'start'
+def _scan_gram_range(start, stop, tol=DEFAULT_TOLERANCE):
+    """
+    Bracket every zero between the good Gram points g_start and g_last, where g_last is the last good Gram point
+    before g_stop whose following Gram blocks have been checked for Turing's method.
+
+    A good Gram point g_b only counts as verified once the m = _turing_blocks(g_b) Gram blocks after it have all
+    been scanned and satisfy Rosser's rule; with the zeros counted up to g_b that gives N(g_b) = b + 1.
+
+    Parameters:
+    start (int): Gram index of a good Gram point (-1 for the very beginning).
+    stop (int): Gram index up to which Gram points are sampled.
+    tol (float): Error tolerance passed to siegel_z.
+
+    Returns:
+    tuple: Bracket ends (lo, hi), Z at both ends, and the index of the last verified Gram point, or None when
+    too few blocks were sampled to verify any.
+    """
+    indices = np.arange(start, stop + 1)
+    g = gram_points(indices)
+    z = siegel_z_batch(g, tol)
+    good = np.flatnonzero(np.where(indices % 2 == 0, z, -z) > 0)
+    if len(good) == 0 or good[0] != 0:
+        raise RuntimeError(f"Gram point g_{start} is not good")
+
+    blocks = list(zip(good[:-1], good[1:]))
+    # Brackets of the blocks scanned so far, in order; each block is scanned once
+    scanned = []
+    verified_blocks = 0
+    for k, (a, b) in enumerate(blocks):
+        # g_b needs the blocks k + 1 .. k + m after it, with m taken at g_b itself
+        needed = k + 1 + _turing_blocks(g[b])
+        if needed > len(blocks):
+            break
+        while len(scanned) < needed:
+            scanned.append(_scan_block(g, z, *blocks[len(scanned)], start, tol))
+        verified_blocks = k + 1
+    if not verified_blocks:
+        return None
+
+    lo, hi, zlo, zhi = (np.concatenate(parts) for parts in zip(*scanned[:verified_blocks]))
+    return lo, hi, zlo, zhi, start + blocks[verified_blocks - 1][1]
+
+
+# Vectorized Illinois refinement of bracketed zeros of Z
+def _refine_zeros(a, b, fa, fb, tol, xtol=ZERO_XTOL):
+    """
+    Shrink brackets [a, b] with opposite signs of Z at the ends onto the zero inside them, then take one Newton
+    step with Z evaluated to 'tol'.
+
+    Parameters:
+    a, b (numpy.ndarray): Bracket ends.
+    fa, fb (numpy.ndarray): Z at the bracket ends.
+    tol (float): Error tolerance of Z for the final Newton step.
+    xtol (float): Absolute width at which a bracket counts as converged.
+
+    Returns:
+    numpy.ndarray: The zeros.
+    """
+    a, b, fa, fb = (np.array(v, dtype=np.float64) for v in (a, b, fa, fb))
+    active = np.arange(len(a))
+    for _ in range(MAX_REFINE_ITERATIONS):
+        if len(active) == 0:
+            break
+        ai, bi, fai, fbi = a[active], b[active], fa[active], fb[active]
+        c = bi - fbi * (bi - ai) / (fbi - fai)
+        fc = siegel_z_batch(c)
+
+        # Keep the bracket; when the same end survives twice, halve its value (the Illinois step)
+        crossed = np.signbit(fc) != np.signbit(fbi)
+        a[active] = np.where(crossed, bi, ai)
+        fa[active] = np.where(crossed, fbi, fai / 2)
+        b[active], fb[active] = c, fc
+
+        done = (np.abs(c - a[active]) <= xtol + 4 * np.finfo(np.float64).eps * c) | (fc == 0)
+        active = active[~done]
+
+    # The brackets only see Z to the default tolerance; a Newton step with accurate values removes the rest
+    h = 1e-3
+    slope = (siegel_z_batch(b + h) - siegel_z_batch(b - h)) / (2 * h)
+    return b - siegel_z(b, tol) / slope
+
+
+# Compute zeros past the last verified Gram point
+def _extend_zeros(zeros, n_zeros, tol):
+    # With k zeros verified, g_(k-1) is the good Gram point they end at
+    start = len(zeros) - 1
+    found = [np.asarray(zeros)]
+    count = len(zeros)
+    margin = 8
+    while count < n_zeros:
+        # Sample past the last zero needed so that Turing's method has blocks to check against
+        margin += 2 * _turing_blocks(gram_points(start + 1)[()])
+        scan = _scan_gram_range(start, start + max(n_zeros - count, 16) + margin)
+        if scan is None:
+            continue
+        lo, hi, zlo, zhi, verified = scan
+        found.append(_refine_zeros(lo, hi, zlo, zhi, tol))
+        count += len(lo)
+        start = verified
+    return np.concatenate(found)
+
+
+# The first zeros, computed from scratch
+def find_zeros(n_zeros, tol=ZERO_TOLERANCE):
+    """
+    Compute the ordinates of at least the first 'n_zeros' non-trivial zeros of the zeta function, without
+    touching the cache.
+
+    Parameters:
+    n_zeros (int): Number of zeros needed.
+    tol (float): Error tolerance of Z(t) for the final Newton step on each zero.
+
+    Returns:
+    numpy.ndarray: Increasing ordinates t of the zeros 1/2 + it, ending at a verified Gram point, so there may
+    be a few more than requested.
+    """
+    return _extend_zeros(np.zeros(0), n_zeros, tol)
+
+
+# The first zeros, served from the on-disk cache
+def zeta_zero_ordinates(n_zeros, directory=DEFAULT_ZEROS_DIR):
+    """
+    Return the ordinates of the first 'n_zeros' non-trivial zeros of the zeta function.
+
+    The cache is memory-mapped; when it holds too few zeros it is extended from its last verified Gram point
+    to at least twice its previous size.
+
+    Parameters:
+    n_zeros (int): Number of zeros needed.
+    directory (str): Directory holding the zeros cache.
+
+    Returns:
+    numpy.ndarray: Read-only view of the increasing ordinates t of the zeros 1/2 + it.
+    """
+    path = os.path.join(directory, ZEROS_FILE)
+    zeros = _loaded_zeros.get(directory)
+    if zeros is None and os.path.exists(path):
+        zeros = np.load(path, mmap_mode="r")
+    if zeros is None or len(zeros) < n_zeros:
+        previous = np.zeros(0) if zeros is None else zeros
+        target = max(int(n_zeros), MIN_CACHED_ZEROS, 2 * len(previous))
+        extended = _extend_zeros(previous, target, ZERO_TOLERANCE)
+
+        # Written under a temporary name and moved into place once complete
+        os.makedirs(directory, exist_ok=True)
+        temporary = path + f".{os.getpid()}.tmp.npy"
+        np.save(temporary, extended)
+        os.replace(temporary, path)
+        zeros = np.load(path, mmap_mode="r")
+    _loaded_zeros[directory] = zeros
+    return zeros[:n_zeros]